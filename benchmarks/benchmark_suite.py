@@ -0,0 +1,328 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Performance benchmarks of the drawing, model, autosave, csv and table export
+code, run using the offscreen Qt platform.
+
+    python benchmarks/benchmark_suite.py --output results.json
+    python benchmarks/benchmark_suite.py --baseline results.json --threshold 0.2
+
+The exit status is the number of regressions against the baseline.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+# set up linting conditions
+# pylint: disable = c-extension-no-member
+# pylint: disable = import-error
+# pylint: disable = protected-access
+
+import os
+import sys
+import csv
+import time
+import argparse
+import tempfile
+import statistics
+
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable = wrong-import-position
+import PyQt5.QtWidgets as qw
+import PyQt5.QtGui as qg
+
+import benchmarkresults
+import synthetic
+
+from regionselection.gui.regionselectionmainwindow import RegionSelectionMainWindow
+from regionselection.gui.regionstablemodel import RegionsTableModel
+from regionselection.util.autosavebinary import AutoSaveBinary
+from regionselection.util.imagestore import ImageStore
+from regionselection.util.qimagearray import gray_view, rgba_view
+
+## the size of the synthetic image
+_IMAGE_SIZE = (4000, 3000)
+
+def time_call(function, repeats):
+    """
+    time a function
+
+        Args:
+            function (callable) the function, no arguments
+            repeats (int) the number of timed calls
+
+        Returns:
+            (float) the median time of a call in seconds
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times)
+
+class BenchmarkSuite():
+    """
+    the benchmarks, each is a method whose name starts bench_ and which
+    returns a dict of result name to seconds
+    """
+
+    def __init__(self, sizes, repeats, work_dir, canvas=None):
+        """
+        set up the suite
+
+            Args:
+                sizes ([int]) the region counts to be benchmarked
+                repeats (int) the number of repeats of each timing
+                work_dir (string) a scratch directory
+                canvas (string) the canvas backend, "label" or "scene", None for the default
+        """
+        ## the region counts
+        self._sizes = sizes
+
+        ## repeats per timing
+        self._repeats = repeats
+
+        ## scratch directory
+        self._work_dir = work_dir
+
+        ## the synthetic image
+        self._image = synthetic.make_image(*_IMAGE_SIZE)
+
+        ## the main window, holding the regions
+        self._window = RegionSelectionMainWindow(canvas=canvas)
+        self._window.resize(1200, 900)
+        self._window.show()
+        self._window._drawing_widget.display_image(ImageStore(self._image))
+
+    def regions(self, count):
+        """
+        synthetic regions within the image
+        """
+        return synthetic.make_regions(count, *_IMAGE_SIZE)
+
+    def bench_paint_event(self):
+        """
+        time a full repaint of the label showing all regions
+        """
+        canvas = self._window._drawing_widget.canvas
+        canvas.set_display_all()
+        surface = canvas.viewport() if isinstance(canvas, qw.QGraphicsView) else canvas
+
+        results = {}
+        for count in self._sizes:
+            self._window.replace_data.emit(self.regions(count))
+            qg.QGuiApplication.processEvents()
+            results[f"paint_event.{count}"] = time_call(surface.repaint, self._repeats)
+
+        canvas.set_adding()
+        self._window.replace_data.emit([])
+        qg.QGuiApplication.processEvents()
+
+        return results
+
+    def bench_canvas_pan(self):
+        """
+        time scrolling the canvas across the image, showing all regions
+        """
+        widget = self._window._drawing_widget
+        widget.canvas.set_display_all()
+        bar = widget.scroll_area().verticalScrollBar()
+
+        def pan():
+            for value in range(bar.minimum(), bar.maximum() + 1, max(1, bar.pageStep()//2)):
+                bar.setValue(value)
+                qg.QGuiApplication.processEvents()
+
+        results = {}
+        for count in self._sizes:
+            self._window.replace_data.emit(self.regions(count))
+            qg.QGuiApplication.processEvents()
+            results[f"canvas_pan.{count}"] = time_call(pan, self._repeats)
+
+        widget.canvas.set_adding()
+        self._window.replace_data.emit([])
+        qg.QGuiApplication.processEvents()
+
+        return results
+
+    def bench_table_model(self):
+        """
+        time adding single regions to, and replacing all regions in, the model
+        """
+        results = {}
+        for count in self._sizes:
+            regions = self.regions(count)
+
+            def replace():
+                model = RegionsTableModel([])
+                model.replace_data(regions)
+
+            results[f"model.replace_data.{count}"] = time_call(replace, self._repeats)
+
+            model = RegionsTableModel(list(regions))
+            extra = self.regions(100)
+
+            def add():
+                for region in extra:
+                    model.add_region(region)
+
+            results[f"model.add_region_x100.{count}"] = time_call(add, self._repeats)
+
+        return results
+
+    def bench_autosave(self):
+        """
+        time saving a backup, and listing and finding the backups in a directory
+        """
+        results = {}
+        for count in self._sizes:
+            backup = AutoSaveBinary(f"bench_{count}", fingerprint=f"bench_{count}")
+            regions = self.regions(count)
+            results[f"autosave.save_data.{count}"] = time_call(
+                lambda: backup.save_data(regions), self._repeats)
+
+        results["autosave.list_backups"] = time_call(
+            lambda: AutoSaveBinary.list_backups(os.getcwd()), self._repeats)
+
+        results["autosave.find_backups"] = time_call(
+            lambda: AutoSaveBinary.find_backups(os.getcwd(), f"bench_{self._sizes[0]}"),
+            self._repeats)
+
+        return results
+
+    def bench_csv(self):
+        """
+        time reading and writing csv files through the main window
+        """
+        results = {}
+        file_name = os.path.join(self._work_dir, "regions.csv")
+        original = qw.QFileDialog.getSaveFileName
+        qw.QFileDialog.getSaveFileName = staticmethod(lambda *args, **kwargs: (file_name, ''))
+
+        try:
+            for count in self._sizes:
+                self._window.replace_data.emit(self.regions(count))
+                results[f"csv.save_data.{count}"] = time_call(self._window.save_data,
+                                                              self._repeats)
+
+                def load():
+                    with open(file_name, 'r') as file:
+                        self._window.read_regions_csv_file(csv.reader(file))
+
+                results[f"csv.read_regions_csv_file.{count}"] = time_call(load, self._repeats)
+        finally:
+            qw.QFileDialog.getSaveFileName = original
+            self._window.replace_data.emit([])
+
+        return results
+
+    def bench_table_html(self):
+        """
+        time making the html version of the table
+        """
+        results = {}
+        for count in self._sizes:
+            self._window.replace_data.emit(self.regions(count))
+            results[f"table_html.{count}"] = time_call(
+                self._window._results_widget.get_table_as_html, self._repeats)
+
+        self._window.replace_data.emit([])
+
+        return results
+
+    def bench_qimage_array(self):
+        """
+        time viewing the image as arrays, a view should cost the same however
+        often it is made, and far less than copying the pixels
+        """
+        results = {}
+        results["qimage_array.gray_view"] = time_call(lambda: gray_view(self._image),
+                                                      self._repeats)
+
+        # the first call converts, the median is of the cached calls
+        results["qimage_array.rgba_view"] = time_call(lambda: rgba_view(self._image),
+                                                      self._repeats)
+
+        results["qimage_array.gray_copy"] = time_call(lambda: gray_view(self._image).copy(),
+                                                      self._repeats)
+
+        return results
+
+    def run(self, name_filter=None):
+        """
+        run the benchmarks
+
+            Args:
+                name_filter (string) if not None only benchmarks whose name contains it are run
+
+            Returns:
+                (dict) result name to seconds
+        """
+        results = {}
+        for name in sorted(dir(self)):
+            if name.startswith("bench_") and (name_filter is None or name_filter in name):
+                results.update(getattr(self, name)())
+                qg.QGuiApplication.processEvents()
+
+        return results
+
+def main():
+    """
+    parse the command line, run, report and compare
+    """
+    parser = argparse.ArgumentParser(description="region selection benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="region counts")
+    parser.add_argument("--repeats", type=int, default=5, help="repeats of each timing")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this")
+    parser.add_argument("--canvas", choices=["label", "scene"], help="the canvas backend")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=benchmarkresults.THRESHOLD,
+                        help="fractional slow down counted as a regression")
+    args = parser.parse_args()
+
+    app = qw.QApplication([])
+
+    start_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        # autosave files are written to the current directory
+        os.chdir(work_dir)
+        try:
+            results = BenchmarkSuite(args.sizes,
+                                     args.repeats,
+                                     work_dir,
+                                     args.canvas).run(args.filter)
+        finally:
+            os.chdir(start_dir)
+
+    app.processEvents()
+
+    baseline = None
+    if args.baseline is not None:
+        baseline = benchmarkresults.load_results(args.baseline)
+
+    failures = benchmarkresults.report(results, baseline, args.threshold)
+
+    if args.output is not None:
+        benchmarkresults.save_results(results, args.output)
+
+    sys.exit(failures)
+
+if __name__ == "__main__":
+    main()
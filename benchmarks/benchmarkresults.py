@@ -0,0 +1,109 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Storage of benchmark results as JSON and comparison against a baseline.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import json
+import platform
+import datetime
+
+## the default fractional slow down that counts as a regression
+THRESHOLD = 0.2
+
+def save_results(results, file_path):
+    """
+    write benchmark results, with a description of the machine, as JSON
+
+        Args:
+            results (dict) benchmark name to time in seconds
+            file_path (string) the output file
+    """
+    data = {"metadata": {"python": platform.python_version(),
+                         "machine": platform.machine(),
+                         "system": platform.system(),
+                         "date": datetime.datetime.now().isoformat(timespec="seconds")},
+            "results": results}
+
+    with open(file_path, 'w') as file:
+        json.dump(data, file, indent=2)
+
+def load_results(file_path):
+    """
+    read benchmark results written by save_results
+
+        Args:
+            file_path (string) the input file
+
+        Returns:
+            (dict) benchmark name to time in seconds
+    """
+    with open(file_path, 'r') as file:
+        return json.load(file)["results"]
+
+def compare_results(results, baseline, threshold=THRESHOLD):
+    """
+    find the benchmarks that are slower than the baseline by more than the threshold,
+    benchmarks missing from either set are ignored
+
+        Args:
+            results (dict) benchmark name to time in seconds
+            baseline (dict) benchmark name to time in seconds
+            threshold (float) the allowed fractional slow down
+
+        Returns:
+            [(name, time, baseline time, ratio)] the regressions
+    """
+    regressions = []
+    for name, value in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None or base <= 0.0:
+            continue
+
+        ratio = value/base
+        if ratio > 1.0 + threshold:
+            regressions.append((name, value, base, ratio))
+
+    return regressions
+
+def report(results, baseline=None, threshold=THRESHOLD):
+    """
+    print the results, and any regressions, to standard output
+
+        Args:
+            results (dict) benchmark name to time in seconds
+            baseline (dict) benchmark name to time in seconds, or None
+            threshold (float) the allowed fractional slow down
+
+        Returns:
+            (int) the number of regressions
+    """
+    for name, value in sorted(results.items()):
+        line = f"{name:<48} {value*1000.0:12.3f} ms"
+        if baseline is not None and baseline.get(name):
+            line += f"   x{value/baseline[name]:.2f} of baseline"
+        print(line)
+
+    if baseline is None:
+        return 0
+
+    regressions = compare_results(results, baseline, threshold)
+    for name, value, base, ratio in regressions:
+        print(f"REGRESSION {name}: {value*1000.0:.3f} ms against {base*1000.0:.3f} ms (x{ratio:.2f})")
+
+    return len(regressions)
@@ -0,0 +1,132 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Measure the application's cold start: the time to import the application
+module and the time from interpreter start to the main window being exposed,
+each in a fresh process using the offscreen Qt platform.
+
+    python benchmarks/startup_benchmark.py --output startup.json
+    python benchmarks/startup_benchmark.py --baseline startup.json
+
+The exit status is the number of regressions against the baseline.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+import benchmarkresults
+
+## the root directory of the repository
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+## child process timing the import of the application
+_IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+import regionselection.regionselectionapplication
+print(time.perf_counter() - start)
+"""
+
+## child process timing the appearance of the main window
+_WINDOW_SCRIPT = """
+import time
+start = time.perf_counter()
+import PyQt5.QtWidgets as qw
+from regionselection.gui.regionselectionmainwindow import RegionSelectionMainWindow
+app = qw.QApplication([])
+window = RegionSelectionMainWindow()
+window.show()
+while window.windowHandle() is None or not window.windowHandle().isExposed():
+    app.processEvents()
+app.processEvents()
+print(time.perf_counter() - start)
+"""
+
+def run_child(script):
+    """
+    run a timing script in a fresh interpreter
+
+        Args:
+            script (string) python source printing a time in seconds
+
+        Returns:
+            (float, float) the time printed by the script, the wall time of the process
+    """
+    env = dict(os.environ)
+    env["QT_QPA_PLATFORM"] = "offscreen"
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [_ROOT, env.get("PYTHONPATH")]))
+
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-c", script],
+                               cwd=_ROOT,
+                               env=env,
+                               capture_output=True,
+                               text=True,
+                               check=True)
+    wall = time.perf_counter() - start
+
+    return float(completed.stdout.strip().splitlines()[-1]), wall
+
+def measure(repeats):
+    """
+    run the start up benchmarks
+
+        Args:
+            repeats (int) the number of processes for each measurement
+
+        Returns:
+            (dict) benchmark name to median time in seconds
+    """
+    imports = [run_child(_IMPORT_SCRIPT)[0] for _ in range(repeats)]
+    windows = [run_child(_WINDOW_SCRIPT) for _ in range(repeats)]
+
+    return {"startup.import_application": statistics.median(imports),
+            "startup.first_window": statistics.median(tmp[0] for tmp in windows),
+            "startup.process_to_first_window": statistics.median(tmp[1] for tmp in windows)}
+
+def main():
+    """
+    parse the command line, run, report and compare
+    """
+    parser = argparse.ArgumentParser(description="application start up benchmark")
+    parser.add_argument("--repeats", type=int, default=5, help="processes per measurement")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=benchmarkresults.THRESHOLD,
+                        help="fractional slow down counted as a regression")
+    args = parser.parse_args()
+
+    results = measure(args.repeats)
+
+    baseline = None
+    if args.baseline is not None:
+        baseline = benchmarkresults.load_results(args.baseline)
+
+    failures = benchmarkresults.report(results, baseline, args.threshold)
+
+    if args.output is not None:
+        benchmarkresults.save_results(results, args.output)
+
+    sys.exit(failures)
+
+if __name__ == "__main__":
+    main()
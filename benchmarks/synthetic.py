@@ -0,0 +1,113 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Generators of synthetic images and region sets, of any size, for benchmarks.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+# set up linting conditions
+# pylint: disable = c-extension-no-member
+# pylint: disable = import-error
+
+import os
+import numpy as np
+
+import PyQt5.QtGui as qg
+
+from regionselection.util.drawrect import array_to_regions
+from regionselection.util.regionfiles import write_regions_csv
+
+def make_image(width, height, seed=0):
+    """
+    make a grayscale image of smooth gradients, noise and bright blocks
+
+        Args:
+            width (int) the image width
+            height (int) the image height
+            seed (int) the random seed
+
+        Returns:
+            (QImage) Format_Grayscale8 image owning its data
+    """
+    generator = np.random.default_rng(seed)
+
+    pixels = np.add.outer(np.linspace(0, 96, height), np.linspace(0, 96, width))
+    pixels += generator.normal(0.0, 8.0, (height, width))
+
+    for top, left in generator.integers(0, (height, width), (max(1, width*height//200000), 2)):
+        pixels[top:top+height//20, left:left+width//20] += 128
+
+    pixels = np.clip(pixels, 0, 255).astype(np.uint8)
+
+    image = qg.QImage(pixels.data, width, height, width, qg.QImage.Format_Grayscale8)
+
+    # copy so the QImage does not refer to the numpy buffer
+    return image.copy()
+
+def make_region_array(count, width, height, max_size=200, seed=0):
+    """
+    make random regions lying within an image
+
+        Args:
+            count (int) the number of regions
+            width (int) the image width
+            height (int) the image height
+            max_size (int) the maximum edge length of a region
+            seed (int) the random seed
+
+        Returns:
+            (numpy.array) uint32 (count, 4) array, columns top, bottom, left, right
+    """
+    generator = np.random.default_rng(seed)
+
+    top = generator.integers(0, height-1, count)
+    left = generator.integers(0, width-1, count)
+    bottom = np.minimum(top + generator.integers(1, max_size, count), height)
+    right = np.minimum(left + generator.integers(1, max_size, count), width)
+
+    return np.stack([top, bottom, left, right], axis=1).astype(np.uint32)
+
+def make_regions(count, width, height, max_size=200, seed=0):
+    """
+    make random regions lying within an image
+
+        Returns:
+            [DrawRect]
+    """
+    return array_to_regions(make_region_array(count, width, height, max_size, seed))
+
+def write_project(directory, name, width, height, count, seed=0):
+    """
+    write an image and a csv file of its regions
+
+        Args:
+            directory (string) the output directory
+            name (string) the file stem and project name
+            width (int) the image width
+            height (int) the image height
+            count (int) the number of regions
+            seed (int) the random seed
+
+        Returns:
+            (string, string) the image and csv paths
+    """
+    image_path = os.path.join(directory, name + ".png")
+    csv_path = os.path.join(directory, name + ".csv")
+
+    make_image(width, height, seed).save(image_path)
+    write_regions_csv(csv_path, name, make_region_array(count, width, height, seed=seed))
+
+    return image_path, csv_path
@@ -0,0 +1,476 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Command line batch processing of region files and their images, needs no
+display. Each subcommand accepts files, directories and glob patterns, when
+there is more than one input the work is spread over a pool of processes.
+
+    python run_regionselection_cli.py convert data/*.csv --to npz --output-dir out
+    python run_regionselection_cli.py validate data --clamp --output-dir fixed
+    python run_regionselection_cli.py merge a.csv b.csv --output all.csv
+    python run_regionselection_cli.py crops data --output-dir crops
+    python run_regionselection_cli.py overlay data --output-dir overlays --scale 0.5
+    python run_regionselection_cli.py mask data --policy smallest --output-dir masks
+    python run_regionselection_cli.py unmask masks --output-dir regions
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+# set up linting conditions
+# pylint: disable = c-extension-no-member
+# pylint: disable = import-error
+
+import os
+import sys
+import glob
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# no display is needed, this must be set before Qt is loaded
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable = wrong-import-position
+import PyQt5.QtGui as qg
+import PyQt5.QtCore as qc
+
+from regionselection.util import regionfiles
+from regionselection.util.regionvalidation import repair_region_list, report_summary
+from regionselection.util import regionrenderer
+from regionselection.util import labelmask
+
+## the extensions of region files
+_REGION_EXTENSIONS = (".csv", ".npz")
+
+## the extensions of mask files
+_MASK_EXTENSIONS = (".npy", ".png", ".tif", ".tiff", ".bmp")
+
+def expand_inputs(inputs, extensions=_REGION_EXTENSIONS):
+    """
+    expand a list of files, directories and glob patterns into region files
+
+        Args:
+            inputs ([string]) the command line inputs
+            extensions (tuple) the extensions of the files wanted
+
+        Returns:
+            [string] sorted list of region file paths
+    """
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            candidates = [os.path.join(item, name) for name in os.listdir(item)]
+        elif os.path.isfile(item):
+            candidates = [item]
+        else:
+            candidates = glob.glob(item, recursive=True)
+
+        paths.update(path for path in candidates
+                     if os.path.isfile(path) and path.lower().endswith(extensions))
+
+    return sorted(paths)
+
+def _image_for(path, options):
+    """
+    the image to be used with a region file
+
+        Args:
+            path (string) the region file
+            options (dict) the command options
+
+        Returns:
+            (string) the image path
+
+        Throws:
+            ValueError if there is no image
+    """
+    image = options.get("image") or regionfiles.find_image(path)
+    if image is None:
+        raise ValueError(f"{path}: cannot find the image")
+    return image
+
+def _output_path(path, options, extension, suffix=""):
+    """
+    the path for the output made from a region file
+
+        Args:
+            path (string) the region file
+            options (dict) the command options, uses output_dir
+            extension (string) the output's extension including the dot
+            suffix (string) added to the file stem
+
+        Returns:
+            (string) the output path
+
+        Throws:
+            ValueError if the output would replace the region file
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    directory = options.get("output_dir") or os.path.dirname(path)
+    output = os.path.join(directory, stem + suffix + extension)
+
+    if os.path.abspath(output) == os.path.abspath(path):
+        raise ValueError(f"{path}: the output would replace the input, use --output-dir")
+
+    return output
+
+def convert_job(path, options):
+    """
+    convert a region file between csv and bundle formats, the frame ranges and
+    keyframes of a bundle are kept, so it cannot be converted to csv if it has any
+
+        Args:
+            path (string) the region file
+            options (dict) the command options, uses to, output_dir, image
+
+        Returns:
+            (string) message for the user
+    """
+    project, regions = regionfiles.read_region_list(path)
+    output = _output_path(path, options, "." + options["to"])
+
+    image = None
+    if options["to"] == "npz":
+        image = _image_for(path, options)
+
+    regionfiles.write_regions(output, project, regions, image)
+
+    return f"{path}: {len(regions)} regions written to {output}"
+
+def validate_job(path, options):
+    """
+    check the regions of a file against their image, optionally writing a
+    repaired copy, named with the suffix "_repaired" so the file is never replaced
+
+        Args:
+            path (string) the region file
+            options (dict) the command options, uses repair, output_dir, image
+
+        Returns:
+            (string) message for the user
+    """
+    image = _image_for(path, options)
+    size = qg.QImageReader(image).size()
+    if not size.isValid():
+        raise ValueError(f"{path}: cannot read the image {image}")
+
+    project, regions = regionfiles.read_region_list(path)
+    regions, report = repair_region_list(regions, size.width(), size.height(),
+                                         options.get("repair") or "flag")
+
+    message = f"{path}: {report_summary(report)}"
+
+    if report.repaired > 0:
+        output = _output_path(path, options, os.path.splitext(path)[1], "_repaired")
+        regionfiles.write_regions(output, project, regions, image)
+        message += f", repaired copy written to {output}"
+
+    return message
+
+def crops_job(path, options):
+    """
+    save each region of a file as a separate image, regions are clipped to the
+    image and those that are empty after clipping are not saved
+
+        Args:
+            path (string) the region file
+            options (dict) the command options, uses output_dir, image
+
+        Returns:
+            (string) message for the user
+
+        Throws:
+            ValueError if the image cannot be read or any crop was not written
+    """
+    image = qg.QImage(_image_for(path, options))
+    if image.isNull():
+        raise ValueError("cannot read the image")
+
+    _, regions = regionfiles.read_regions(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    bounds = image.rect()
+
+    written = 0
+    failures = []
+    for number, (top, bottom, left, right) in enumerate(regions.tolist(), 1):
+        rect = qc.QRect(left, top, right-left, bottom-top).intersected(bounds)
+        if rect.isEmpty():
+            failures.append(f"{number} (empty or outside the image)")
+            continue
+
+        output = os.path.join(options["output_dir"], f"{stem}_{number:05d}.png")
+        if image.copy(rect).save(output):
+            written += 1
+        else:
+            failures.append(f"{number} (cannot write {output})")
+
+    message = f"{written} crops written to {options['output_dir']}"
+    if failures:
+        raise ValueError(f"{message}, {len(failures)} failed, regions " + ", ".join(failures))
+
+    return f"{path}: {message}"
+
+def overlay_job(path, options):
+    """
+    render a file's image with its regions drawn on
+
+        Args:
+            path (string) the region file
+            options (dict) the command options, uses output_dir, image, scale, tiled
+
+        Returns:
+            (string) message for the user
+    """
+    image = qg.QImage(_image_for(path, options))
+    if image.isNull():
+        raise ValueError(f"{path}: cannot read the image")
+
+    _, regions = regionfiles.read_regions(path)
+
+    if options.get("tiled"):
+        output = _output_path(path, options, ".npy", "_overlay")
+        regionrenderer.render_tiled(image, regions, output, options["scale"], workers=1)
+    else:
+        output = _output_path(path, options, ".png", "_overlay")
+        regionrenderer.render_regions(image, regions, options["scale"]).save(output)
+
+    return f"{path}: overlay written to {output}"
+
+def mask_job(path, options):
+    """
+    write the label mask of a file's regions, the size of its image
+
+        Args:
+            path (string) the region file
+            options (dict) the command options, uses output_dir, image, policy, dtype
+
+        Returns:
+            (string) message for the user
+    """
+    image = _image_for(path, options)
+    size = qg.QImageReader(image).size()
+    if not size.isValid():
+        raise ValueError(f"{path}: cannot read the image {image}")
+
+    _, regions = regionfiles.read_regions(path)
+    output = _output_path(path, options, ".npy", "_labels")
+    labelmask.export_mask(output, regions, size.width(), size.height(),
+                          options["policy"], options.get("dtype"))
+
+    return f"{path}: label mask of {len(regions)} regions written to {output}"
+
+def unmask_job(path, options):
+    """
+    write the bounding boxes of the labels of a mask as a region file
+
+        Args:
+            path (string) the mask file
+            options (dict) the command options, uses output_dir, binary
+
+        Returns:
+            (string) message for the user
+    """
+    regions = labelmask.mask_to_regions(labelmask.read_mask(path), options.get("binary"))
+    output = _output_path(path, options, ".csv")
+    project = os.path.splitext(os.path.basename(path))[0]
+    regionfiles.write_regions_csv(output, project, regions)
+
+    return f"{path}: {len(regions)} regions written to {output}"
+
+def _run_job(job, path, options):
+    """
+    run a job catching its errors, so one bad file does not stop a batch
+
+        Returns:
+            (bool, string) success and message
+    """
+    try:
+        return True, job(path, options)
+    except (OSError, ValueError) as error:
+        return False, f"{path}: error {error}"
+
+def run_jobs(job, paths, options, workers):
+    """
+    run a job on every path, in a pool of processes if more than one worker
+
+        Args:
+            job (function) the job, taking a path and the options
+            paths ([string]) the region files
+            options (dict) the command options
+            workers (int) the number of processes
+
+        Returns:
+            (int) the number of failures
+    """
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_run_job,
+                                        [job]*len(paths),
+                                        paths,
+                                        [options]*len(paths),
+                                        chunksize=max(1, len(paths)//(4*workers))))
+    else:
+        results = [_run_job(job, path, options) for path in paths]
+
+    failures = 0
+    for success, message in results:
+        print(message, file=sys.stdout if success else sys.stderr)
+        failures += 0 if success else 1
+
+    return failures
+
+def merge(paths, output, project, image):
+    """
+    merge the regions of several files into one, files that cannot be read are
+    reported and left out
+
+        Args:
+            paths ([string]) the region files
+            output (string) the output region file
+            project (string) the project name, if None the first file's
+            image (string) the image, required if the output is a bundle
+
+        Returns:
+            (int) the number of failures
+    """
+    failures = 0
+    names = []
+    regions = []
+    merged = []
+    for path in paths:
+        try:
+            name, file_regions = regionfiles.read_region_list(path)
+        except (OSError, ValueError) as error:
+            print(f"{path}: error {error}", file=sys.stderr)
+            failures += 1
+            continue
+        names.append(name)
+        regions.extend(file_regions)
+        merged.append(path)
+
+    if len(merged) == 0:
+        return failures
+
+    try:
+        if image is None and output.lower().endswith(".npz"):
+            image = regionfiles.find_image(merged[0])
+        regionfiles.write_regions(output, project or names[0], regions, image)
+    except (OSError, ValueError) as error:
+        print(f"{output}: error {error}", file=sys.stderr)
+        return failures + 1
+
+    print(f"{len(regions)} regions from {len(merged)} files written to {output}")
+
+    return failures
+
+def make_parser():
+    """
+    make the command line parser
+
+        Returns:
+            (argparse.ArgumentParser)
+    """
+    parser = argparse.ArgumentParser(prog="regionselection",
+                                     description="batch processing of region files")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_command(name, help_text):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("inputs", nargs="+",
+                             help="input files, directories or glob patterns")
+        command.add_argument("--image", help="image to use, only with a single input")
+        command.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                             help="number of processes")
+        return command
+
+    command = add_command("convert", "convert between csv and project bundle")
+    command.add_argument("--to", choices=["csv", "npz"], required=True)
+    command.add_argument("--output-dir")
+
+    command = add_command("validate", "check regions against image sizes")
+    command.add_argument("--repair", choices=["swap", "clamp"],
+                         help="write copies with inverted edges swapped, or also clamped to the image")
+    command.add_argument("--clamp", dest="repair", action="store_const", const="clamp",
+                         help="same as --repair clamp")
+    command.add_argument("--output-dir")
+
+    command = add_command("merge", "merge the regions of several files")
+    command.add_argument("--output", required=True)
+    command.add_argument("--project", help="name of the merged project")
+
+    command = add_command("crops", "save each region as an image")
+    command.add_argument("--output-dir", required=True)
+
+    command = add_command("overlay", "render images with their regions")
+    command.add_argument("--output-dir")
+    command.add_argument("--scale", type=float, default=1.0)
+    command.add_argument("--tiled", action="store_true",
+                         help="render tile by tile to a .npy file, for very large outputs")
+
+    command = add_command("mask", "write the regions as a .npy label mask")
+    command.add_argument("--output-dir")
+    command.add_argument("--policy", choices=labelmask.OVERLAP_POLICIES, default="last",
+                         help="which region labels a pixel where regions overlap")
+    command.add_argument("--dtype", choices=["uint16", "uint32"],
+                         help="the label type, by default the smallest that fits")
+
+    command = add_command("unmask", "make region files from label or binary masks")
+    command.add_argument("--output-dir")
+    command.add_argument("--binary", action="store_const", const=True,
+                         help="box the connected components of all non zero pixels")
+
+    return parser
+
+def main(argv=None):
+    """
+    run the command line interface
+
+        Args:
+            argv ([string]) the arguments, if None sys.argv is used
+
+        Returns:
+            (int) the exit status, 1 if any file failed, as a count could wrap to 0
+    """
+    args = make_parser().parse_args(argv)
+    if args.command == "unmask":
+        paths = expand_inputs(args.inputs, _MASK_EXTENSIONS)
+    else:
+        paths = expand_inputs(args.inputs)
+
+    if len(paths) == 0:
+        print("no input files found", file=sys.stderr)
+        return 1
+
+    if args.image is not None and len(paths) > 1 and args.command != "merge":
+        print("--image can only be used with a single input", file=sys.stderr)
+        return 1
+
+    if args.command == "merge":
+        return 1 if merge(paths, args.output, args.project, args.image) > 0 else 0
+
+    options = {key: value for key, value in vars(args).items()
+               if key not in ("inputs", "workers", "command")}
+
+    output_dir = options.get("output_dir")
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    jobs = {"convert": convert_job,
+            "validate": validate_job,
+            "crops": crops_job,
+            "overlay": overlay_job,
+            "mask": mask_job,
+            "unmask": unmask_job}
+
+    return 1 if run_jobs(jobs[args.command], paths, options, args.workers) > 0 else 0
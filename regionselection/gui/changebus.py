@@ -0,0 +1,203 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Collects the change notifications of a model over one pass of the event loop
+and delivers them to the consumers as a single merged batch.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+# set up linting conditions
+# pylint: disable = c-extension-no-member
+# pylint: disable = import-error
+
+import PyQt5.QtCore as qc
+
+class ChangeBatch():
+    """
+    the changes to a model since the last batch, as merged row ranges
+    """
+
+    def __init__(self):
+        """
+        make an empty batch
+        """
+        ## if true the whole model was replaced and the ranges are not recorded
+        self.reset = False
+
+        ## if true rows were inserted or changed after the reset, the edits are
+        ## not recorded as ranges but the regions differ from those loaded
+        self.edited_after_reset = False
+
+        ## inclusive (first, last) ranges of inserted rows, in order of insertion
+        self.inserted = []
+
+        ## inclusive (first, last) ranges of changed rows, in order of change
+        self.changed = []
+
+    def is_empty(self):
+        """
+        test if no change has been recorded
+
+            Returns:
+                (bool) True if empty
+        """
+        return not self.reset and len(self.inserted) == 0 and len(self.changed) == 0
+
+    def add_reset(self):
+        """
+        record the replacement of the whole model, which subsumes all other changes
+        """
+        self.reset = True
+        self.edited_after_reset = False
+        self.inserted.clear()
+        self.changed.clear()
+
+    def add_inserted(self, first, last):
+        """
+        record the insertion of rows
+
+            Args:
+                first (int) the first row inserted
+                last (int) the last row inserted
+        """
+        if self.reset:
+            self.edited_after_reset = True
+        else:
+            ChangeBatch._merge(self.inserted, first, last)
+
+    def add_changed(self, first, last):
+        """
+        record a change to rows
+
+            Args:
+                first (int) the first row changed
+                last (int) the last row changed
+        """
+        if self.reset:
+            self.edited_after_reset = True
+        else:
+            ChangeBatch._merge(self.changed, first, last)
+
+    @staticmethod
+    def _merge(ranges, first, last):
+        """
+        append a range, merging it with the last range if they touch or overlap
+
+            Args:
+                ranges ([(int, int)]) the ranges
+                first (int) the start of the new range
+                last (int) the end of the new range
+        """
+        if len(ranges) > 0:
+            old_first, old_last = ranges[-1]
+            if first <= old_last + 1 and last >= old_first - 1:
+                ranges[-1] = (min(first, old_first), max(last, old_last))
+                return
+
+        ranges.append((first, last))
+
+class ChangeBus(qc.QObject):
+    """
+    coalesces a model's rowsInserted, dataChanged and modelReset signals, the
+    batch is delivered when control next returns to the event loop
+    """
+
+    ## signal carrying the merged changes
+    changed = qc.pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        """
+        set up the bus
+
+            Args:
+                parent (QObject) the parent object
+        """
+        super().__init__(parent)
+
+        ## the changes not yet delivered
+        self._batch = ChangeBatch()
+
+        ## true if a flush has been scheduled
+        self._scheduled = False
+
+    def connect_model(self, model):
+        """
+        listen to the change signals of a model
+
+            Args:
+                model (QAbstractItemModel) the model
+        """
+        model.rowsInserted.connect(self.rows_inserted)
+        model.dataChanged.connect(self.data_changed)
+        model.modelReset.connect(self.model_reset)
+
+    @qc.pyqtSlot(qc.QModelIndex, int, int)
+    def rows_inserted(self, parent, first, last):
+        """
+        callback for the insertion of rows
+
+            Args:
+                parent (QModelIndex) the parent of the rows, unused in a table
+                first (int) the first row inserted
+                last (int) the last row inserted
+        """
+        del parent
+        self._batch.add_inserted(first, last)
+        self._schedule()
+
+    @qc.pyqtSlot(qc.QModelIndex, qc.QModelIndex)
+    def data_changed(self, tl_index, br_index):
+        """
+        callback for changes to data
+
+            Args:
+                tl_index (qc.QModelIndex) top left location in data
+                br_index (qc.QModelIndex) bottom right location in data
+        """
+        self._batch.add_changed(tl_index.row(), br_index.row())
+        self._schedule()
+
+    @qc.pyqtSlot()
+    def model_reset(self):
+        """
+        callback for the replacement of all the data
+        """
+        self._batch.add_reset()
+        self._schedule()
+
+    def _schedule(self):
+        """
+        arrange for the batch to be delivered on the next pass of the event loop
+        """
+        if not self._scheduled:
+            self._scheduled = True
+            qc.QTimer.singleShot(0, self.flush)
+
+    @qc.pyqtSlot()
+    def flush(self):
+        """
+        deliver the recorded changes, if any
+
+            Emits:
+                changed (ChangeBatch) the merged changes
+        """
+        self._scheduled = False
+        if self._batch.is_empty():
+            return
+
+        batch = self._batch
+        self._batch = ChangeBatch()
+        self.changed.emit(batch)
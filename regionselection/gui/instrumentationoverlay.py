@@ -0,0 +1,115 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Qt parts of the instrumentation: an event loop lag watchdog, an on-screen
+overlay of the current percentiles and a periodic dump to file.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+# set up linting conditions
+# pylint: disable = c-extension-no-member
+# pylint: disable = import-error
+
+import time
+
+import PyQt5.QtWidgets as qw
+import PyQt5.QtCore as qc
+
+import regionselection.util.instrumentation as instrumentation
+
+class EventLoopWatchdog(qc.QObject):
+    """
+    a timer whose lateness measures how long the event loop was blocked
+    """
+
+    def __init__(self, parent=None, interval=50):
+        """
+        start the watchdog
+
+            Args:
+                parent (QObject) the parent object
+                interval (int) the timer interval in milliseconds
+        """
+        super().__init__(parent)
+
+        ## the interval in seconds
+        self._interval = interval/1000.0
+
+        ## the time of the last tick
+        self._last = time.perf_counter()
+
+        ## the timer
+        self._timer = qc.QTimer(self)
+        self._timer.setTimerType(qc.Qt.PreciseTimer)
+        self._timer.timeout.connect(self.tick)
+        self._timer.start(interval)
+
+    @qc.pyqtSlot()
+    def tick(self):
+        """
+        record how late the timer fired
+        """
+        now = time.perf_counter()
+        instrumentation.record("event_loop_lag", max(0.0, now - self._last - self._interval))
+        self._last = now
+
+class InstrumentationOverlay(qw.QLabel):
+    """
+    a translucent label, over its parent's top left corner, showing the
+    current percentiles, optionally also dumping them to file
+    """
+
+    def __init__(self, parent, dump_path=None, interval=1000):
+        """
+        set up the overlay
+
+            Args:
+                parent (QWidget) the widget to be overlaid
+                dump_path (string) file for periodic dumps, .csv or .json, or None
+                interval (int) the update interval in milliseconds
+        """
+        super().__init__(parent)
+
+        ## file for periodic dumps or None
+        self._dump_path = dump_path
+
+        self.setAttribute(qc.Qt.WA_TransparentForMouseEvents)
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 160); color: white;"
+                           "font-family: monospace; padding: 4px;")
+        self.move(8, 40)
+
+        ## the update timer
+        self._timer = qc.QTimer(self)
+        self._timer.timeout.connect(self.update_statistics)
+        self._timer.start(interval)
+
+    @qc.pyqtSlot()
+    def update_statistics(self):
+        """
+        refresh the text and write the dump file
+        """
+        lines = []
+        for name, entry in instrumentation.summary().items():
+            values = " ".join(f"{key} {value:7.2f}" for key, value in entry.items()
+                              if key != "count")
+            lines.append(f"{name:<16} n {entry['count']:<6} {values} ms")
+
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        self.raise_()
+
+        if self._dump_path is not None:
+            instrumentation.dump(self._dump_path)
@@ -0,0 +1,74 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+# set up linting conditions
+# pylint: disable = c-extension-no-member
+# pylint: disable = import-error
+
+import PyQt5.QtCore as qc
+
+from regionselection.util.regionproposals import propose_regions
+
+class ProposalWorker(qc.QObject):
+    """
+    runs automatic region proposal on an image, intended to be moved to a QThread
+    """
+
+    ## signal reporting progress as (rows done, total rows)
+    progress = qc.pyqtSignal(int, int)
+
+    ## signal carrying the proposals, a uint32 (N, 4) array, or None if proposal failed
+    finished = qc.pyqtSignal(object)
+
+    ## signal carrying the message of an error that stopped the proposal, before finished
+    failed = qc.pyqtSignal(str)
+
+    def __init__(self, image, **options):
+        """
+        set up the worker
+
+            Args:
+                image (QImage) the image, it must not be modified while the worker runs
+                options keyword arguments passed on to propose_regions
+        """
+        super().__init__()
+
+        ## the image
+        self._image = image
+
+        ## the proposal options
+        self._options = options
+
+    @qc.pyqtSlot()
+    def run(self):
+        """
+        make the proposals
+
+            Emits:
+                progress after each band of rows
+                failed if an error stopped the proposal
+                finished with the proposals, or None after failed
+        """
+        # an exception escaping a slot would abort the program and finished never be sent
+        try:
+            proposals = propose_regions(self._image, progress=self.progress.emit, **self._options)
+        except Exception as error: # pylint: disable = broad-except
+            self.failed.emit(str(error) or type(error).__name__)
+            proposals = None
+
+        self.finished.emit(proposals)
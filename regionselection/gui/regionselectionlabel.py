@@ -3,7 +3,7 @@
 Created on Wed Jun 10 11:28:23 2020
 
 provides a class, derived from QLabel, that allows the user to select a
-retcangular region of a pixmap in pixmap coordinates
+retcangular region of an image in image coordinates
 
 Licensed under the Apache License, Version 2.0 (the "License"); you may not use
 this file except in compliance with the License. You may obtain a copy of the
@@ -28,9 +28,16 @@ from enum import IntEnum
 import PyQt5.QtWidgets as qw
 import PyQt5.QtGui as qg
 import PyQt5.QtCore as qc
-import numpy as np
+
 
 from regionselection.util.drawrect import DrawRect
+from regionselection.util.regionstyle import region_pen, region_brush, selected_pen, pending_pen
+from regionselection.util.lazyimport import lazy_import
+from regionselection.util.instrumentation import timed
+from regionselection.util.edgesnap import EdgeSnapper
+
+## numpy, loaded when first used
+np = lazy_import("numpy")
 
 class SelectionState(IntEnum):
     """
@@ -78,18 +85,47 @@ class RegionSelectionLabel(qw.QLabel):
         ## the translated name
         self._translation_name = self.tr("ImageLabel")
 
-        ## holder for start of drawing in pixel coordinates
+        ## the owner of the image, the label paints its view
+        self._image_store = None
+
+        ## display pixels per image pixel, less than one if the image is downsampled
+        self._zoom = 1.0
+
+        ## holder for start of drawing in display coordinates
         self._start = None
 
-        ## holder for end of drawing in pixel coordinates
+        ## holder for end of drawing in display coordinates
         self._end = None
 
         ## holder for the rectangle which a user has defined, but not yet formed a region
         self._rectangle = None
 
+        ## snaps the edges of new rectangles to image edges
+        self._snapper = EdgeSnapper()
+
+        ## if true drawn rectangles become pending regions, with no confirmation dialog
+        self._rapid = False
+
+        ## regions drawn in rapid mode and not yet accepted or rejected
+        self._pending = []
+
+        self.setFocusPolicy(qc.Qt.StrongFocus)
+
     ## signal to indicate the user has selected a new rectangle
     new_selection = qc.pyqtSignal(DrawRect)
 
+    ## signal to indicate the user has clicked on a point while regions are displayed
+    point_selected = qc.pyqtSignal(int, int)
+
+    ## signal to indicate the user has control clicked on a point while regions are displayed
+    point_toggled = qc.pyqtSignal(int, int)
+
+    ## signal to indicate the user has accepted a batch of pending regions
+    new_selections = qc.pyqtSignal(list)
+
+    ## signal carrying the number of pending regions when it changes
+    pending_changed = qc.pyqtSignal(int)
+
     @property
     def rectangle(self):
         """
@@ -100,6 +136,170 @@ class RegionSelectionLabel(qw.QLabel):
         """
         return self._rectangle
 
+    def set_image(self, image_store):
+        """
+        display a new image, painted directly from the store's view so no
+        pixmap copy is made
+
+            Args:
+                image_store (ImageStore) the owner of the image
+        """
+        # pending regions were drawn on the previous image
+        self.reject_pending()
+
+        self._image_store = image_store
+        self._zoom = image_store.scale
+        self.setFixedSize(image_store.view().size())
+        self.set_source_image(image_store.view())
+        self.update()
+
+    def regions_changed(self, batch):
+        """
+        schedule a repaint after changes to the regions
+
+            Args:
+                batch (ChangeBatch) the changes, unused as everything is painted on demand
+        """
+        del batch
+        self.update()
+
+    def frame_changed(self):
+        """
+        schedule a repaint for a change of the current frame
+        """
+        self.update()
+
+    def selected_rows_changed(self):
+        """
+        schedule a repaint for a change of the selected regions
+        """
+        self.update()
+
+    def set_source_image(self, image):
+        """
+        set the image being displayed
+
+            Args:
+                image (QImage) the image, in display coordinates
+        """
+        self._snapper.set_image(image)
+
+    def set_snapping(self, flag):
+        """
+        turn the snapping of rectangle edges to image edges on or off, the
+        gradient maps are computed in the background and snapping starts once
+        they are available
+
+            Args:
+                flag (bool) if true snap
+        """
+        self._snapper.set_enabled(flag)
+
+    def snap_point(self, point, anchor=None):
+        """
+        move a corner of the rectangle being drawn to the nearest strong edges
+
+            Args:
+                point (QPoint) the corner
+                anchor (QPoint) the opposite corner, or None if not yet known
+
+            Returns:
+                (QPoint) the snapped corner, or point if snapping is not available
+        """
+        if anchor is None:
+            return qc.QPoint(*self._snapper.snap(point.x(), point.y()))
+
+        return qc.QPoint(*self._snapper.snap(point.x(), point.y(), anchor.x(), anchor.y()))
+
+    def set_rapid(self, flag):
+        """
+        turn rapid mode on or off, turning it off accepts any pending regions
+
+            Args:
+                flag (bool) if true drawn rectangles become pending regions
+        """
+        if not flag:
+            self.accept_pending()
+
+        self._rapid = flag
+        if flag:
+            self.setFocus()
+
+    @property
+    def pending(self):
+        """
+        getter for the pending regions
+        """
+        return self._pending
+
+    def accept_pending(self):
+        """
+        add all the pending regions to the store as one batch
+
+            Emits:
+                new_selections ([DrawRect]) the regions
+                pending_changed (int) zero
+        """
+        if len(self._pending) == 0:
+            return
+
+        regions = self._pending
+        self._pending = []
+        self.new_selections.emit(regions)
+        self.pending_changed.emit(0)
+        self.update()
+
+    def reject_pending(self):
+        """
+        discard all the pending regions
+
+            Emits:
+                pending_changed (int) zero
+        """
+        if len(self._pending) == 0:
+            return
+
+        for region in self._pending:
+            self.update(self.display_rect(region).adjusted(-2, -2, 2, 2))
+
+        self._pending = []
+        self.pending_changed.emit(0)
+
+    def undo_pending(self):
+        """
+        discard the most recent pending region
+
+            Emits:
+                pending_changed (int) the number of regions left
+        """
+        if len(self._pending) == 0:
+            return
+
+        region = self._pending.pop()
+        self.update(self.display_rect(region).adjusted(-2, -2, 2, 2))
+        self.pending_changed.emit(len(self._pending))
+
+    def keyPressEvent(self, event):
+        """
+        in rapid mode Enter accepts the pending regions, Esc rejects them and
+        Ctrl+Z removes the most recent
+
+            Args:
+                event (QKeyEvent) the event data
+        """
+        if not self._rapid:
+            super().keyPressEvent(event)
+            return
+
+        if event.key() in (qc.Qt.Key_Return, qc.Qt.Key_Enter):
+            self.accept_pending()
+        elif event.key() == qc.Qt.Key_Escape:
+            self.reject_pending()
+        elif event.matches(qg.QKeySequence.Undo):
+            self.undo_pending()
+        else:
+            super().keyPressEvent(event)
+
     def set_no_action(self):
         """
         set the state to
@@ -152,7 +352,11 @@ class RegionSelectionLabel(qw.QLabel):
         """
         if event.button() == qc.Qt.LeftButton:
             if self._state ==  SelectionState.ADD_NEW_REGION:
-                self._start = event.pos()
+                self._start = self.snap_point(event.pos())
+            elif self._state in (SelectionState.DISPLAY_ALL, SelectionState.DISPLAY_SELECTED):
+                signal = self.point_toggled if event.modifiers() & qc.Qt.ControlModifier \
+                    else self.point_selected
+                signal.emit(int(event.pos().x()/self._zoom), int(event.pos().y()/self._zoom))
 
     def mouseMoveEvent(self, event):
         """
@@ -165,8 +369,13 @@ class RegionSelectionLabel(qw.QLabel):
                 None
         """
         if self._start is not None:
-            self._end = event.pos()
-            self.repaint()
+            old_end = self._end if self._end is not None else self._start
+            self._end = self.snap_point(event.pos(), self._start)
+
+            # only the area covered by the old and new rubber bands is redrawn
+            dirty = qc.QRect(self._start, old_end).normalized().united(
+                qc.QRect(self._start, self._end).normalized())
+            self.update(dirty.adjusted(-2, -2, 2, 2))
 
     def mouseReleaseEvent(self, event):
         """
@@ -179,8 +388,15 @@ class RegionSelectionLabel(qw.QLabel):
                 None
         """
         if event.button() == qc.Qt.LeftButton and self._state ==  SelectionState.ADD_NEW_REGION:
+            if self._start is None:
+                return
+
+            self._end = self.snap_point(event.pos(), self._start)
+
+            if self._rapid:
+                self.add_pending()
+                return
 
-            self._end = event.pos()
             self.repaint()
             reply = qw.QMessageBox.question(
                 self,
@@ -206,6 +422,26 @@ class RegionSelectionLabel(qw.QLabel):
         self._rectangle = None
         self.repaint()
 
+    def add_pending(self):
+        """
+        make the rectangle being drawn into a pending region, a click with no
+        drag is ignored
+
+            Emits:
+                pending_changed (int) the number of pending regions
+        """
+        old = qc.QRect(self._start, self._end).normalized()
+        region = self.current_rectangle()
+        self._start = None
+        self._end = None
+        self.update(old.adjusted(-2, -2, 2, 2))
+
+        if region.width == 0 or region.height == 0:
+            return
+
+        self._pending.append(region)
+        self.pending_changed.emit(len(self._pending))
+
     def make_rectangle(self):
         """
         add a new rectangle to the store and emit a QSignal to notify other QWidgets
@@ -216,9 +452,22 @@ class RegionSelectionLabel(qw.QLabel):
             Returns:
                 None
         """
+        self._rectangle = self.current_rectangle()
+        self._start = None
+        self._end = None
+
+        self.new_selection.emit(self._rectangle)
+
+    def current_rectangle(self):
+        """
+        the rectangle being drawn in image coordinates
+
+            Returns:
+                (DrawRect) the rectangle
+        """
         # get horizontal range
         horiz = (self._start.x(), self._end.x())
-        zoom = 1.0
+        zoom = self._zoom
 
         # get horizontal range
         start_h = np.uint32(np.round(min(horiz)/zoom))
@@ -229,12 +478,70 @@ class RegionSelectionLabel(qw.QLabel):
         start_v = np.uint32(np.round(min(vert)/zoom))
         end_v = np.uint32(np.round(max(vert)/zoom))
 
-        self._rectangle = DrawRect(start_v, end_v, start_h, end_h)
-        self._start = None
-        self._end = None
+        return DrawRect(start_v, end_v, start_h, end_h)
 
-        self.new_selection.emit(self._rectangle)
+    def update_selection(self, old_region, new_region):
+        """
+        schedule a repaint of only the previously and newly selected regions
+
+            Args:
+                old_region (DrawRect) the previously selected region, or None
+                new_region (DrawRect) the newly selected region, or None
+        """
+        for region in (old_region, new_region):
+            if region is not None:
+                self.update(self.display_rect(region).adjusted(-2, -2, 2, 2))
 
+    @staticmethod
+    def region_rect(region):
+        """
+        the rectangle of a region in label coordinates
+
+            Args:
+                region (DrawRect) the region
+
+            Returns:
+                QRect
+        """
+        rectangle = DrawRect(region.top, region.bottom, region.left, region.right)
+        return qc.QRect(rectangle.left, rectangle.top, rectangle.width, rectangle.height)
+
+    def display_rect(self, region):
+        """
+        the rectangle of a region in display coordinates
+
+            Args:
+                region (DrawRect) the region
+
+            Returns:
+                QRect
+        """
+        rect = RegionSelectionLabel.region_rect(region)
+        if self._zoom == 1.0:
+            return rect
+
+        return qc.QRect(qc.QPoint(int(rect.left()*self._zoom), int(rect.top()*self._zoom)),
+                        qc.QSize(max(1, round(rect.width()*self._zoom)),
+                                 max(1, round(rect.height()*self._zoom))))
+
+    def image_rect(self, rect):
+        """
+        a rectangle in display coordinates converted to image coordinates
+
+            Args:
+                rect (QRect) the rectangle in display coordinates
+
+            Returns:
+                QRect
+        """
+        if self._zoom == 1.0:
+            return rect
+
+        return qc.QRect(qc.QPoint(int(rect.left()/self._zoom), int(rect.top()/self._zoom)),
+                        qc.QPoint(int(np.ceil((rect.right() + 1)/self._zoom)),
+                                  int(np.ceil((rect.bottom() + 1)/self._zoom))))
+
+    @timed("paint_event")
     def paintEvent(self, event):
         """
         if selecting than draw a rectagle
@@ -246,35 +553,49 @@ class RegionSelectionLabel(qw.QLabel):
                 None
         """
 
-        # pass on to get pixmap displayed
         qw.QLabel.paintEvent(self, event)
 
-        self.draw_rectangles()
+        # only the exposed part of the image is drawn
+        if self._image_store is not None:
+            painter = qg.QPainter(self)
+            painter.drawImage(event.rect(), self._image_store.view(), event.rect())
+            painter.end()
+
+        self.draw_rectangles(event.rect())
 
-    def draw_rectangles(self):
+    def draw_rectangles(self, rect):
         """
         Draw the alreay selected rectangles and, if in selecting mode
         the current selection
 
+            Args:
+                rect (QRect) the area to be redrawn
+
             Returns:
                 None
         """
 
-        pen = qg.QPen(qg.QColor(qc.Qt.black), 1, qc.Qt.DashLine)
-        brush = qg.QBrush(qg.QColor(255, 255, 255, 120))
         painter = qg.QPainter(self)
-        painter.setPen(pen)
-        painter.setBrush(brush)
+        painter.setPen(region_pen())
+        painter.setBrush(region_brush())
 
         if self._state == SelectionState.ADD_NEW_REGION:
             self.draw_adding_mode(painter)
         elif self._state == SelectionState.DISPLAY_SELECTED:
             self.draw_selected_mode(painter)
         elif self._state == SelectionState.DISPLAY_ALL:
-            self.draw_showing_all_regions(painter)
+            self.draw_showing_all_regions(painter, rect)
         else:
             print(self._state)
 
+        if self._state != SelectionState.NO_ACTION:
+            self.draw_selected_highlight(painter)
+
+        if len(self._pending) > 0:
+            painter.setPen(pending_pen())
+            for region in self._pending:
+                self.draw_region(painter, region)
+
     def draw_adding_mode(self, painter):
         """
         draw the user's current input rectangle
@@ -288,11 +609,7 @@ class RegionSelectionLabel(qw.QLabel):
         if self._start is not None and self._end is not None:
             painter.drawRect(qc.QRect(self._start, self._end))
         elif self._rectangle is not None:
-            rect = qc.QRect(self._rectangle.left,
-                            self._rectangle.top,
-                            self._rectangle.width,
-                            self._rectangle.height)
-            painter.drawRect(rect)
+            painter.drawRect(self.display_rect(self._rectangle))
 
     def draw_selected_mode(self, painter):
         """
@@ -304,13 +621,14 @@ class RegionSelectionLabel(qw.QLabel):
             Returns:
                 None
         """
-        region = self._parent.get_selected_region()
+        region = self._regions_store.get_selected_region()
 
         if region is None:
             return
 
-        if region.time_in_region(self._parent.current_image):
-            self.draw_region(painter, region)
+        frame = self._regions_store.current_image
+        if region.time_in_region(frame):
+            self.draw_region(painter, region.at_frame(frame))
 
     def draw_region(self, painter, region):
         """
@@ -320,15 +638,37 @@ class RegionSelectionLabel(qw.QLabel):
                 painter (QPainter) the painter to be used
                 region (Region) the region to be drawn
         """
-        rectangle = DrawRect(region.top, region.bottom, region.left, region.right)
-        painter.drawRect(qc.QRect(rectangle.left, rectangle.top, rectangle.width, rectangle.height))
+        painter.drawRect(self.display_rect(region))
+
+    def draw_selected_highlight(self, painter):
+        """
+        outline the selected regions that exist in the current frame
+
+            Args:
+                painter (QPainter) the painter to be used
+        """
+        if self._regions_store is None:
+            return
+
+        regions = self._regions_store.get_selected_regions_at_frame()
+        if len(regions) == 0:
+            return
+
+        painter.save()
+        painter.setPen(selected_pen())
+        painter.setBrush(qc.Qt.NoBrush)
+        for region in regions:
+            self.draw_region(painter, region)
+        painter.restore()
 
-    def draw_showing_all_regions(self, painter):
+    def draw_showing_all_regions(self, painter, rect):
         """
-        draw all the regions
+        draw all the regions, or if only part of the label is being repainted
+        the regions overlapping that part
 
             Args:
                 painter (QPainter) the painter to be used
+                rect (QRect) the area to be redrawn
 
             Returns:
                 None
@@ -337,5 +677,11 @@ class RegionSelectionLabel(qw.QLabel):
         if self._regions_store is None:
             return
 
-        for region in self._regions_store.get_regions():
+        frame = self._regions_store.current_image
+        if rect.contains(self.rect()):
+            regions = self._regions_store.get_regions_at_frame(frame)
+        else:
+            regions = self._regions_store.get_regions_in_rect(frame, self.image_rect(rect))
+
+        for region in regions:
             self.draw_region(painter, region)
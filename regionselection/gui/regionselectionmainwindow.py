@@ -21,22 +21,45 @@ This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
 # pylint: disable = c-extension-no-member
 
 import os
-import csv
 import pathlib
-import numpy as np
 
 import PyQt5.QtWidgets as qw
-import PyQt5.QtGui as qg
 import PyQt5.QtCore as qc
-import PyQt5.QtPrintSupport as qp
 
 from regionselection.gui.Ui_regionselectionmainwindow import Ui_RegionSelectionMainWindow
 from regionselection.gui.resultstablewidget import ResultsTableWidget
-from regionselection.gui.regionselectionwidget import RegionSelectionWidget
+from regionselection.gui.regionselectionwidget import RegionSelectionWidget, CANVAS_BACKENDS
 from regionselection.gui.regionstablemodel import RegionsTableModel
-from regionselection.util.drawrect import DrawRect
+from regionselection.gui.changebus import ChangeBus
+from regionselection.util.drawrect import DrawRect, array_to_regions, regions_to_array
+from regionselection.util.lazyimport import lazy_import
+from regionselection.util.instrumentation import timed
+import regionselection.util.instrumentation as instrumentation
 import regionselection.util.autosavebinary as autosave
 
+# rarely used subsystems, loaded on first use to keep start up fast
+csv = lazy_import("csv")
+regionfiles = lazy_import("regionselection.util.regionfiles")
+regionvalidation = lazy_import("regionselection.util.regionvalidation")
+regiontransforms = lazy_import("regionselection.util.regiontransforms")
+memoryreport = lazy_import("regionselection.util.memoryreport")
+timerect = lazy_import("regionselection.util.timerect")
+intervalindex = lazy_import("regionselection.util.intervalindex")
+hitgrid = lazy_import("regionselection.util.hitgrid")
+framesequence = lazy_import("regionselection.util.framesequence")
+annotationqueue = lazy_import("regionselection.util.annotationqueue")
+proposalworker = lazy_import("regionselection.gui.proposalworker")
+np = lazy_import("numpy")
+tableexport = lazy_import("regionselection.gui.tableexportworker")
+projectbundle = lazy_import("regionselection.util.projectbundle")
+sqliteregions = lazy_import("regionselection.util.sqliteregions")
+imagestore = lazy_import("regionselection.util.imagestore")
+fingerprint = lazy_import("regionselection.util.fingerprint")
+renderer = lazy_import("regionselection.util.regionrenderer")
+labelmask = lazy_import("regionselection.util.labelmask")
+syncserver = lazy_import("regionselection.gui.syncserver")
+syncclient = lazy_import("regionselection.gui.syncclient")
+
 class RegionSelectionMainWindow(qw.QMainWindow, Ui_RegionSelectionMainWindow):
     """
     The main window
@@ -48,12 +71,24 @@ class RegionSelectionMainWindow(qw.QMainWindow, Ui_RegionSelectionMainWindow):
     ## signal to indicate the user has read a data file
     replace_data = qc.pyqtSignal(list)
 
-    def __init__(self, parent=None):
+    ## signal to indicate several new regions are to be added at once
+    new_selections = qc.pyqtSignal(list)
+
+    ## signal to indicate several regions are to be overwritten, carries rows and regions
+    changed_regions = qc.pyqtSignal(object, list)
+
+    ## signal to indicate the size of the displayed image, carries width and height
+    image_bounds = qc.pyqtSignal(int, int)
+
+    def __init__(self, parent=None, canvas=None, store=None):
         """
         the object initalization function
 
             Args:
                 parent (QObject): the parent QObject for this window
+                canvas (string): the canvas backend, "label" or "scene", None for the default
+                store (string): a SQLite database to keep the regions in, None to use
+                                REGIONSELECTION_STORE, or memory if that is not set
 
             Returns:
                 None
@@ -67,14 +102,49 @@ class RegionSelectionMainWindow(qw.QMainWindow, Ui_RegionSelectionMainWindow):
         ## the results widget
         self._results_widget = None
 
-        ## storage for the image
-        self._image = None
+        ## the single owner of the image data, the canvas and exporters use its views
+        self._image_store = None
 
-        ## storage for the regions
+        ## path to the image file
+        self._image_path = None
+
+        ## the database holding the regions, None if they are kept in memory
+        self._store_path = store if store is not None else os.environ.get("REGIONSELECTION_STORE")
+
+        ## storage for the regions, a list or a SQLiteRegions with the same interface
         self._regions = []
+        if self._store_path is not None:
+            self._regions = sqliteregions.SQLiteRegions(self._store_path)
+
+        ## the current frame of an image sequence
+        self._current_image = 0
+
+        ## index of the regions' frame ranges, None if it must be rebuilt
+        self._frame_index = None
 
-        self.setup_drawing_tab()
-        self.setup_table_tab()
+        ## True if any region has a limited frame range
+        self._has_time_regions = False
+
+        ## the open frame sequence or None
+        self._sequence = None
+
+        ## the open folder annotation queue or None
+        self._queue = None
+
+        ## the row of the selected region, or None
+        self._selected_region = None
+
+        ## all the selected rows, sorted
+        self._selected_rows = []
+
+        ## grid of the regions in the current frame for hit testing, None if it must be rebuilt
+        self._hit_grid = None
+
+        ## merges the model's change signals into one batch per pass of the event loop
+        self._change_bus = ChangeBus(self)
+
+        self.setup_drawing_pane(canvas)
+        self.setup_table_pane()
 
         ## storage for the autosave object
         self._autosave = None
@@ -82,48 +152,268 @@ class RegionSelectionMainWindow(qw.QMainWindow, Ui_RegionSelectionMainWindow):
         ## name of the current project
         self._project = None
 
+        ## the running table export (thread, worker, progress dialog) or None
+        self._export_thread = None
+
+        ## the instrumentation watchdog and overlay, if enabled
+        self._instrumentation = None
+
+        ## memory budgets, subsystem name to bytes
+        self._memory_budgets = {}
+
+        ## the running region proposal (thread, worker, progress dialog) or None
+        self._proposal_thread = None
+
+        ## the sync server hosted by this window, or None
+        self._sync_server = None
+
+        ## the connection to a sync server, or None
+        self._sync_client = None
+
+        ## true until the first snapshot from a sync server has been received
+        self._awaiting_snapshot = False
+
+        ## how invalid regions are repaired when loaded or added in bulk,
+        ## one of regionvalidation.POLICIES
+        self._repair_policy = os.environ.get("REGIONSELECTION_REPAIR", "clamp")
+
+        # the default needs no check, so regionvalidation is not loaded at start up
+        if self._repair_policy != "clamp" and self._repair_policy not in regionvalidation.POLICIES:
+            message = (f"Unknown REGIONSELECTION_REPAIR \"{self._repair_policy}\", "
+                       f"use one of {', '.join(regionvalidation.POLICIES)}; clamping")
+            self.statusBar().showMessage(message, 10000)
+            self._repair_policy = "clamp"
+
+        if instrumentation.ENABLED:
+            self.setup_instrumentation()
+
+    def setup_instrumentation(self):
+        """
+        start the event loop watchdog and the statistics overlay, the overlay is
+        hidden if REGIONSELECTION_INSTRUMENT_OVERLAY=0 and the statistics are
+        written periodically to the file named by REGIONSELECTION_INSTRUMENT_DUMP
+        """
+        overlay_module = lazy_import("regionselection.gui.instrumentationoverlay")
+
+        watchdog = overlay_module.EventLoopWatchdog(self)
+        overlay = overlay_module.InstrumentationOverlay(
+            self,
+            os.environ.get("REGIONSELECTION_INSTRUMENT_DUMP"))
+        overlay.setVisible(os.environ.get("REGIONSELECTION_INSTRUMENT_OVERLAY", "1") != "0")
+
+        self._instrumentation = (watchdog, overlay)
+
     def make_autosave(self):
         """
-        create a new autosave file
+        create a new autosave file, or in a queue use the current image's, regions
+        in a database need no file so their session is named after the project
+        """
+        if self._queue is not None:
+            self._autosave = self._queue.autosave(self._current_image)
+            return
+
+        if self._store_path is not None:
+            self._regions.set_project(self._project, self._image_path)
+            return
+
+        self._autosave = autosave.AutoSaveBinary(self._project,
+                                                 fingerprint=self.image_fingerprint())
+
+    def image_fingerprint(self):
+        """
+        the fingerprint of the current image file's contents
+
+            Returns:
+                (string) the fingerprint, or None if there is no readable image file
         """
-        self._autosave = autosave.AutoSaveBinary(self._project)
+        if self._image_path is None:
+            return None
 
-    def setup_drawing_tab(self):
+        try:
+            return fingerprint.image_fingerprint(self._image_path)
+        except OSError:
+            return None
+
+    def setup_drawing_pane(self, canvas=None):
         """
-        initalize the drawing widget
+        initalize the drawing widget, in the left pane of the splitter
+
+            Args:
+                canvas (string): the canvas backend, None for the default, an
+                                 unknown backend is reported and the label used
         """
-        tab = self._tabWidget.widget(0)
-        self._drawing_widget = RegionSelectionWidget(tab, self)
-        layout = qw.QVBoxLayout(tab)
+        if canvas is None:
+            canvas = os.environ.get("REGIONSELECTION_CANVAS", "label")
+
+        if canvas not in CANVAS_BACKENDS:
+            message = (f"Unknown canvas \"{canvas}\", "
+                       f"use one of {', '.join(CANVAS_BACKENDS)}; using label")
+            self.statusBar().showMessage(message, 10000)
+            canvas = "label"
+
+        self._drawing_widget = RegionSelectionWidget(self._imagePane, self, canvas)
+        layout = qw.QVBoxLayout(self._imagePane)
+        layout.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(self._drawing_widget)
 
-    def setup_table_tab(self):
+    def setup_table_pane(self):
         """
-        initalize the results table widget
+        initalize the results table widget, in the right pane of the splitter
         """
-        tab = self._tabWidget.widget(1)
         model = RegionsTableModel(self._regions)
-        self._results_widget = ResultsTableWidget(tab, model)
-        layout = qw.QVBoxLayout(tab)
+        self._results_widget = ResultsTableWidget(self._dataPane, model)
+        layout = qw.QVBoxLayout(self._dataPane)
+        layout.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(self._results_widget)
 
+        self._splitter.setStretchFactor(0, 3)
+        self._splitter.setStretchFactor(1, 1)
+
         self.new_selection.connect(model.add_region)
+        self.new_selections.connect(model.add_regions)
         self.replace_data.connect(model.replace_data)
-        model.dataChanged.connect(self.data_changed)
+        self.changed_regions.connect(model.update_regions)
+        self.image_bounds.connect(model.set_bounds)
+        self._results_widget.row_selected.connect(self.region_selected)
+        self._results_widget.rows_selected.connect(self.rows_selected)
+        self._change_bus.connect_model(model)
+        self._change_bus.changed.connect(self.regions_changed)
+
+        # cheap invalidations are made at once so nothing can use stale indices
+        model.modelReset.connect(self.clear_selection)
+        model.modelReset.connect(self.invalidate_frame_index)
+        model.rowsInserted.connect(self.invalidate_frame_index)
+        model.dataChanged.connect(self.invalidate_frame_index)
+
+    @qc.pyqtSlot(object)
+    @timed("regions_changed")
+    def regions_changed(self, batch):
+        """
+        callback for the merged changes to the regions made during one pass of
+        the event loop, redraw once and autosave once; replacing all the regions,
+        by loading a file, does not autosave unless they were edited after it
+
+            Args:
+                batch (ChangeBatch) the changes
+        """
+        self._drawing_widget.regions_changed(batch)
+
+        if len(batch.inserted) > 0 or len(batch.changed) > 0 or batch.edited_after_reset:
+            self.autosave()
+
+        if self._sync_client is not None:
+            if batch.reset and self.sync_blocker() is not None:
+                # loaded regions that change between frames cannot be shared
+                self.leave_sync_session()
+                self.statusBar().showMessage(
+                    "Left the sync session, the regions change between frames")
+            else:
+                self._sync_client.regions_changed(batch, self._regions)
+
+    @qc.pyqtSlot(int)
+    def region_selected(self, row):
+        """
+        callback for the selection of a row of the table, highlight the region
+        and scroll it into view, only the old and new regions are redrawn
+
+            Args:
+                row (int) the row, -1 if there is none
+        """
+        old_region = self.selected_region_at_frame()
+        self._selected_region = row if 0 <= row < len(self._regions) else None
+        self._drawing_widget.show_selection(old_region, self.selected_region_at_frame())
+
+    @qc.pyqtSlot(object)
+    def rows_selected(self, rows):
+        """
+        callback for a change of the rows selected in the table, outline the regions
+
+            Args:
+                rows (numpy.array) the sorted rows
+        """
+        self._selected_rows = rows
+        self._drawing_widget.show_selected_rows()
+
+    @qc.pyqtSlot(int, int)
+    def point_toggled(self, x_pos, y_pos):
+        """
+        callback for a control click on the image, add the smallest region
+        containing the point to the selection, or remove it if selected
+
+            Args:
+                x_pos (int) the x coordinate in the image
+                y_pos (int) the y coordinate in the image
+        """
+        row = self.get_hit_grid().at_point(x_pos, y_pos)
+        if row is not None:
+            self._results_widget.toggle_row(row)
 
-    @qc.pyqtSlot(qc.QModelIndex, qc.QModelIndex)
-    def data_changed(self, tl_index, br_index):
+    @qc.pyqtSlot(int, int)
+    def point_selected(self, x_pos, y_pos):
         """
-        callback for user editing of the data via tableview
+        callback for a click on the image, select the row of the smallest
+        region containing the point, or clear the selection
 
             Args:
-                tl_index (qc.QModelIndex) top left location in data
-                br_index (qc.QModelIndex) bottom right location in data
+                x_pos (int) the x coordinate in the image
+                y_pos (int) the y coordinate in the image
+        """
+        row = self.get_hit_grid().at_point(x_pos, y_pos)
+        self._results_widget.select_row(-1 if row is None else row)
+
+    @qc.pyqtSlot()
+    def clear_selection(self):
+        """
+        callback for the replacement of all the regions, forget the selection
+        """
+        self._selected_region = None
+        self._selected_rows = []
+
+    def get_selected_region(self):
+        """
+        getter for the selected region
+
+            Returns:
+                (DrawRect) the region or None
+        """
+        if self._selected_region is None:
+            return None
+
+        return self._regions[self._selected_region]
+
+    def get_selected_regions_at_frame(self):
+        """
+        getter for the selected regions existing in the current frame
+
+            Returns:
+                ([DrawRect]) the regions with their coordinates in the current frame
+        """
+        rows = np.asarray(self._selected_rows, dtype=np.int64)
+        rows = rows[rows < len(self._regions)]
+
+        indices = self.get_region_indices_at_frame(self._current_image)
+        if indices is None:
+            return [self._regions[row] for row in rows.tolist()]
+
+        rows = rows[np.isin(rows, indices)]
+        return [self._regions[row].at_frame(self._current_image) for row in rows.tolist()]
+
+    def selected_region_at_frame(self):
+        """
+        getter for the selected region in the current frame
+
+            Returns:
+                (DrawRect) the region with its coordinates in the current frame,
+                or None if there is no selection or it is not in the frame
         """
-        self._drawing_widget.repaint()
-        self.autosave()
+        region = self.get_selected_region()
+        if region is None or not region.time_in_region(self._current_image):
+            return None
+
+        return region.at_frame(self._current_image)
 
     @qc.pyqtSlot(DrawRect)
+    @timed("new_region")
     def new_region(self, region):
         """
         slot for signal that a new regions has been selected, emit own signal
@@ -134,18 +424,28 @@ class RegionSelectionMainWindow(qw.QMainWindow, Ui_RegionSelectionMainWindow):
             Emits:
                 new_selection (DrawRect) forward the message to the data model
         """
+        # in a sequence a new region exists only in the current frame
+        if self._sequence is not None:
+            region = timerect.TimeRect(*region[:4], self._current_image, self._current_image)
+
+        if self._sync_client is not None:
+            self._sync_client.send_inserts(regions_to_array([region]))
+            return
+
         self.new_selection.emit(region)
-        self.autosave()
 
     @qc.pyqtSlot()
+    @timed("load_data")
     def load_data(self):
         """
         callback for loading data from csv file
         """
-        if self._image is None:
+        if self._image_store is None:
             qw.QMessageBox.information(self, "No Image", "You must have an image")
             return
 
+        self.commit_pending()
+
         if len(self._regions) > 0:
             reply = qw.QMessageBox.question(self,
                                             "Overwrite",
@@ -154,14 +454,16 @@ class RegionSelectionMainWindow(qw.QMainWindow, Ui_RegionSelectionMainWindow):
             if reply == qw.QMessageBox.No:
                 return
 
-        # get a list of backups and list of project names
-        projects = autosave.AutoSaveBinary.list_backups(os.getcwd())
-        matches = [tmp for tmp in projects if tmp[1] == self._project]
+        # backups of this image found by fingerprint, otherwise by project name
+        matches = self.find_backups()
+        current = None if self._autosave is None else self._autosave.get_file_path()
+        matches = [tmp for tmp in matches if tmp[0] != current]
 
         if len(matches) > 0:
             reply = qw.QMessageBox.question(self,
                                             "Duplicate",
-                                            "A back up of the project exists. Load instead?")
+                                            f"A back up of the project ({matches[0][1]}) exists. "
+                                            "Load instead?")
 
             if reply == qw.QMessageBox.Yes:
                 self.load_backup_file(matches[0][0])
@@ -185,35 +487,59 @@ class RegionSelectionMainWindow(qw.QMainWindow, Ui_RegionSelectionMainWindow):
             Args:
                 reader (csv.reader) a ready to go csv file reader
         """
-        # get the project name and
-        self._project = next(reader, "No Name")
-        self.setWindowTitle(self._project[0])
-
-        # pop the headers
-        next(reader, None)
+        try:
+            self._project, regions = regionfiles.parse_regions_csv(reader)
+        except ValueError as error:
+            qw.QMessageBox.warning(self, "Load Regions", str(error))
+            return
 
-        # replace the regions
-        regions = []
-        for row in reader:
-            region = DrawRect(np.uint32(row[0]),
-                              np.uint32(row[1]),
-                              np.uint32(row[2]),
-                              np.uint32(row[3]))
-            regions.append(region)
+        self.setWindowTitle(self._project)
 
-        self.replace_data.emit(regions)
+        self.replace_data.emit(self.check_regions(array_to_regions(regions)))
         self.make_autosave()
 
     def load_backup_file(self, file_name):
         """
-        read and load a binary backup
+        read and load a binary backup, or an earlier session of the database
 
             Args:
-                file_name (string) the file path including name
+                file_name (string or int) the file path including name, or the session number
         """
-        self._project, regions = autosave.AutoSaveBinary.get_backup_project(file_name)
+        self.commit_pending()
+        if self._store_path is not None:
+            self._project, regions = self._regions.read_session(file_name)
+        else:
+            self._project, regions = autosave.AutoSaveBinary.get_backup_project(file_name)
         self.setWindowTitle(self._project)
-        self.replace_data.emit(regions)
+        self.replace_data.emit(self.check_regions(regions))
+
+    def check_regions(self, regions, quiet=False):
+        """
+        validate regions against the current image and repair them by the
+        repair policy, any problems found are reported to the user
+
+            Args:
+                regions ([DrawRect]) the regions
+                quiet (bool) if True report in the status bar rather than a dialog
+
+            Returns:
+                ([DrawRect]) the regions, repaired if the policy allows
+        """
+        if self._image_store is None or len(regions) == 0:
+            return regions
+
+        regions, report = regionvalidation.repair_region_list(regions,
+                                                              self._image_store.width(),
+                                                              self._image_store.height(),
+                                                              self._repair_policy)
+        if report.invalid > 0:
+            message = regionvalidation.report_summary(report)
+            if quiet:
+                self.statusBar().showMessage(message, 10000)
+            else:
+                qw.QMessageBox.warning(self, "Region Validation", message)
+
+        return regions
 
     @qc.pyqtSlot()
     def save_data(self):
@@ -231,46 +557,87 @@ class RegionSelectionMainWindow(qw.QMainWindow, Ui_RegionSelectionMainWindow):
             self.tr("CSV (*.csv)"))
 
         if file_name is not None and file_name != '':
-            data = []
-            for region in self._regions:
-                data.append([region.top, region.bottom, region.left, region.right])
-
-            with open(file_name, 'w', newline='') as file:
-                writer = csv.writer(file)
-                header = ["top y", "bottom y", "left x", "right x"]
-                writer.writerow([self._project])
-                writer.writerow(header)
-                writer.writerows(data)
+            regionfiles.write_regions_csv(file_name, self._project, self._regions)
 
     @qc.pyqtSlot()
     def print_table(self):
         """
-        callback for printing the table as pdf
+        callback for printing the table as pdf, or html, in a worker thread
         """
+        if self._export_thread is not None:
+            qw.QMessageBox.information(self, "Print", "An export is already running")
+            return
+
         file_name, _ = qw.QFileDialog.getSaveFileName(self,
                                                       self.tr("Save Pdf"),
                                                       os.path.expanduser('~'),
-                                                      self.tr("PDF (*.pdf)"))
+                                                      self.tr("PDF (*.pdf);; HTML (*.html)"))
 
         if file_name is None or file_name == '':
             return
 
-        printer = qp.QPrinter(qp.QPrinter.PrinterResolution)
-        printer.setOutputFormat(qp.QPrinter.PdfFormat)
-        printer.setPaperSize(qp.QPrinter.A4)
-        printer.setOutputFileName(file_name)
+        worker = tableexport.TableExportWorker(self._regions, file_name)
+        thread = qc.QThread(self)
+        worker.moveToThread(thread)
+
+        progress = qw.QProgressDialog(self.tr("Exporting table"), self.tr("Cancel"), 0, 0, self)
+        progress.setMinimumDuration(500)
+        progress.canceled.connect(worker.cancel, qc.Qt.DirectConnection)
+        worker.progress.connect(self.export_progress)
+        worker.failed.connect(self.export_failed)
+
+        thread.started.connect(worker.run)
+        worker.finished.connect(thread.quit)
+        worker.finished.connect(progress.reset)
+        thread.finished.connect(self.export_finished)
+
+        self._export_thread = (thread, worker, progress)
+        thread.start()
+
+    @qc.pyqtSlot(int, int)
+    def export_progress(self, done, total):
+        """
+        callback for progress of a table export
+
+            Args:
+                done (int) the number of pages completed
+                total (int) the total number of pages
+        """
+        progress = self._export_thread[2]
+        progress.setMaximum(total)
+        progress.setValue(done)
 
-        doc = qg.QTextDocument()
+    @qc.pyqtSlot(str)
+    def export_failed(self, message):
+        """
+        callback for an error that stopped a table export
+
+            Args:
+                message (string) the error
+        """
+        qw.QMessageBox.warning(self, "Print", f"Cannot export the table: {message}")
 
-        html_string = self._results_widget.get_table_as_html()
-        doc.setHtml(html_string)
-        doc.print(printer)
+    @qc.pyqtSlot()
+    def export_finished(self):
+        """
+        callback for the end of a table export, release the worker and thread
+        """
+        thread, worker, progress = self._export_thread
+        self._export_thread = None
+        worker.deleteLater()
+        progress.deleteLater()
+        thread.deleteLater()
 
     @qc.pyqtSlot()
     def save_image(self):
         """
-        callback for saving the current image
+        callback for saving the image, with the regions of the current frame,
+        at full resolution
         """
+        if self._image_store is None:
+            qw.QMessageBox.information(self, "No Image", "You must have an image")
+            return
+
         file_name, _ = qw.QFileDialog.getSaveFileName(self,
                                                       self.tr("Save PNG"),
                                                       os.path.expanduser('~'),
@@ -279,11 +646,100 @@ class RegionSelectionMainWindow(qw.QMainWindow, Ui_RegionSelectionMainWindow):
         if file_name is None or file_name == '':
             return
 
-        pixmap = self._drawing_widget.get_current_pixmap()
-        if pixmap is not None:
-            pixmap.save(file_name)
+        store = self._image_store
+        regions = self.get_regions_at_frame(self._current_image)
+        if store.is_downsampled():
+            # the full image is over the memory budget, save at the size of its view
+            self.statusBar().showMessage(
+                self.tr(f"Saved at {store.scale:.0%} of full size to fit the image memory budget"),
+                10000)
+            regions = store.to_view(regions_to_array(regions))
+            renderer.render_regions(store.view(), regions).save(file_name)
+            return
+
+        renderer.render_regions(store.full_image(), regions).save(file_name)
+
+    @qc.pyqtSlot()
+    def export_label_mask(self):
+        """
+        callback for saving the regions of the current frame as a label mask
+        the size of the image, region n is labelled n
+        """
+        if self._image_store is None:
+            qw.QMessageBox.information(self, "No Image", "You must have an image")
+            return
+
+        policy, okay = qw.QInputDialog.getItem(self,
+                                               "Export Label Mask",
+                                               "Where regions overlap label by",
+                                               labelmask.OVERLAP_POLICIES,
+                                               0,
+                                               False)
+        if not okay:
+            return
+
+        file_name, _ = qw.QFileDialog.getSaveFileName(self,
+                                                      self.tr("Export Label Mask"),
+                                                      os.path.expanduser('~'),
+                                                      self.tr("Numpy (*.npy)"))
+
+        if file_name is None or file_name == '':
+            return
+
+        qw.QApplication.setOverrideCursor(qc.Qt.WaitCursor)
+        try:
+            labelmask.export_mask(file_name,
+                                  self.get_regions_at_frame(self._current_image),
+                                  self._image_store.width(),
+                                  self._image_store.height(),
+                                  policy)
+        except (OSError, ValueError) as error:
+            qw.QMessageBox.warning(self, "Export Label Mask", str(error))
+        finally:
+            qw.QApplication.restoreOverrideCursor()
+
+    @qc.pyqtSlot()
+    def import_label_mask(self):
+        """
+        callback for adding the bounding boxes of the labels of a mask as regions,
+        a mask with a single foreground value gives a region per connected component
+        """
+        if self._image_store is None:
+            qw.QMessageBox.information(self, "No Image", "You must have an image")
+            return
+
+        file_name, _ = qw.QFileDialog.getOpenFileName(
+            self,
+            self.tr("Import Label Mask"),
+            os.path.expanduser('~'),
+            self.tr("Masks (*.npy *.png *.tif *.tiff *.bmp)"))
+
+        if file_name is None or file_name == '':
+            return
+
+        try:
+            mask = labelmask.read_mask(file_name)
+            if mask.shape != (self._image_store.height(), self._image_store.width()):
+                raise ValueError("The mask and the image are different sizes")
+            regions = labelmask.mask_to_regions(mask)
+        except (OSError, ValueError) as error:
+            qw.QMessageBox.warning(self, "Import Label Mask", str(error))
+            return
+
+        if len(regions) == 0:
+            qw.QMessageBox.information(self, "Import Label Mask", "The mask has no labels")
+            return
+
+        reply = qw.QMessageBox.question(self,
+                                        "Import Label Mask",
+                                        f"Add {len(regions)} regions?")
+        if reply != qw.QMessageBox.Yes:
+            return
+
+        self.add_new_regions(array_to_regions(regions))
 
     @qc.pyqtSlot()
+    @timed("load_image")
     def load_image(self):
         """
         callback for loading an image
@@ -309,21 +765,904 @@ class RegionSelectionMainWindow(qw.QMainWindow, Ui_RegionSelectionMainWindow):
             else:
                 self._project = file_name
 
-            self._image = qg.QImage(file_name)
-            self._drawing_widget.display_image(self._image)
+            self.display_image_file(file_name)
             self.setWindowTitle(self._project)
 
-    def get_regions(self):
+    def display_image_file(self, file_name):
         """
-        getter for the regions list
+        read an image file and display it, closing any open sequence or queue
+
+            Args:
+                file_name (string) the image file path
         """
-        return self._regions
+        self.commit_pending()
+        self.close_sequence()
+        self.close_queue()
+        try:
+            store = imagestore.ImageStore.open(file_name, self.image_budget())
+        except ValueError as error:
+            qw.QMessageBox.warning(self, "Load Image", str(error))
+            return
 
-    def autosave(self):
+        self._image_path = file_name
+        self.set_image_store(store)
+
+    def image_budget(self):
         """
-        autosave the data, creating a new file if necessary
+        the memory budget of the image, the "image" budget if one is set
+
+            Returns:
+                (int) the budget in bytes
         """
-        if self._autosave is None:
-            self.make_autosave()
+        return self._memory_budgets.get("image", imagestore.IMAGE_BUDGET)
+
+    def set_image_store(self, store):
+        """
+        make a store the owner of the image, releasing the previous one, and display it
+
+            Args:
+                store (ImageStore) the store
+        """
+        if self._image_store is not None:
+            self._image_store.release()
+
+        self._image_store = store
+        self._drawing_widget.display_image(store)
+        self.image_bounds.emit(store.width(), store.height())
+
+    @qc.pyqtSlot()
+    def open_sequence(self):
+        """
+        callback for opening a directory of numbered frames as one project
+        """
+        if self._sync_client is not None:
+            qw.QMessageBox.information(self, "Open Sequence", "Leave the sync session first")
+            return
+
+        directory = qw.QFileDialog.getExistingDirectory(self,
+                                                        self.tr("Open Sequence"),
+                                                        os.path.expanduser('~'))
+
+        if directory is None or directory == '':
+            return
+
+        try:
+            self.load_sequence(directory)
+        except (OSError, ValueError) as error:
+            qw.QMessageBox.warning(self, "Open Sequence", str(error))
+
+    def load_sequence(self, directory):
+        """
+        open a directory of frames and display the first
+
+            Args:
+                directory (string) the directory
+
+            Throws:
+                ValueError if there are no images in the directory
+        """
+        sequence = framesequence.FrameSequence(directory)
+
+        self.commit_pending()
+        self.close_sequence()
+        self.close_queue()
+        self._sequence = sequence
+        self._project = os.path.basename(os.path.normpath(directory))
+        self.setWindowTitle(self._project)
+
+        self._drawing_widget.set_frame_count(len(sequence))
+        self.show_frame(0)
+
+    def close_sequence(self):
+        """
+        close the frame sequence, if one is open
+        """
+        if self._sequence is None:
+            return
+
+        self._sequence.close()
+        self._sequence = None
+        self._current_image = 0
+        self._drawing_widget.set_frame_count(1)
+
+    @qc.pyqtSlot()
+    def open_folder_queue(self):
+        """
+        callback for opening a folder of images to be annotated one by one
+        """
+        if self._sync_client is not None:
+            qw.QMessageBox.information(self, "Open Folder", "Leave the sync session first")
+            return
+
+        directory = qw.QFileDialog.getExistingDirectory(self,
+                                                        self.tr("Open Folder"),
+                                                        os.path.expanduser('~'))
+
+        if directory is None or directory == '':
+            return
+
+        try:
+            self.load_queue(directory)
+        except (OSError, ValueError) as error:
+            qw.QMessageBox.warning(self, "Open Folder", str(error))
+
+    def load_queue(self, directory):
+        """
+        open a folder of images as an annotation queue and display the first,
+        each image has its own regions and autosave
+
+            Args:
+                directory (string) the folder
+
+            Throws:
+                ValueError if there are no images in the folder
+        """
+        queue = annotationqueue.AnnotationQueue(directory)
+
+        self.commit_pending()
+        self.close_sequence()
+        self.close_queue()
+        self._queue = queue
+
+        self._drawing_widget.set_frame_count(len(queue))
+        self.show_queue_image(0)
+
+    def commit_pending(self):
+        """
+        add any regions pending in rapid mode to the current regions and deliver
+        the changes at once, so they are autosaved with the image they were drawn
+        on before it or its regions are replaced
+        """
+        self._drawing_widget.accept_pending()
+        self._change_bus.flush()
+
+    def close_queue(self):
+        """
+        close the annotation queue, if one is open, its regions are removed
+        from the table as they belong to the queue's images
+        """
+        if self._queue is None:
+            return
+
+        self.commit_pending()
+
+        self._queue.close()
+        self._queue = None
+        self._current_image = 0
+        self._autosave = None
+        self._drawing_widget.set_frame_count(1)
+        self.replace_data.emit([])
+
+    def show_queue_image(self, index):
+        """
+        display an image of the queue with its regions, the regions of the
+        image being left are kept by the queue
+
+            Args:
+                index (int) the position in the queue
+        """
+        if not 0 <= index < len(self._queue):
+            return
+
+        image = self._queue.image(index)
+        if image.isNull():
+            qw.QMessageBox.warning(self, "Open Folder",
+                                   f"Cannot read {self._queue.path(index)}")
+            return
+
+        if self._image_store is not None:
+            # deliver outstanding changes so they autosave to the image they belong to
+            self.commit_pending()
+            self._queue.set_regions(self._current_image, self._regions)
+
+        self._image_path = self._queue.path(index)
+        self._current_image = index
+        self._project = self._queue.project(index)
+        self._autosave = None
+        self._hit_grid = None
+        self.setWindowTitle(os.path.basename(self._image_path))
+
+        self.set_image_store(imagestore.ImageStore(image, self._image_path))
+        self._drawing_widget.set_frame(index)
+        self.replace_data.emit(self._queue.regions(index))
+
+    def show_frame(self, frame):
+        """
+        display a frame of the sequence, or an image of the queue
+
+            Args:
+                frame (int) the frame number
+        """
+        if self._queue is not None:
+            self.show_queue_image(frame)
+            return
+
+        if self._sequence is None or not 0 <= frame < len(self._sequence):
+            return
+
+        # regions pending in rapid mode belong to the frame they were drawn on
+        self._drawing_widget.accept_pending()
+
+        self._image_path = self._sequence.path(frame)
+        self._current_image = frame
+        self._hit_grid = None
+        self.set_image_store(imagestore.ImageStore(self._sequence.image(frame), self._image_path))
+        self._drawing_widget.set_frame(frame)
+
+    @qc.pyqtSlot()
+    def next_frame(self):
+        """
+        callback to step forward one frame
+        """
+        self.show_frame(self._current_image + 1)
+
+    @qc.pyqtSlot()
+    def previous_frame(self):
+        """
+        callback to step back one frame
+        """
+        self.show_frame(self._current_image - 1)
+
+    @qc.pyqtSlot()
+    def save_project(self):
+        """
+        callback for saving the project as a bundle of image reference and regions
+        """
+        if self._image_path is None:
+            qw.QMessageBox.information(self, "No Image", "You must have an image")
+            return
+
+        file_name, _ = qw.QFileDialog.getSaveFileName(
+            self,
+            self.tr("Save Project"),
+            os.path.expanduser('~'),
+            self.tr("Project (*.npz)"))
+
+        if file_name is None or file_name == '':
+            return
+
+        projectbundle.ProjectBundle.save(file_name, self._project, self._image_path, self._regions)
+
+    @qc.pyqtSlot()
+    def open_project(self):
+        """
+        callback for opening a project bundle
+        """
+        file_name, _ = qw.QFileDialog.getOpenFileName(
+            self,
+            self.tr("Open Project"),
+            os.path.expanduser('~'),
+            self.tr("Project (*.npz)"))
+
+        if file_name is None or file_name == '':
+            return
+
+        try:
+            self.load_project_file(file_name)
+        except (OSError, ValueError) as error:
+            qw.QMessageBox.warning(self, "Open Project", str(error))
+
+    def load_project_file(self, file_name):
+        """
+        restore the image and the regions of a project bundle
+
+            Args:
+                file_name (string) the bundle file path
+
+            Throws:
+                ValueError if the file is not a bundle, or its image cannot be found
+        """
+        self.commit_pending()
+        with projectbundle.ProjectBundle(file_name) as bundle:
+            image_path = bundle.find_image()
+            if image_path is None:
+                raise ValueError(f"Cannot find the image {bundle.image_path}")
+
+            self._project = bundle.project
+            self.display_image_file(image_path)
+            self.replace_data.emit(self.check_regions(bundle.regions))
+
+        self.setWindowTitle(self._project)
+        self.make_autosave()
+
+    def transform_selected_regions(self, title, transform):
+        """
+        apply a transform to all the selected regions in one vectorised
+        computation, the model is updated, and so the canvas redrawn and the
+        regions autosaved, once
+
+            Args:
+                title (string) the title of any message box
+                transform (callable) maps an (N, 4) array to a uint32 (N, 4) array
+        """
+        rows = np.asarray(self._selected_rows, dtype=np.int64)
+        rows = rows[rows < len(self._regions)]
+        if len(rows) == 0:
+            qw.QMessageBox.information(self, title, "Select the regions in the table first")
+            return
+
+        try:
+            regions = regiontransforms.transform_regions(
+                [self._regions[row] for row in rows.tolist()], transform)
+        except ValueError as error:
+            qw.QMessageBox.warning(self, title, str(error))
+            return
+
+        self.changed_regions.emit(rows, regions)
+        self.statusBar().showMessage(f"{title}: {len(rows)} regions changed", 5000)
+
+    def ask_pair(self, title, label, default):
+        """
+        ask the user for two numbers
+
+            Args:
+                title (string) the dialog title
+                label (string) the prompt
+                default ((number, number)) the initial values
+
+            Returns:
+                ((float, float)) the numbers, or None if cancelled or not two numbers
+        """
+        text, okay = qw.QInputDialog.getText(self, title, label,
+                                             text=f"{default[0]}, {default[1]}")
+        if not okay:
+            return None
+
+        try:
+            first, second = (float(part) for part in text.replace(",", " ").split())
+        except ValueError:
+            qw.QMessageBox.warning(self, title, "Enter two numbers")
+            return None
+
+        return first, second
+
+    @qc.pyqtSlot()
+    def move_selected_regions(self):
+        """
+        callback for shifting the selected regions, edges are clamped to the image
+        """
+        if self._image_store is None:
+            qw.QMessageBox.information(self, "No Image", "You must have an image")
+            return
+
+        shift = self.ask_pair("Move Regions", "Shift in x and y (pixels)", (0, 0))
+        if shift is None:
+            return
+
+        width = self._image_store.width()
+        height = self._image_store.height()
+        self.transform_selected_regions(
+            "Move Regions",
+            lambda regions: regiontransforms.move_regions(regions, int(shift[0]), int(shift[1]),
+                                                          width, height))
+
+    @qc.pyqtSlot()
+    def scale_selected_regions(self):
+        """
+        callback for resizing the selected regions about their centres
+        """
+        if self._image_store is None:
+            qw.QMessageBox.information(self, "No Image", "You must have an image")
+            return
+
+        factor, okay = qw.QInputDialog.getDouble(self, "Scale Regions",
+                                                 "Scale about each region's centre by",
+                                                 1.0, 0.01, 100.0, 2)
+        if not okay:
+            return
+
+        width = self._image_store.width()
+        height = self._image_store.height()
+        self.transform_selected_regions(
+            "Scale Regions",
+            lambda regions: regiontransforms.scale_regions(regions, factor, about_centre=True,
+                                                           width=width, height=height))
+
+    @qc.pyqtSlot()
+    def resample_selected_regions(self):
+        """
+        callback for re-projecting the selected regions, drawn on the image at
+        another size, onto the current image
+        """
+        if self._image_store is None:
+            qw.QMessageBox.information(self, "No Image", "You must have an image")
+            return
+
+        new_size = (self._image_store.width(), self._image_store.height())
+        old_size = self.ask_pair("Resample Regions",
+                                 "Width and height of the image the regions were drawn on",
+                                 new_size)
+        if old_size is None:
+            return
+
+        self.transform_selected_regions(
+            "Resample Regions",
+            lambda regions: regiontransforms.resample_regions(regions, old_size, new_size))
+
+    @qc.pyqtSlot()
+    def propose_regions(self):
+        """
+        callback to find candidate regions in the image in a worker thread
+        """
+        if self._image_store is None:
+            qw.QMessageBox.information(self, "No Image", "You must have an image")
+            return
+
+        if self._proposal_thread is not None:
+            return
+
+        # a downsampled image is analysed at the size of its view
+        store = self._image_store
+        image = store.view() if store.is_downsampled() else store.full_image()
+        worker = proposalworker.ProposalWorker(image)
+        thread = qc.QThread(self)
+        worker.moveToThread(thread)
+
+        progress = qw.QProgressDialog(self.tr("Finding regions"), None, 0, 0, self)
+        progress.setMinimumDuration(500)
+        worker.progress.connect(self.proposal_progress)
+
+        thread.started.connect(worker.run)
+        worker.failed.connect(self.proposals_failed)
+        worker.finished.connect(self.proposals_ready)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(thread.deleteLater)
+
+        self._proposal_thread = (thread, worker, progress, store)
+        thread.start()
+
+    @qc.pyqtSlot(int, int)
+    def proposal_progress(self, done, total):
+        """
+        callback for progress of region proposal
+
+            Args:
+                done (int) the number of rows processed
+                total (int) the total number of rows
+        """
+        progress = self._proposal_thread[2]
+        progress.setMaximum(total)
+        progress.setValue(done)
+
+    @qc.pyqtSlot(str)
+    def proposals_failed(self, message):
+        """
+        callback for an error that stopped region proposal
+
+            Args:
+                message (string) the error
+        """
+        qw.QMessageBox.warning(self, "Propose Regions", f"Cannot find regions: {message}")
+
+    @qc.pyqtSlot(object)
+    def proposals_ready(self, proposals):
+        """
+        callback for the end of region proposal, offer the proposals for acceptance
+
+            Args:
+                proposals (numpy.array) uint32 (N, 4) array of regions, None if it failed
+        """
+        _, worker, progress, store = self._proposal_thread
+        self._proposal_thread = None
+        progress.reset()
+        progress.deleteLater()
+        worker.deleteLater()
+
+        if proposals is None:
+            return
+
+        if len(proposals) == 0:
+            qw.QMessageBox.information(self, "Propose Regions", "No regions were found")
+            return
+
+        reply = qw.QMessageBox.question(self,
+                                        "Propose Regions",
+                                        f"Accept {len(proposals)} proposed regions?")
+        if reply != qw.QMessageBox.Yes:
+            return
+
+        self.add_new_regions(array_to_regions(store.from_view(proposals)))
+
+    def add_new_regions(self, regions):
+        """
+        add several regions with one model update, and so one repaint and one autosave
+
+            Args:
+                regions ([DrawRect]) the regions
+        """
+        regions = self.check_regions(regions, quiet=True)
+
+        if self._sequence is not None:
+            frame = self._current_image
+            regions = [timerect.TimeRect(*region[:4], frame, frame) for region in regions]
+
+        if self._sync_client is not None:
+            self._sync_client.send_inserts(regions_to_array(regions))
+            return
+
+        self.new_selections.emit(regions)
+
+    def sync_blocker(self):
+        """
+        the reason the regions cannot be synced, the sync protocol carries only
+        the box of each region so frame ranges and keyframes would be lost
+
+            Returns:
+                (string) the reason, or None if the regions can be synced
+        """
+        if self._queue is not None:
+            return "Close the folder queue first"
+
+        if self._sequence is not None:
+            return "Sync sessions cannot be used with a sequence, close it first"
+
+        if self.get_region_indices_at_frame(self._current_image) is not None:
+            return "Sync sessions cannot be used with regions that change between frames"
+
+        return None
+
+    @qc.pyqtSlot()
+    def host_sync_session(self):
+        """
+        callback to start a sync server, on this computer only, and join it
+        """
+        if self._sync_server is not None or self._sync_client is not None:
+            qw.QMessageBox.information(self, "Sync", "Already in a sync session")
+            return
+
+        reason = self.sync_blocker()
+        if reason is not None:
+            qw.QMessageBox.information(self, "Sync", reason)
+            return
+
+        port, okay = qw.QInputDialog.getInt(self,
+                                            "Host Sync Session",
+                                            "Port",
+                                            syncserver.SYNC_PORT,
+                                            1024,
+                                            65535)
+        if not okay:
+            return
+
+        server = syncserver.SyncServer(self)
+        if not server.listen(port):
+            qw.QMessageBox.warning(self, "Sync", server.error_string())
+            server.deleteLater()
+            return
+
+        self._sync_server = server
+        self.connect_sync("localhost", server.port())
+
+    @qc.pyqtSlot()
+    def join_sync_session(self):
+        """
+        callback to join a sync server
+        """
+        if self._sync_client is not None:
+            qw.QMessageBox.information(self, "Sync", "Already in a sync session")
+            return
+
+        reason = self.sync_blocker()
+        if reason is not None:
+            qw.QMessageBox.information(self, "Sync", reason)
+            return
+
+        text, okay = qw.QInputDialog.getText(self,
+                                             "Join Sync Session",
+                                             "Host:Port",
+                                             qw.QLineEdit.Normal,
+                                             f"localhost:{syncserver.SYNC_PORT}")
+        if not okay or text == '':
+            return
+
+        host, _, port = text.rpartition(":")
+        if host == '' or not port.isdigit():
+            qw.QMessageBox.warning(self, "Sync", f"Cannot read the address {text}")
+            return
+
+        self.connect_sync(host, int(port))
+
+    def connect_sync(self, host, port):
+        """
+        connect to a sync server, the regions are then replaced by the server's,
+        unless the server has none, when the server is given this window's regions
+
+            Args:
+                host (string) the server host
+                port (int) the server port
+
+            Returns:
+                (bool) True if connected
+        """
+        client = syncclient.SyncClient(self)
+        client.snapshot_received.connect(self.sync_snapshot)
+        client.inserts_received.connect(self.sync_inserts)
+        client.updates_received.connect(self.sync_updates)
+        client.connection_lost.connect(self.sync_lost)
+
+        self._awaiting_snapshot = True
+        if not client.connect_to_server(host, port):
+            qw.QMessageBox.warning(self, "Sync", client.error_string())
+            client.deleteLater()
+            return False
+
+        self._sync_client = client
+        self.statusBar().showMessage(f"Synchronised with {host}:{port}")
+
+        return True
+
+    @qc.pyqtSlot()
+    def leave_sync_session(self):
+        """
+        callback to leave the sync session, and stop the server if hosting it
+        """
+        if self._sync_client is not None:
+            client = self._sync_client
+            self._sync_client = None
+            client.close()
+            client.deleteLater()
+
+        if self._sync_server is not None:
+            self._sync_server.close()
+            self._sync_server.deleteLater()
+            self._sync_server = None
+
+        self.statusBar().clearMessage()
+
+    @qc.pyqtSlot()
+    def sync_lost(self):
+        """
+        callback for the loss of the connection to the sync server
+        """
+        if self._sync_client is not None:
+            self.leave_sync_session()
+            self.statusBar().showMessage("Sync session closed")
+
+    @qc.pyqtSlot(object)
+    def sync_snapshot(self, regions):
+        """
+        callback for a snapshot of the server's regions
+
+            Args:
+                regions (numpy.array) (N, 4) the regions
+        """
+        if self._awaiting_snapshot:
+            self._awaiting_snapshot = False
+            if len(regions) == 0 and len(self._regions) > 0:
+                self._sync_client.send_replace(regions_to_array(self._regions))
+                return
+
+        self.replace_data.emit(array_to_regions(regions))
+
+    @qc.pyqtSlot(object)
+    def sync_inserts(self, regions):
+        """
+        callback for regions appended by the server
+
+            Args:
+                regions (numpy.array) (N, 4) the regions
+        """
+        self.new_selections.emit(array_to_regions(regions))
+
+    @qc.pyqtSlot(object, object)
+    def sync_updates(self, rows, regions):
+        """
+        callback for regions overwritten by the server
+
+            Args:
+                rows (numpy.array) the rows
+                regions (numpy.array) (N, 4) the new regions
+        """
+        self.changed_regions.emit(rows, array_to_regions(regions))
+
+    def set_memory_budget(self, name, budget):
+        """
+        set, or remove, the memory budget of a subsystem
+
+            Args:
+                name (string) the subsystem name as in memory_report, or "total"
+                budget (int) the budget in bytes, None to remove
+        """
+        if budget is None:
+            self._memory_budgets.pop(name, None)
+        else:
+            self._memory_budgets[name] = budget
+
+    def memory_report(self):
+        """
+        make a report of the memory used by the image, its display and the regions
+
+            Returns:
+                (dict) subsystem name to bytes
+        """
+        return memoryreport.build_report(
+            images={"image": None if self._image_store is None else self._image_store.view()},
+            regions=self._regions if self._store_path is None else None)
+
+    def check_memory_budgets(self):
+        """
+        compare the memory report against the budgets
+
+            Returns:
+                [(name, bytes, budget)] the subsystems over budget
+        """
+        return memoryreport.over_budget(self.memory_report(), self._memory_budgets)
+
+    @qc.pyqtSlot()
+    def show_memory_report(self):
+        """
+        callback to display the memory report
+        """
+        text = memoryreport.format_report(self.memory_report(), self._memory_budgets)
+        qw.QMessageBox.information(self, self.tr("Memory Report"), text)
+
+    @property
+    def current_image(self):
+        """
+        getter for the number of the current frame
+        """
+        return self._current_image
+
+    def set_current_image(self, frame):
+        """
+        change the current frame and redraw
+
+            Args:
+                frame (int) the frame number
+        """
+        self._current_image = frame
+        self._hit_grid = None
+        self._drawing_widget.frame_changed()
+
+    @qc.pyqtSlot()
+    def invalidate_frame_index(self):
+        """
+        callback for changes to the regions, the frame index and hit grid will
+        be rebuilt when next used
+        """
+        self._frame_index = None
+        self._hit_grid = None
+
+    def get_region_indices_at_frame(self, frame):
+        """
+        getter for the rows of the regions existing in a frame
+
+            Args:
+                frame (int) the frame number
+
+            Returns:
+                (numpy.array) the rows in increasing order, or None if every region exists in every frame
+        """
+        if self._frame_index is None:
+            # regions spanning every frame still move if they have keyframes
+            if self._store_path is not None:
+                starts, ends = self._regions.frame_ranges()
+                self._has_time_regions = (self._regions.has_keyframes()
+                                          or timerect.has_limited_ranges(starts, ends))
+            else:
+                starts, ends = timerect.frame_ranges(self._regions)
+                self._has_time_regions = timerect.is_time_dependent(self._regions, (starts, ends))
+            self._frame_index = intervalindex.IntervalIndex(starts, ends)
+
+        if not self._has_time_regions:
+            return None
+
+        return np.sort(self._frame_index.query(frame))
+
+    def get_regions_at_frame(self, frame):
+        """
+        getter for the regions existing in a frame, with their coordinates in that frame
+
+            Args:
+                frame (int) the frame number
+
+            Returns:
+                [DrawRect]
+        """
+        indices = self.get_region_indices_at_frame(frame)
+        if indices is None:
+            return self._regions
+
+        return [self._regions[index].at_frame(frame) for index in indices]
+
+    def get_hit_grid(self):
+        """
+        getter for the grid of the regions in the current frame, built when first needed
+
+            Returns:
+                (HitGrid) the grid, identifying the regions by row
+        """
+        if self._hit_grid is None:
+            indices = self.get_region_indices_at_frame(self._current_image)
+            regions = self.get_regions_at_frame(self._current_image)
+            self._hit_grid = hitgrid.HitGrid(regions_to_array(regions), indices)
+
+        return self._hit_grid
+
+    def get_regions_in_rect(self, frame, rect):
+        """
+        getter for the regions overlapping a rectangle in a frame
+
+            Args:
+                frame (int) the frame number
+                rect (QRect) the rectangle in image coordinates
+
+            Returns:
+                [DrawRect] the regions with their coordinates in the frame
+        """
+        if frame != self._current_image:
+            return self.get_regions_at_frame(frame)
+
+        if self._store_path is not None and self.get_region_indices_at_frame(frame) is None:
+            # the database's coordinate index avoids reading every region for a grid
+            rows = self._regions.positions_in_rect(rect.left(), rect.top(),
+                                                   rect.right(), rect.bottom())
+        else:
+            rows = self.get_hit_grid().in_rect(rect.left(), rect.top(),
+                                               rect.right(), rect.bottom())
+
+        return [self._regions[row].at_frame(frame) for row in rows]
+
+    def get_regions(self):
+        """
+        getter for the regions list
+        """
+        return self._regions
+
+    @timed("autosave")
+    def autosave(self):
+        """
+        autosave the data, creating a new file if necessary, regions in a
+        database are committed as they change so only the session's name is kept up
+        """
+        if self._autosave is None:
+            self.make_autosave()
+
+        if self._autosave is not None:
+            self._autosave.save_data(list(self._regions))
+
+    def list_backups(self):
+        """
+        list the backups that load_data can offer, the binary autosaves in the
+        working directory or the earlier sessions of the database
+
+            Returns:
+                list of tuples, each of which is (backup, project name)
+        """
+        if self._store_path is not None:
+            return self._regions.list_sessions()
+
+        return autosave.AutoSaveBinary.list_backups(os.getcwd())
+
+    def find_backups(self):
+        """
+        find the backups of the current image, binary autosaves are found by the
+        fingerprint of the image through the backup index, falling back to the
+        project name for backups made without one, database sessions by project name
+
+            Returns:
+                list of tuples, each of which is (backup, project name), newest first
+        """
+        if self._store_path is None:
+            image_fingerprint = self.image_fingerprint()
+            if image_fingerprint is not None:
+                matches = autosave.AutoSaveBinary.find_backups(os.getcwd(), image_fingerprint)
+                if len(matches) > 0:
+                    return matches
+
+        return [tmp for tmp in self.list_backups() if tmp[1] == self._project]
+
+    def closeEvent(self, event):
+        """
+        autosave any regions pending in rapid mode and close the region
+        database, if one is used, with the window
+
+            Args:
+                event (QCloseEvent) the event
+        """
+        self.commit_pending()
+
+        if self._store_path is not None:
+            self._regions.close()
 
-        self._autosave.save_data(self._regions)
+        super().closeEvent(event)
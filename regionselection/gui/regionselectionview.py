@@ -0,0 +1,606 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+provides a class, derived from QGraphicsView, offering the same selection of
+rectangular regions as RegionSelectionLabel, but drawing the regions as scene
+items. The scene's BSP tree limits painting and hit testing to the visible
+items, the image is drawn as the cached background, and the view can be zoomed.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+# set up linting conditions
+# pylint: disable = too-many-public-methods
+# pylint: disable = too-many-instance-attributes
+# pylint: disable = c-extension-no-member
+# pylint: disable = import-error
+
+import PyQt5.QtWidgets as qw
+import PyQt5.QtGui as qg
+import PyQt5.QtCore as qc
+
+from regionselection.gui.regionselectionlabel import SelectionState, RegionSelectionLabel
+from regionselection.util.drawrect import DrawRect
+from regionselection.util.regionstyle import region_pen, region_brush, selected_pen, pending_pen
+from regionselection.util.edgesnap import EdgeSnapper
+from regionselection.util.instrumentation import timed
+
+## the factor by which one wheel step zooms
+ZOOM_STEP = 1.25
+
+class RegionSelectionView(qw.QGraphicsView):
+    """
+    graphics view allowing selection of regions by drawing rectangles and
+    displaying the already selected regions as scene items
+    """
+
+    ## signal to indicate the user has selected a new rectangle
+    new_selection = qc.pyqtSignal(DrawRect)
+
+    ## signal to indicate the user has clicked on a point while regions are displayed
+    point_selected = qc.pyqtSignal(int, int)
+
+    ## signal to indicate the user has control clicked on a point while regions are displayed
+    point_toggled = qc.pyqtSignal(int, int)
+
+    ## signal to indicate the user has accepted a batch of pending regions
+    new_selections = qc.pyqtSignal(list)
+
+    ## signal carrying the number of pending regions when it changes
+    pending_changed = qc.pyqtSignal(int)
+
+    def __init__(self, parent=None, regions_store=None):
+        """
+        Set up the view
+
+            Args:
+                parent (QObject) the parent object
+                regions_store (RegionSelectionMainWindow) the object holding the regions
+        """
+        super().__init__(parent)
+
+        ## storage for the regions
+        self._regions_store = regions_store
+
+        ## the view's state
+        self._state = SelectionState.NO_ACTION
+
+        ## the scene, indexed by a BSP tree
+        self._scene = qw.QGraphicsScene(self)
+        self._scene.setItemIndexMethod(qw.QGraphicsScene.BspTreeIndex)
+        self.setScene(self._scene)
+
+        ## the owner of the image, drawn as the background
+        self._image_store = None
+
+        ## parent of the region items, hiding it hides them all
+        self._layer = None
+
+        ## the region items in row order
+        self._items = []
+
+        ## outline of the selected region
+        self._highlight = self.make_item(selected_pen(), qc.Qt.NoBrush, 3.0)
+
+        ## parent of the outlines of the other selected regions
+        self._selection_layer = None
+
+        ## the rubber band
+        self._band = self.make_item(region_pen(), qc.Qt.NoBrush, 4.0)
+
+        ## items of the regions pending in rapid mode
+        self._pending_items = []
+
+        ## holder for start of drawing in image coordinates
+        self._start = None
+
+        ## holder for end of drawing in image coordinates
+        self._end = None
+
+        ## snaps the edges of new rectangles to image edges
+        self._snapper = EdgeSnapper()
+
+        ## if true drawn rectangles become pending regions, with no confirmation dialog
+        self._rapid = False
+
+        self.setCacheMode(qw.QGraphicsView.CacheBackground)
+        self.setViewportUpdateMode(qw.QGraphicsView.SmartViewportUpdate)
+        self.setOptimizationFlags(qw.QGraphicsView.DontSavePainterState |
+                                  qw.QGraphicsView.DontAdjustForAntialiasing)
+        self.setTransformationAnchor(qw.QGraphicsView.AnchorUnderMouse)
+        self.setAlignment(qc.Qt.AlignTop | qc.Qt.AlignLeft)
+        self.setFocusPolicy(qc.Qt.StrongFocus)
+
+        self.new_layer()
+
+    def make_item(self, pen, brush, z_value):
+        """
+        make a hidden rectangle item at the top level of the scene
+
+            Args:
+                pen (QPen) the outline pen
+                brush (QBrush) the fill
+                z_value (float) the stacking order
+
+            Returns:
+                (QGraphicsRectItem) the item
+        """
+        item = qw.QGraphicsRectItem()
+        item.setPen(pen)
+        item.setBrush(qg.QBrush(brush))
+        item.setZValue(z_value)
+        item.setVisible(False)
+        self._scene.addItem(item)
+
+        return item
+
+    def new_layer(self):
+        """
+        replace the parent of the region items, deleting the old items
+        """
+        if self._layer is not None:
+            self._scene.removeItem(self._layer)
+
+        self._layer = qw.QGraphicsRectItem()
+        self._layer.setFlag(qw.QGraphicsItem.ItemHasNoContents)
+        self._layer.setZValue(1.0)
+        self._layer.setVisible(self._state == SelectionState.DISPLAY_ALL)
+        self._scene.addItem(self._layer)
+        self._items = []
+
+    def set_image(self, image_store):
+        """
+        display a new image and its regions, the scene is in full image
+        coordinates even if the store holds a downsampled view
+
+            Args:
+                image_store (ImageStore) the owner of the image
+        """
+        # pending regions were drawn on the previous image
+        self.reject_pending()
+
+        self._image_store = image_store
+        self._scene.setSceneRect(0, 0, image_store.width(), image_store.height())
+        # a downsampled image is snapped on its view, the scene is in full image coordinates
+        self._snapper.set_image(image_store.view(), image_store.scale)
+        self.resetCachedContent()
+        self.rebuild_regions()
+
+    @timed("paint_event")
+    def drawBackground(self, painter, rect):
+        """
+        draw the image, the view caches the result, a downsampled image is
+        drawn from full resolution tiles once zoomed in beyond its view
+
+            Args:
+                painter (QPainter) the painter
+                rect (QRectF) the exposed area in scene coordinates
+        """
+        super().drawBackground(painter, rect)
+        if self._image_store is None:
+            return
+
+        store = self._image_store
+        area = rect.intersected(qc.QRectF(0, 0, store.width(), store.height()))
+        if area.isEmpty():
+            return
+
+        if store.is_downsampled() and self.transform().m11() > store.scale \
+                and store.can_read_tiles():
+            for position, tile in store.tiles(area.toAlignedRect()):
+                painter.drawImage(position, tile)
+            return
+
+        scale = store.scale
+        source = qc.QRectF(area.left()*scale, area.top()*scale,
+                           area.width()*scale, area.height()*scale)
+        painter.drawImage(area, store.view(), source)
+
+    def add_region_items(self, regions):
+        """
+        append items for regions
+
+            Args:
+                regions ([DrawRect]) the regions in their current frame coordinates
+        """
+        pen = region_pen()
+        brush = region_brush()
+        for region in regions:
+            item = qw.QGraphicsRectItem(qc.QRectF(RegionSelectionLabel.region_rect(region)),
+                                        self._layer)
+            item.setPen(pen)
+            item.setBrush(brush)
+            # the outline is drawn once and the cached pixmap reused until the item or zoom changes
+            item.setCacheMode(qw.QGraphicsItem.DeviceCoordinateCache)
+            self._items.append(item)
+
+    def rebuild_regions(self):
+        """
+        replace all the region items by items for the regions in the current frame
+        """
+        self.new_layer()
+        if self._regions_store is None:
+            return
+
+        frame = self._regions_store.current_image
+        self.add_region_items(self._regions_store.get_regions_at_frame(frame))
+
+    def frame_changed(self):
+        """
+        show the regions of the new current frame
+        """
+        self.rebuild_regions()
+        self.update_selection(None, self.selected_region())
+        self.selected_rows_changed()
+
+    def selected_rows_changed(self):
+        """
+        replace the outlines of the selected regions
+        """
+        if self._selection_layer is not None:
+            self._scene.removeItem(self._selection_layer)
+            self._selection_layer = None
+
+        if self._regions_store is None or self._state == SelectionState.NO_ACTION:
+            return
+
+        self._selection_layer = qw.QGraphicsRectItem()
+        self._selection_layer.setFlag(qw.QGraphicsItem.ItemHasNoContents)
+        self._selection_layer.setZValue(3.0)
+        self._scene.addItem(self._selection_layer)
+
+        pen = selected_pen()
+        for region in self._regions_store.get_selected_regions_at_frame():
+            item = qw.QGraphicsRectItem(qc.QRectF(RegionSelectionLabel.region_rect(region)),
+                                        self._selection_layer)
+            item.setPen(pen)
+
+    @timed("canvas_regions_changed")
+    def regions_changed(self, batch):
+        """
+        bring the region items up to date with a batch of changes, rows that
+        are appended or changed are updated individually, otherwise, or if
+        regions have frame ranges, all the items are rebuilt
+
+            Args:
+                batch (ChangeBatch) the changes
+        """
+        regions = self._regions_store.get_regions()
+        frame = self._regions_store.current_image
+
+        if len(batch.changed) > 0:
+            self.update_selection(None, self.selected_region())
+            self.selected_rows_changed()
+
+        if batch.reset or self._regions_store.get_region_indices_at_frame(frame) is not None:
+            self.rebuild_regions()
+            return
+
+        for first, last in batch.inserted:
+            if first != len(self._items):
+                self.rebuild_regions()
+                return
+            self.add_region_items(regions[first:last+1])
+
+        for first, last in batch.changed:
+            for row in range(first, min(last + 1, len(self._items))):
+                rect = RegionSelectionLabel.region_rect(regions[row])
+                self._items[row].setRect(qc.QRectF(rect))
+
+    def set_no_action(self):
+        """
+        set the state to only display the image
+        """
+        self.set_state(SelectionState.NO_ACTION)
+
+    def set_adding(self):
+        """
+        set the state to adding new regions
+        """
+        self.set_state(SelectionState.ADD_NEW_REGION)
+
+    def set_display_selected(self):
+        """
+        set the state to display the region selected by the user
+        """
+        self.set_state(SelectionState.DISPLAY_SELECTED)
+
+    def set_display_all(self):
+        """
+        set the state to display all regions
+        """
+        self.set_state(SelectionState.DISPLAY_ALL)
+
+    def set_state(self, state):
+        """
+        change the state, showing or hiding the region items
+
+            Args:
+                state (SelectionState) the new state
+        """
+        self._state = state
+        self._layer.setVisible(state == SelectionState.DISPLAY_ALL)
+        self.update_selection(None, self.selected_region())
+        self.selected_rows_changed()
+
+    def set_source_image(self, image):
+        """
+        set the image used for edge snapping, set_image does this for the displayed image
+
+            Args:
+                image (QImage) the image
+        """
+        self._snapper.set_image(image)
+
+    def set_snapping(self, flag):
+        """
+        turn the snapping of rectangle edges to image edges on or off
+
+            Args:
+                flag (bool) if true snap
+        """
+        self._snapper.set_enabled(flag)
+
+    def selected_region(self):
+        """
+        the selected region in the current frame
+
+            Returns:
+                (DrawRect) the region or None
+        """
+        if self._regions_store is None:
+            return None
+
+        return self._regions_store.selected_region_at_frame()
+
+    def update_selection(self, old_region, new_region):
+        """
+        move the highlight to the newly selected region, the scene repaints only
+        the areas the highlight leaves and enters
+
+            Args:
+                old_region (DrawRect) the previously selected region, unused
+                new_region (DrawRect) the newly selected region, or None
+        """
+        del old_region
+        if new_region is None or self._state == SelectionState.NO_ACTION:
+            self._highlight.setVisible(False)
+            return
+
+        self._highlight.setRect(qc.QRectF(RegionSelectionLabel.region_rect(new_region)))
+        self._highlight.setVisible(True)
+
+    def ensure_region_visible(self, region):
+        """
+        scroll so a region is visible
+
+            Args:
+                region (DrawRect) the region
+        """
+        self.ensureVisible(qc.QRectF(RegionSelectionLabel.region_rect(region)), 20, 20)
+
+    def image_point(self, event, anchor=None):
+        """
+        the position of a mouse event in image coordinates, clamped to the image and snapped
+
+            Args:
+                event (QMouseEvent) the event
+                anchor (QPoint) the opposite corner of the rectangle, or None
+
+            Returns:
+                (QPoint) the point
+        """
+        point = self.mapToScene(event.pos()).toPoint()
+        bounds = self._scene.sceneRect().toRect()
+        x_pos = min(max(point.x(), 0), max(bounds.width(), 0))
+        y_pos = min(max(point.y(), 0), max(bounds.height(), 0))
+
+        if anchor is None:
+            return qc.QPoint(*self._snapper.snap(x_pos, y_pos))
+
+        return qc.QPoint(*self._snapper.snap(x_pos, y_pos, anchor.x(), anchor.y()))
+
+    def mousePressEvent(self, event):
+        """
+        detect the start of selection, or a click on a region
+
+            Args:
+                event (QMouseEvent) the event data
+        """
+        if event.button() != qc.Qt.LeftButton or self._image_store is None:
+            super().mousePressEvent(event)
+            return
+
+        if self._state == SelectionState.ADD_NEW_REGION:
+            self._start = self.image_point(event)
+            self._end = self._start
+            self._band.setRect(qc.QRectF(qc.QPointF(self._start), qc.QPointF(self._end)))
+            self._band.setVisible(True)
+        elif self._state in (SelectionState.DISPLAY_ALL, SelectionState.DISPLAY_SELECTED):
+            point = self.image_point(event)
+            signal = self.point_toggled if event.modifiers() & qc.Qt.ControlModifier \
+                else self.point_selected
+            signal.emit(point.x(), point.y())
+        else:
+            super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        """
+        if selecting move the rubber band
+
+            Args:
+                event (QMouseEvent) the event data
+        """
+        if self._start is None:
+            super().mouseMoveEvent(event)
+            return
+
+        self._end = self.image_point(event, self._start)
+        self._band.setRect(qc.QRectF(qc.QPointF(self._start),
+                                     qc.QPointF(self._end)).normalized())
+
+    def mouseReleaseEvent(self, event):
+        """
+        finish a rectangle, in rapid mode it becomes pending, otherwise the user confirms it
+
+            Args:
+                event (QMouseEvent) the event data
+        """
+        if event.button() != qc.Qt.LeftButton or self._start is None:
+            super().mouseReleaseEvent(event)
+            return
+
+        self._end = self.image_point(event, self._start)
+        left, right = sorted((self._start.x(), self._end.x()))
+        top, bottom = sorted((self._start.y(), self._end.y()))
+        self._start = None
+        self._end = None
+
+        if right == left or bottom == top:
+            self._band.setVisible(False)
+            return
+
+        region = DrawRect(top, bottom, left, right)
+
+        if self._rapid:
+            self._band.setVisible(False)
+            self.add_pending(region)
+            return
+
+        reply = qw.QMessageBox.question(
+            self,
+            self.tr("Region Selection"),
+            self.tr("Do you wish to select this rectangle?"))
+
+        self._band.setVisible(False)
+        if reply == qw.QMessageBox.Yes:
+            self.new_selection.emit(region)
+
+    def wheelEvent(self, event):
+        """
+        zoom with Ctrl and the wheel, otherwise scroll
+
+            Args:
+                event (QWheelEvent) the event data
+        """
+        if event.modifiers() & qc.Qt.ControlModifier:
+            factor = ZOOM_STEP if event.angleDelta().y() > 0 else 1.0/ZOOM_STEP
+            self.scale(factor, factor)
+            return
+
+        super().wheelEvent(event)
+
+    def set_rapid(self, flag):
+        """
+        turn rapid mode on or off, turning it off accepts any pending regions
+
+            Args:
+                flag (bool) if true drawn rectangles become pending regions
+        """
+        if not flag:
+            self.accept_pending()
+
+        self._rapid = flag
+        if flag:
+            self.setFocus()
+
+    @property
+    def pending(self):
+        """
+        getter for the pending regions
+        """
+        return [item.data(0) for item in self._pending_items]
+
+    def add_pending(self, region):
+        """
+        show a region as pending
+
+            Args:
+                region (DrawRect) the region
+
+            Emits:
+                pending_changed (int) the number of pending regions
+        """
+        item = self.make_item(pending_pen(), qc.Qt.NoBrush, 2.0)
+        item.setRect(qc.QRectF(RegionSelectionLabel.region_rect(region)))
+        item.setData(0, region)
+        item.setVisible(True)
+        self._pending_items.append(item)
+        self.pending_changed.emit(len(self._pending_items))
+
+    def accept_pending(self):
+        """
+        add all the pending regions to the store as one batch
+
+            Emits:
+                new_selections ([DrawRect]) the regions
+                pending_changed (int) zero
+        """
+        if len(self._pending_items) == 0:
+            return
+
+        regions = self.pending
+        self.reject_pending()
+        self.new_selections.emit(regions)
+
+    def reject_pending(self):
+        """
+        discard all the pending regions
+
+            Emits:
+                pending_changed (int) zero
+        """
+        if len(self._pending_items) == 0:
+            return
+
+        for item in self._pending_items:
+            self._scene.removeItem(item)
+
+        self._pending_items = []
+        self.pending_changed.emit(0)
+
+    def undo_pending(self):
+        """
+        discard the most recent pending region
+
+            Emits:
+                pending_changed (int) the number of regions left
+        """
+        if len(self._pending_items) == 0:
+            return
+
+        self._scene.removeItem(self._pending_items.pop())
+        self.pending_changed.emit(len(self._pending_items))
+
+    def keyPressEvent(self, event):
+        """
+        in rapid mode Enter accepts the pending regions, Esc rejects them and
+        Ctrl+Z removes the most recent
+
+            Args:
+                event (QKeyEvent) the event data
+        """
+        if not self._rapid:
+            super().keyPressEvent(event)
+            return
+
+        if event.key() in (qc.Qt.Key_Return, qc.Qt.Key_Enter):
+            self.accept_pending()
+        elif event.key() == qc.Qt.Key_Escape:
+            self.reject_pending()
+        elif event.matches(qg.QKeySequence.Undo):
+            self.undo_pending()
+        else:
+            super().keyPressEvent(event)
@@ -21,25 +21,32 @@ This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
 # pylint: disable = c-extension-no-member
 # pylint: disable = import-error
 
+import os
+
 import PyQt5.QtWidgets as qw
-import PyQt5.QtGui as qg
 import PyQt5.QtCore as qc
 
 from regionselection.gui.regionselectionlabel import RegionSelectionLabel
+from regionselection.gui.regionselectionview import RegionSelectionView
 from regionselection.gui.Ui_regionselectionwidget import Ui_RegionSelectionWidget
 
+## the canvas backends, "label" paints by hand, "scene" uses a QGraphicsScene
+CANVAS_BACKENDS = ("label", "scene")
+
 class RegionSelectionWidget(qw.QWidget, Ui_RegionSelectionWidget):
     """
     Provideds the ability to display an image and, draw lines on the image
     """
 
-    def __init__(self, parent=None, regions_store=None):
+    def __init__(self, parent=None, regions_store=None, canvas=None):
         """
         the object initalization function
 
             Args:
                 parent (QObject): the parent QObject for this window
                 regions_store (ImageDrawMainWindow): the object holding the list of regions
+                canvas (string): the canvas backend, one of CANVAS_BACKENDS, if None
+                                 the environment variable REGIONSELECTION_CANVAS, or "label"
 
             Returns:
                 None
@@ -48,10 +55,48 @@ class RegionSelectionWidget(qw.QWidget, Ui_RegionSelectionWidget):
 
         self.setupUi(self)
 
-        ## the label which will display images
-        self._image_label = RegionSelectionLabel(self, regions_store)
-        self._image_label.set_adding()
-        self._image_label.new_selection.connect(regions_store.new_region)
+        ## the object holding the regions
+        self._regions_store = regions_store
+
+        if canvas is None:
+            canvas = os.environ.get("REGIONSELECTION_CANVAS", "label")
+        if canvas not in CANVAS_BACKENDS:
+            raise ValueError(f"Unknown canvas backend {canvas}")
+
+        ## true if the canvas is a graphics view, which scrolls itself
+        self._scene_canvas = canvas == "scene"
+
+        ## the label, or graphics view, which will display images
+        self._canvas = None
+        if self._scene_canvas:
+            self._canvas = RegionSelectionView(self, regions_store)
+            self.verticalLayout.replaceWidget(self._scrollArea, self._canvas)
+            self._scrollArea.hide()
+        else:
+            self._canvas = RegionSelectionLabel(self, regions_store)
+
+        self._canvas.set_adding()
+        self._canvas.new_selection.connect(regions_store.new_region)
+        self._canvas.point_selected.connect(regions_store.point_selected)
+        self._canvas.point_toggled.connect(regions_store.point_toggled)
+        self._canvas.new_selections.connect(regions_store.add_new_regions)
+        self._canvas.pending_changed.connect(self.pending_changed)
+
+    @property
+    def canvas(self):
+        """
+        getter for the canvas, a RegionSelectionLabel or RegionSelectionView
+        """
+        return self._canvas
+
+    def scroll_area(self):
+        """
+        getter for the scroll area showing the canvas
+
+            Returns:
+                (QAbstractScrollArea) the scroll area
+        """
+        return self._canvas if self._scene_canvas else self._scrollArea
 
     @qc.pyqtSlot()
     def toggel_display_regions(self):
@@ -59,48 +104,151 @@ class RegionSelectionWidget(qw.QWidget, Ui_RegionSelectionWidget):
         callback for 'show all' radio button
         """
         if self._displayAllButton.isChecked():
-            self._image_label.set_display_all()
-            self.repaint()
+            self._canvas.set_display_all()
+            self._canvas.update()
+        else:
+            self._canvas.set_adding()
+
+    @qc.pyqtSlot(bool)
+    def snap_toggled(self, flag):
+        """
+        callback for the 'snap to edges' check box
+
+            Args:
+                flag (bool) the state of the box
+        """
+        self._canvas.set_snapping(flag)
+
+    @qc.pyqtSlot(bool)
+    def rapid_toggled(self, flag):
+        """
+        callback for the 'rapid mode' check box
+
+            Args:
+                flag (bool) the state of the box
+        """
+        self._canvas.set_rapid(flag)
+
+    @qc.pyqtSlot(int)
+    def pending_changed(self, count):
+        """
+        callback for a change in the number of pending regions
+
+            Args:
+                count (int) the number of pending regions
+        """
+        if count > 0:
+            self._rapidBox.setText(self.tr("Rapid Mode ({} pending)").format(count))
         else:
-            self._image_label.set_adding()
+            self._rapidBox.setText(self.tr("Rapid Mode"))
 
-    def display_image(self, image):
+    def accept_pending(self):
+        """
+        add any regions pending in rapid mode to the store
+        """
+        self._canvas.accept_pending()
+
+    @qc.pyqtSlot(int)
+    def frame_selected(self, frame):
+        """
+        callback for the frame slider
+
+            Args:
+                frame (int) the selected frame
+        """
+        self._regions_store.show_frame(frame)
+
+    def set_frame_count(self, count):
+        """
+        set the number of frames, showing the frame slider if there is more than one
+
+            Args:
+                count (int) the number of frames
+        """
+        self._frameSlider.blockSignals(True)
+        self._frameSlider.setRange(0, max(0, count-1))
+        self._frameSlider.setValue(0)
+        self._frameSlider.blockSignals(False)
+
+        self._frameSlider.setVisible(count > 1)
+        self._frameLabel.setVisible(count > 1)
+        self._frameLabel.setText(f"1/{count}")
+
+    def set_frame(self, frame):
+        """
+        show the current frame on the slider without signalling
+
+            Args:
+                frame (int) the frame number
+        """
+        self._frameSlider.blockSignals(True)
+        self._frameSlider.setValue(frame)
+        self._frameSlider.blockSignals(False)
+        self._frameLabel.setText(f"{frame+1}/{self._frameSlider.maximum()+1}")
+
+    def display_image(self, image_store):
         """
         display a new image
 
             Args:
-                image (QImage) image to be displayed
+                image_store (ImageStore) the owner of the image to be displayed
         """
-        self._image_label.setAlignment(
+        if self._scene_canvas:
+            self._canvas.set_image(image_store)
+            return
+
+        self._canvas.setAlignment(
                 qc.Qt.AlignTop | qc.Qt.AlignLeft)
-        self._image_label.setSizePolicy(
+        self._canvas.setSizePolicy(
                 qw.QSizePolicy.Ignored,
                 qw.QSizePolicy.Fixed)
-        self._image_label.setSizePolicy(
+        self._canvas.setSizePolicy(
                 qw.QSizePolicy.Minimum,
                 qw.QSizePolicy.Minimum)
 
-        self._scrollArea.setWidget(self._image_label)
+        self._scrollArea.setWidget(self._canvas)
         self._scrollArea.setHorizontalScrollBarPolicy(qc.Qt.ScrollBarAsNeeded)
         self._scrollArea.setVerticalScrollBarPolicy(qc.Qt.ScrollBarAsNeeded)
         self._scrollArea.setVisible(True)
 
-        self._image_label.setPixmap(qg.QPixmap(image))
+        self._canvas.set_image(image_store)
 
-    def get_current_pixmap(self):
+    def regions_changed(self, batch):
         """
-        getter for the currently displayed image, including regions
+        bring the canvas up to date with changes to the regions
 
-            Returns:
-                QPixmap
+            Args:
+                batch (ChangeBatch) the changes
         """
-        return self._image_label.grab()
+        self._canvas.regions_changed(batch)
 
-    def get_raw_pixmap(self):
+    def frame_changed(self):
+        """
+        redraw the canvas for a change of the current frame
         """
-        getter for the original image, without regions
+        self._canvas.frame_changed()
 
-            Returns:
-                QPixmap
+    def show_selected_rows(self):
+        """
+        redraw the outlines of the selected regions
+        """
+        self._canvas.selected_rows_changed()
+
+    def show_selection(self, old_region, new_region):
+        """
+        redraw the previously and newly selected regions and scroll the new one into view
+
+            Args:
+                old_region (DrawRect) the previously selected region, or None
+                new_region (DrawRect) the newly selected region, or None
         """
-        return self._image_label.pixmap()
+        self._canvas.update_selection(old_region, new_region)
+
+        if new_region is not None and self._scene_canvas:
+            self._canvas.ensure_region_visible(new_region)
+        elif new_region is not None:
+            rect = self._canvas.display_rect(new_region)
+            self._scrollArea.ensureVisible(rect.center().x(),
+                                           rect.center().y(),
+                                           rect.width()//2 + 20,
+                                           rect.height()//2 + 20)
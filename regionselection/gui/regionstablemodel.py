@@ -24,9 +24,12 @@ This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
 import PyQt5.QtGui as qg
 import PyQt5.QtCore as qc
 
-import numpy as np
-
 from regionselection.util.drawrect import DrawRect
+from regionselection.util.tablehtml import TABLE_HEADERS
+from regionselection.util.lazyimport import lazy_import
+
+## numpy, loaded when first used
+np = lazy_import("numpy")
 
 class RegionsTableModel(qc.QAbstractTableModel):
     """
@@ -47,6 +50,9 @@ class RegionsTableModel(qc.QAbstractTableModel):
         super().__init__()
         self._data = data
 
+        ## the (width, height) of the image, None if not known
+        self._bounds = None
+
     def data(self, index, role):
         """
         getter for data and display features
@@ -89,10 +95,8 @@ class RegionsTableModel(qc.QAbstractTableModel):
         """
         getter for the table headers
         """
-        headers = ["Num", "Left x", "Top y", "Right x", "Bottom y"]
-
         if role == qc.Qt.DisplayRole and orientation == qc.Qt.Horizontal:
-            return qc.QVariant(headers[section])
+            return qc.QVariant(TABLE_HEADERS[section])
 
         return qc.QVariant()
 
@@ -110,61 +114,121 @@ class RegionsTableModel(qc.QAbstractTableModel):
 
     def flags(self, index):
         """
-        return that the numeric columns are editable
+        return that the numeric columns are editable, except for regions with
+        keyframes, whose shown box is not the one drawn in each frame
         """
-        if index.column() == 0:
+        if index.column() == 0 or self.has_keyframes(index.row()):
             return qc.Qt.ItemIsEnabled|qc.Qt.ItemIsSelectable
 
         return qc.Qt.ItemIsEnabled|qc.Qt.ItemIsSelectable|qc.Qt.ItemIsEditable
 
+    def has_keyframes(self, row):
+        """
+        test if the region of a row has keyframes
+
+            Args:
+                row (int) the row
+
+            Returns:
+                True if the region is a TimeRect with keyframes
+        """
+        return bool(getattr(self._data[row], "keyframes", None))
+
     def setData(self, index, value, role):
         """
-        allow the new value to replace the old in the data source, this method will
-        not work if the order of the data is different between the dictionary and
-        the table, Python 3.6 onward preserve insetion order by default
-        """
-        if role == qc.Qt.EditRole and value.isnumeric():
-            rect = self._data[index.row()]
-            if index.column() == 1:
-                self._data[index.row()] = DrawRect(top=rect.top,
-                                                   bottom=rect.bottom,
-                                                   left=np.uint32(value),
-                                                   right=rect.right)
-            elif index.column() == 2:
-                self._data[index.row()] = DrawRect(top=np.uint32(value),
-                                                   bottom=rect.bottom,
-                                                   left=rect.left,
-                                                   right=rect.right)
-            elif index.column() == 3:
-                self._data[index.row()] = DrawRect(top=rect.top,
-                                                   bottom=rect.bottom,
-                                                   left=rect.left,
-                                                   right=np.uint32(value))
-            elif index.column() == 4:
-                self._data[index.row()] = DrawRect(top=rect.top,
-                                                   bottom=np.uint32(value),
-                                                   left=rect.left,
-                                                   right=rect.right)
-            else:
+        allow the new value to replace the old in the data source, values that
+        would invert the region or take it outside the image bounds are refused,
+        as are edits of regions with keyframes
+        """
+        if role != qc.Qt.EditRole or not value.isnumeric():
+            return False
+
+        if self.has_keyframes(index.row()):
+            return False
+
+        fields = {1:"left", 2:"top", 3:"right", 4:"bottom"}
+        if index.column() not in fields or int(value) > np.iinfo(np.uint32).max:
+            return False
+
+        rect = self._data[index.row()]
+        rect = rect._replace(**{fields[index.column()]:np.uint32(value)})
+
+        if rect.top > rect.bottom or rect.left > rect.right:
+            return False
+
+        if self._bounds is not None:
+            width, height = self._bounds
+            if rect.bottom > height or rect.right > width:
                 return False
 
-            self.dataChanged.emit(index, index)
+        self._data[index.row()] = rect
+        self.dataChanged.emit(index, index)
 
-            return True
+        return True
 
-        return False
+    @qc.pyqtSlot(int, int)
+    def set_bounds(self, width, height):
+        """
+        set the size of the image, edits are checked against it
+
+            Args:
+                width (int) the image width
+                height (int) the image height
+        """
+        self._bounds = (width, height)
 
     @qc.pyqtSlot(DrawRect)
     def add_region(self, region):
         """
-        add a new region to the data, will clear all selections and editing
+        append a new region to the data, selections and editing are not disturbed
 
             Args:
                 region (DrawRect) the region to add
         """
-        self.beginResetModel()
+        row = len(self._data)
+        self.beginInsertRows(qc.QModelIndex(), row, row)
         self._data.append(region)
-        self.endResetModel()
+        self.endInsertRows()
+
+    @qc.pyqtSlot(list)
+    def add_regions(self, regions):
+        """
+        append several regions with a single notification, selections and editing
+        are not disturbed
+
+            Args:
+                regions ([DrawRect]) the regions to add
+        """
+        if len(regions) == 0:
+            return
+
+        first = len(self._data)
+        self.beginInsertRows(qc.QModelIndex(), first, first + len(regions) - 1)
+        self._data.extend(regions)
+        self.endInsertRows()
+
+    @qc.pyqtSlot(object, list)
+    def update_regions(self, rows, regions):
+        """
+        overwrite several regions with a single notification covering the
+        range of rows changed
+
+            Args:
+                rows (numpy.array) the rows to overwrite
+                regions ([DrawRect]) the new regions, one per row
+        """
+        if len(rows) == 0:
+            return
+
+        if hasattr(self._data, "replace_rows"):
+            # a database store writes them in one transaction
+            self._data.replace_rows(rows, regions)
+        else:
+            for row, region in zip(rows, regions):
+                self._data[row] = region
+
+        self.dataChanged.emit(self.index(int(min(rows)), 0),
+                              self.index(int(max(rows)), self.columnCount(None) - 1))
 
     @qc.pyqtSlot(list)
     def replace_data(self, regions):
@@ -21,16 +21,28 @@ This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
 # pylint: disable = import-error
 # pylint: disable = too-few-public-methods
 
+import io
+
 import PyQt5.QtWidgets as qw
 import PyQt5.QtCore as qc
 
 from regionselection.gui.Ui_resultstablewidget import Ui_ResultsTableWidget
+from regionselection.util.lazyimport import lazy_import
+
+## numpy, loaded when first used
+np = lazy_import("numpy")
 
 class ResultsTableWidget(qw.QWidget, Ui_ResultsTableWidget):
     """
     Provideds the ability to display an image and, draw lines on the image
     """
 
+    ## signal that the user has selected a row, -1 if none
+    row_selected = qc.pyqtSignal(int)
+
+    ## signal carrying all the selected rows, as a sorted numpy array, when they change
+    rows_selected = qc.pyqtSignal(object)
+
     def __init__(self, parent, model):
         """
         the object initalization function
@@ -49,36 +61,114 @@ class ResultsTableWidget(qw.QWidget, Ui_ResultsTableWidget):
         self._tableView.setModel(model)
         self._tableView.setStyleSheet("QHeaderView::section {background-color:lightgray}")
         self._tableView.verticalHeader().hide()
+        self._tableView.selectionModel().currentRowChanged.connect(self.current_row_changed)
+        self._tableView.selectionModel().selectionChanged.connect(self.selection_changed)
+
+    @qc.pyqtSlot(qc.QModelIndex, qc.QModelIndex)
+    def current_row_changed(self, current, previous):
+        """
+        callback for a change of the table's current row
+
+            Args:
+                current (QModelIndex) the new current index
+                previous (QModelIndex) the previous current index
+
+            Emits:
+                row_selected (int) the new row, -1 if there is none
+        """
+        del previous
+        self.row_selected.emit(current.row() if current.isValid() else -1)
+
+    @qc.pyqtSlot(qc.QItemSelection, qc.QItemSelection)
+    def selection_changed(self, selected, deselected):
+        """
+        callback for a change of the selected rows
+
+            Args:
+                selected (QItemSelection) the newly selected items
+                deselected (QItemSelection) the newly deselected items
+
+            Emits:
+                rows_selected (numpy.array) the selected rows
+        """
+        del selected, deselected
+        self.rows_selected.emit(self.selected_rows())
+
+    def selected_rows(self):
+        """
+        the selected rows, found from the selection ranges so selecting every
+        row does not make an index per row
+
+            Returns:
+                (numpy.array) int64 sorted rows
+        """
+        ranges = [np.arange(part.top(), part.bottom() + 1, dtype=np.int64)
+                  for part in self._tableView.selectionModel().selection()]
+        if len(ranges) == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        return np.unique(np.concatenate(ranges))
+
+    def toggle_row(self, row):
+        """
+        add a row to the selection, or remove it if it is selected, and make it current
+
+            Args:
+                row (int) the row
+        """
+        index = self._tableView.model().index(row, 0)
+        self._tableView.selectionModel().setCurrentIndex(index,
+                                                         qc.QItemSelectionModel.Toggle |
+                                                         qc.QItemSelectionModel.Rows)
+        self._tableView.scrollTo(index)
+
+    def select_row(self, row):
+        """
+        make a row current and selected, and scroll it into view
+
+            Args:
+                row (int) the row, or -1 to clear the selection
+        """
+        model = self._tableView.model()
+        selection = self._tableView.selectionModel()
+
+        if row < 0:
+            selection.clear()
+            return
+
+        index = model.index(row, 0)
+        selection.setCurrentIndex(index,
+                                  qc.QItemSelectionModel.ClearAndSelect |
+                                  qc.QItemSelectionModel.Rows)
+        self._tableView.scrollTo(index)
 
     def get_table_as_html(self):
         """
-        get the current table as a html string
+        get the current table as a html string, hidden columns are omitted
 
             Returns:
                 string of html
         """
-        html = "<table style=\"width:100%\">\n<tr>"
-        index = self._tableView.model().index(0, 0)
-        rows = self._tableView.model().rowCount(index)
-        columns = self._tableView.model().columnCount(index)
-
-        for column in range(columns):
-            if not self._tableView.isColumnHidden(column):
-                header = self._tableView.model().headerData(column,
-                                                            qc.Qt.Horizontal,
-                                                            qc.Qt.DisplayRole).value()
-                html += f"<th>{header}</th>"
-        html += "</tr>\n"
+        model = self._tableView.model()
+        rows = model.rowCount(qc.QModelIndex())
+        columns = [column for column in range(model.columnCount(qc.QModelIndex()))
+                   if not self._tableView.isColumnHidden(column)]
+
+        html = io.StringIO()
+        html.write("<table style=\"width:100%\">\n<tr>")
+
+        for column in columns:
+            header = model.headerData(column, qc.Qt.Horizontal, qc.Qt.DisplayRole).value()
+            html.write(f"<th>{header}</th>")
+        html.write("</tr>\n")
 
         for row in range(rows):
-            html += "<tr>"
-            for column in range(columns):
-                if not self._tableView.isColumnHidden(column):
-                    index = self._tableView.model().index(row, column)
-                    data = self._tableView.model().data(index, qc.Qt.DisplayRole).value()
-                    html += f"<td>{data}</td>"
-            html += "</tr>\n"
+            html.write("<tr>")
+            for column in columns:
+                data = model.data(model.index(row, column), qc.Qt.DisplayRole).value()
+                html.write(f"<td>{data}</td>")
+            html.write("</tr>\n")
 
-        html += "\n</table>"
+        html.write("\n</table>")
 
-        return html
+        return html.getvalue()
@@ -0,0 +1,231 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+The client side of region sharing. Local edits are compared with a mirror of
+the server's regions and only the differences are sent; the server's
+broadcasts update the mirror and are passed on as signals.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+# set up linting conditions
+# pylint: disable = c-extension-no-member
+# pylint: disable = import-error
+
+import numpy as np
+import PyQt5.QtCore as qc
+import PyQt5.QtNetwork as qn
+
+from regionselection.util import syncprotocol as protocol
+from regionselection.util.drawrect import regions_to_array
+
+class SyncClient(qc.QObject):
+    """
+    connection to a SyncServer
+    """
+
+    ## signal carrying the server's complete set of regions, (N, 4) uint32
+    snapshot_received = qc.pyqtSignal(object)
+
+    ## signal carrying regions appended by the server, (N, 4) uint32
+    inserts_received = qc.pyqtSignal(object)
+
+    ## signal carrying rows, and their new values, overwritten by the server
+    updates_received = qc.pyqtSignal(object, object)
+
+    ## signal that the connection has been closed, or has failed
+    connection_lost = qc.pyqtSignal()
+
+    def __init__(self, parent=None):
+        """
+        set up the client
+
+            Args:
+                parent (QObject) the parent object
+        """
+        super().__init__(parent)
+
+        ## the connection
+        self._socket = qn.QTcpSocket(self)
+        self._socket.readyRead.connect(self.read_server)
+        self._socket.disconnected.connect(self.connection_lost)
+
+        ## decodes the server's frames
+        self._reader = protocol.MessageReader()
+
+        ## the regions as last known to be held by the server
+        self._mirror = np.zeros((0, 4), dtype=np.uint32)
+
+        ## sequence number of the last message from the server
+        self._sequence = 0
+
+        ## operations awaiting sending
+        self._pending = []
+
+        ## true if sending has been scheduled
+        self._scheduled = False
+
+    @property
+    def sequence(self):
+        """
+        getter for the sequence number of the last message from the server
+        """
+        return self._sequence
+
+    def connect_to_server(self, host, port, timeout=3000):
+        """
+        connect and wait for the connection to be made
+
+            Args:
+                host (string) the server's host name or address
+                port (int) the server's port
+                timeout (int) the longest wait in milliseconds
+
+            Returns:
+                (bool) True if connected
+        """
+        self._socket.connectToHost(host, port)
+        return self._socket.waitForConnected(timeout)
+
+    def error_string(self):
+        """
+        getter for the description of the last error
+        """
+        return self._socket.errorString()
+
+    def close(self):
+        """
+        send anything pending and disconnect
+        """
+        self.flush()
+        self._socket.disconnectFromHost()
+
+    def send_inserts(self, regions):
+        """
+        ask the server to append regions, they are added locally when the
+        server broadcasts them, so every client holds them in the same order
+
+            Args:
+                regions (numpy.array) (N, 4) top, bottom, left, right
+        """
+        if len(regions) > 0:
+            self._pending.append(protocol.make_ops(protocol.OP_INSERT, 0, regions))
+            self._schedule()
+
+    def send_replace(self, regions):
+        """
+        ask the server to replace all its regions, any unsent edits are discarded
+
+            Args:
+                regions (numpy.array) (N, 4) top, bottom, left, right
+        """
+        self._pending.clear()
+        self._socket.write(protocol.encode(protocol.MSG_REPLACE, 0, regions))
+
+    def regions_changed(self, batch, regions):
+        """
+        send the local edits in a batch of changes, changes that match the
+        server's regions, such as those made by applying its broadcasts, are not sent
+
+            Args:
+                batch (ChangeBatch) the changes
+                regions ([DrawRect]) the local regions
+        """
+        if batch.reset:
+            local = regions_to_array(regions)
+            if not np.array_equal(local, self._mirror):
+                self.send_replace(local)
+            return
+
+        for first, last in batch.changed:
+            last = min(last, len(self._mirror) - 1)
+            if last < first:
+                continue
+
+            local = regions_to_array(regions[first:last+1])
+            rows = np.flatnonzero(np.any(local != self._mirror[first:last+1], axis=1))
+            if len(rows) > 0:
+                # assume the edit is accepted, a later write in server order will overwrite it
+                self._mirror[first + rows] = local[rows]
+                self._pending.append(protocol.make_ops(protocol.OP_UPDATE,
+                                                       first + rows,
+                                                       local[rows]))
+                self._schedule()
+
+    def _schedule(self):
+        """
+        arrange for the pending operations to be sent on the next pass of the event loop
+        """
+        if not self._scheduled:
+            self._scheduled = True
+            qc.QTimer.singleShot(0, self.flush)
+
+    @qc.pyqtSlot()
+    def flush(self):
+        """
+        send the pending operations as one message
+        """
+        self._scheduled = False
+        if len(self._pending) == 0:
+            return
+
+        ops = np.concatenate(self._pending)
+        self._pending.clear()
+        self._socket.write(protocol.encode(protocol.MSG_DIFF, 0, ops))
+
+    @qc.pyqtSlot()
+    def read_server(self):
+        """
+        callback for data from the server, apply it to the mirror and signal it
+
+            Emits:
+                snapshot_received, inserts_received, updates_received
+        """
+        try:
+            messages = self._reader.feed(bytes(self._socket.readAll()))
+        except ValueError:
+            self._socket.abort()
+            return
+
+        for msg_type, sequence, records in messages:
+            self._sequence = sequence
+
+            if msg_type == protocol.MSG_SNAPSHOT:
+                self._mirror = records
+                self.snapshot_received.emit(records.copy())
+            elif msg_type == protocol.MSG_DIFF:
+                self.apply_diff(records)
+
+    def apply_diff(self, ops):
+        """
+        apply a diff from the server
+
+            Args:
+                ops (numpy.array) of protocol.OP_DTYPE
+
+            Emits:
+                inserts_received, updates_received
+        """
+        inserts = ops[ops["op"] == protocol.OP_INSERT]
+        if len(inserts) > 0:
+            regions = protocol.op_regions(inserts)
+            self._mirror = np.concatenate([self._mirror, regions])
+            self.inserts_received.emit(regions)
+
+        updates = ops[ops["op"] == protocol.OP_UPDATE]
+        if len(updates) > 0:
+            rows, regions = protocol.last_writes(updates["row"], protocol.op_regions(updates))
+            self._mirror[rows] = regions
+            self.updates_received.emit(rows, regions)
@@ -0,0 +1,287 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+A server holding the authoritative set of regions for several annotators. The
+server orders all edits, so the last write in server order wins; each pass of
+the event loop the accepted edits are broadcast to every client as one diff.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+# set up linting conditions
+# pylint: disable = c-extension-no-member
+# pylint: disable = import-error
+
+import argparse
+import sys
+from functools import partial
+
+import numpy as np
+import PyQt5.QtCore as qc
+import PyQt5.QtNetwork as qn
+
+from regionselection.util import syncprotocol as protocol
+
+## the default port
+SYNC_PORT = 47800
+
+class SyncServer(qc.QObject):
+    """
+    a TCP server sharing one set of regions between clients
+    """
+
+    ## signal that a client has joined or left, carries the number of clients
+    clients_changed = qc.pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        """
+        set up the server, it does not listen until asked
+
+            Args:
+                parent (QObject) the parent object
+        """
+        super().__init__(parent)
+
+        ## the listening socket
+        self._server = qn.QTcpServer(self)
+        self._server.newConnection.connect(self.new_connection)
+
+        ## the connected sockets and their frame readers
+        self._clients = {}
+
+        ## storage of the regions, with spare capacity for appending
+        self._store = np.zeros((1024, 4), dtype=np.uint32)
+
+        ## the number of regions
+        self._count = 0
+
+        ## sequence number of the last broadcast
+        self._sequence = 0
+
+        ## accepted operations awaiting broadcast
+        self._pending = []
+
+        ## if true the next broadcast is a snapshot
+        self._pending_snapshot = False
+
+        ## true if a broadcast has been scheduled
+        self._scheduled = False
+
+    @property
+    def regions(self):
+        """
+        getter for the current regions
+
+            Returns:
+                (numpy.array) (N, 4) uint32 view
+        """
+        return self._store[:self._count]
+
+    def listen(self, port=SYNC_PORT, address=qn.QHostAddress.LocalHost):
+        """
+        start listening
+
+            Args:
+                port (int) the port, zero for any free port
+                address (QHostAddress) the interface, by default local connections only
+
+            Returns:
+                (bool) True on success
+        """
+        return self._server.listen(qn.QHostAddress(address), port)
+
+    def port(self):
+        """
+        getter for the port being listened on
+        """
+        return self._server.serverPort()
+
+    def error_string(self):
+        """
+        getter for the description of the last error
+        """
+        return self._server.errorString()
+
+    def close(self):
+        """
+        stop listening and disconnect all clients
+        """
+        self._server.close()
+        for socket in list(self._clients):
+            socket.disconnected.disconnect()
+            socket.disconnectFromHost()
+
+        self._clients.clear()
+        self.clients_changed.emit(0)
+
+    @qc.pyqtSlot()
+    def new_connection(self):
+        """
+        callback for new clients, each is sent a snapshot of the current regions
+        """
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            self._clients[socket] = protocol.MessageReader()
+            socket.readyRead.connect(partial(self.read_client, socket))
+            socket.disconnected.connect(partial(self.client_disconnected, socket))
+            socket.write(protocol.encode(protocol.MSG_SNAPSHOT, self._sequence, self.regions))
+
+        self.clients_changed.emit(len(self._clients))
+
+    def client_disconnected(self, socket):
+        """
+        callback for a client leaving
+
+            Args:
+                socket (QTcpSocket) the client's socket
+        """
+        if self._clients.pop(socket, None) is not None:
+            socket.deleteLater()
+            self.clients_changed.emit(len(self._clients))
+
+    def read_client(self, socket):
+        """
+        callback for data from a client, a client sending a corrupt stream is disconnected
+
+            Args:
+                socket (QTcpSocket) the client's socket
+        """
+        reader = self._clients.get(socket)
+        if reader is None:
+            return
+
+        try:
+            messages = reader.feed(bytes(socket.readAll()))
+        except ValueError:
+            socket.abort()
+            return
+
+        for msg_type, _, records in messages:
+            if msg_type == protocol.MSG_DIFF:
+                self.apply_ops(records)
+            elif msg_type == protocol.MSG_REPLACE:
+                self.replace(records)
+
+    def apply_ops(self, ops):
+        """
+        accept operations, inserts are given the next rows and updates to rows that
+        do not exist are dropped
+
+            Args:
+                ops (numpy.array) of protocol.OP_DTYPE
+        """
+        inserts = ops[ops["op"] == protocol.OP_INSERT].copy()
+        if len(inserts) > 0:
+            self._reserve(self._count + len(inserts))
+            inserts["row"] = np.arange(self._count, self._count + len(inserts))
+            self._store[self._count:self._count + len(inserts)] = protocol.op_regions(inserts)
+            self._count += len(inserts)
+
+        updates = ops[(ops["op"] == protocol.OP_UPDATE) & (ops["row"] < self._count)]
+        if len(updates) > 0:
+            rows, regions = protocol.last_writes(updates["row"], protocol.op_regions(updates))
+            self._store[rows] = regions
+            updates = protocol.make_ops(protocol.OP_UPDATE, rows, regions)
+
+        self._pending.extend(part for part in (inserts, updates) if len(part) > 0)
+        self._schedule()
+
+    def replace(self, regions):
+        """
+        replace all the regions, the clients will be sent a snapshot
+
+            Args:
+                regions (numpy.array) (N, 4) the new regions
+        """
+        self._count = 0
+        self._reserve(len(regions))
+        self._store[:len(regions)] = regions
+        self._count = len(regions)
+
+        self._pending.clear()
+        self._pending_snapshot = True
+        self._schedule()
+
+    def _reserve(self, count):
+        """
+        make sure the store can hold a number of regions, doubling its size as needed
+
+            Args:
+                count (int) the number of regions
+        """
+        if count <= len(self._store):
+            return
+
+        store = np.zeros((max(count, 2*len(self._store)), 4), dtype=np.uint32)
+        store[:self._count] = self._store[:self._count]
+        self._store = store
+
+    def _schedule(self):
+        """
+        arrange for a broadcast on the next pass of the event loop
+        """
+        if not self._scheduled:
+            self._scheduled = True
+            qc.QTimer.singleShot(0, self.broadcast)
+
+    @qc.pyqtSlot()
+    def broadcast(self):
+        """
+        send the accepted changes to every client, as a single snapshot or diff
+        """
+        self._scheduled = False
+        if not self._pending_snapshot and len(self._pending) == 0:
+            return
+
+        self._sequence += 1
+        if self._pending_snapshot:
+            frame = protocol.encode(protocol.MSG_SNAPSHOT, self._sequence, self.regions)
+        else:
+            frame = protocol.encode(protocol.MSG_DIFF,
+                                    self._sequence,
+                                    np.concatenate(self._pending))
+
+        self._pending.clear()
+        self._pending_snapshot = False
+
+        for socket in self._clients:
+            socket.write(frame)
+
+def main(argv=None):
+    """
+    run a sync server with no display
+
+        Args:
+            argv ([string]) the command line arguments, default sys.argv[1:]
+
+        Returns:
+            (int) the exit status
+    """
+    parser = argparse.ArgumentParser(description="share regions between annotators")
+    parser.add_argument("--port", type=int, default=SYNC_PORT, help="the port to listen on")
+    parser.add_argument("--any-address", action="store_true",
+                        help="accept connections from other computers")
+    args = parser.parse_args(argv)
+
+    application = qc.QCoreApplication(sys.argv[:1])
+    server = SyncServer()
+    address = qn.QHostAddress.Any if args.any_address else qn.QHostAddress.LocalHost
+    if not server.listen(args.port, address):
+        print(server.error_string(), file=sys.stderr)
+        return 1
+
+    print(f"sync server listening on port {server.port()}", flush=True)
+
+    return application.exec_()
@@ -0,0 +1,151 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+# set up linting conditions
+# pylint: disable = c-extension-no-member
+# pylint: disable = import-error
+
+import PyQt5.QtGui as qg
+import PyQt5.QtCore as qc
+
+from regionselection.util.drawrect import regions_to_array
+from regionselection.util.tablehtml import html_pages, page_count, write_html, ROWS_PER_PAGE
+
+class TableExportWorker(qc.QObject):
+    """
+    renders the regions table to a pdf, or html, file a page at a time,
+    intended to be moved to a QThread
+    """
+
+    ## signal reporting progress as (pages done, total pages)
+    progress = qc.pyqtSignal(int, int)
+
+    ## signal that the export has ended, carries the file name or '' if cancelled or failed
+    finished = qc.pyqtSignal(str)
+
+    ## signal carrying the message of an error that stopped the export, before finished
+    failed = qc.pyqtSignal(str)
+
+    def __init__(self, regions, file_name, rows_per_page=ROWS_PER_PAGE):
+        """
+        set up the worker, the regions are copied so the export is not affected
+        by subsequent editing
+
+            Args:
+                regions ([DrawRect]) the regions
+                file_name (string) the output file, html if it ends in .html else pdf
+                rows_per_page (int) the number of table rows on a page
+        """
+        super().__init__()
+
+        ## snapshot of the regions as an array
+        self._regions = regions_to_array(regions)
+
+        ## the output file
+        self._file_name = file_name
+
+        ## the number of rows on a page
+        self._rows_per_page = rows_per_page
+
+        ## flag set to request the export stops
+        self._cancelled = False
+
+    def cancel(self):
+        """
+        request that the export stops after the current page, safe to call
+        from any thread
+        """
+        self._cancelled = True
+
+    @qc.pyqtSlot()
+    def run(self):
+        """
+        carry out the export
+
+            Emits:
+                progress after each page
+                failed if an error stopped the export
+                finished when done
+        """
+        # an exception escaping a slot would abort the program and finished never be sent
+        try:
+            if self._file_name.lower().endswith(".html"):
+                completed = self.write_html()
+            else:
+                completed = self.write_pdf()
+        except Exception as error: # pylint: disable = broad-except
+            self.failed.emit(str(error) or type(error).__name__)
+            completed = False
+
+        self.finished.emit(self._file_name if completed else '')
+
+    def write_html(self):
+        """
+        stream the table to a html file
+
+            Returns:
+                True if all pages were written
+        """
+        with open(self._file_name, 'w') as file:
+            return write_html(self._regions,
+                              file,
+                              self._rows_per_page,
+                              self.progress.emit,
+                              lambda: self._cancelled)
+
+    def write_pdf(self):
+        """
+        render the table to an A4 pdf, each page is laid out separately
+        so the whole document is never held in memory
+
+            Returns:
+                True if all pages were rendered
+
+            Throws:
+                OSError if the file cannot be written
+        """
+        total = page_count(len(self._regions), self._rows_per_page)
+
+        writer = qg.QPdfWriter(self._file_name)
+        writer.setPageSize(qg.QPagedPaintDevice.A4)
+
+        painter = qg.QPainter()
+        if not painter.begin(writer):
+            raise OSError(f"Cannot write {self._file_name}")
+
+        page_size = qc.QSizeF(writer.width(), writer.height())
+
+        try:
+            for number, page in enumerate(html_pages(self._regions, self._rows_per_page), 1):
+                if self._cancelled:
+                    return False
+
+                if number > 1:
+                    writer.newPage()
+
+                doc = qg.QTextDocument()
+                doc.documentLayout().setPaintDevice(writer)
+                doc.setPageSize(page_size)
+                doc.setHtml(page)
+                doc.drawContents(painter)
+
+                self.progress.emit(number, total)
+        finally:
+            painter.end()
+
+        return True
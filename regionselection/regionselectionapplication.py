@@ -31,9 +31,31 @@ class RegionSelectionApplication(qw.QApplication):
 
     def __init__(self, args):
         """
-        initialize a main window and start event loop
+        initialize a main window and start event loop, if a project bundle
+        is given on the command line it is opened, with a warning if it cannot
+        be, the option "--canvas scene" selects the QGraphicsScene canvas and
+        "--store FILE" keeps the regions in a SQLite database
+
+            Args:
+                args ([string]) the command line arguments
         """
         super().__init__(args)
-        window = RegionSelectionMainWindow()
+
+        options = {"--canvas":None, "--store":None}
+        args = list(args)
+        for option in options:
+            if option in args[1:-1]:
+                position = args.index(option)
+                options[option] = args[position+1]
+                del args[position:position+2]
+
+        window = RegionSelectionMainWindow(canvas=options["--canvas"], store=options["--store"])
         window.show()
+
+        if len(args) > 1 and args[1].endswith(".npz"):
+            try:
+                window.load_project_file(args[1])
+            except (OSError, ValueError) as error:
+                qw.QMessageBox.warning(window, "Open Project", str(error))
+
         self.exec_()    # enter event loop
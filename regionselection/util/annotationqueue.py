@@ -0,0 +1,164 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+A folder of unrelated images annotated one after another, each image with its
+own regions and its own autosave file.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import os
+
+from regionselection.util.framesequence import FrameSequence
+from regionselection.util.autosavebinary import AutoSaveBinary
+from regionselection.util.fingerprint import image_fingerprint
+
+class AnnotationQueue():
+    """
+    the images of a folder in natural order, decoded through a FrameSequence so
+    the next images are decoded in the background, with the regions of each
+    image kept separately and restored from earlier autosaves
+    """
+
+    def __init__(self, directory, ahead=3, behind=1):
+        """
+        open a queue
+
+            Args:
+                directory (string) the folder of images
+                ahead (int) the number of images after the current one to prefetch
+                behind (int) the number of images before the current one to prefetch
+
+            Throws:
+                ValueError if the folder has no images
+        """
+        ## the images, decoded with prefetch
+        self._frames = FrameSequence(directory, ahead, behind, name="annotation queue cache")
+
+        ## the regions of the images visited, index to list of regions
+        self._regions = {}
+
+        ## the autosaves of the images, index to AutoSaveBinary
+        self._autosaves = {}
+
+        ## existing backups of the images, project name to backup file, autosaves
+        ## are made in the working directory
+        projects = {self.project(index) for index in range(len(self))}
+        self._backups = {project:file_path
+                         for file_path, project in AutoSaveBinary.list_backups(os.getcwd())
+                         if project in projects}
+
+    def __len__(self):
+        return len(self._frames)
+
+    @property
+    def directory(self):
+        """
+        getter for the folder
+        """
+        return self._frames.directory
+
+    def path(self, index):
+        """
+        the file of an image
+
+            Args:
+                index (int) the position in the queue
+
+            Returns:
+                (string) the file path
+        """
+        return self._frames.path(index)
+
+    def project(self, index):
+        """
+        the project name of an image, its absolute path, so the autosaves of
+        images with the same name in different folders are kept apart
+
+            Args:
+                index (int) the position in the queue
+
+            Returns:
+                (string) the project name
+        """
+        return os.path.abspath(self._frames.path(index))
+
+    def image(self, index):
+        """
+        get an image, and start decoding the images around it
+
+            Args:
+                index (int) the position in the queue
+
+            Returns:
+                (QImage) the image
+        """
+        return self._frames.image(index)
+
+    def regions(self, index):
+        """
+        the regions of an image, from its backup the first time it is visited
+
+            Args:
+                index (int) the position in the queue
+
+            Returns:
+                ([DrawRect]) a copy of the regions
+        """
+        if index not in self._regions:
+            regions = []
+            backup = self._backups.get(self.project(index))
+            if backup is not None:
+                _, regions = AutoSaveBinary.get_backup_project(backup)
+
+            self._regions[index] = regions if regions is not None else []
+
+        return list(self._regions[index])
+
+    def set_regions(self, index, regions):
+        """
+        keep the regions of an image while another is shown
+
+            Args:
+                index (int) the position in the queue
+                regions ([DrawRect]) the regions, a copy is kept
+        """
+        self._regions[index] = list(regions)
+
+    def autosave(self, index):
+        """
+        the autosave of an image, its existing backup if it has one, the file
+        is made when first asked for and records the image's fingerprint
+
+            Args:
+                index (int) the position in the queue
+
+            Returns:
+                (AutoSaveBinary) the autosave
+        """
+        if index not in self._autosaves:
+            project = self.project(index)
+            self._autosaves[index] = AutoSaveBinary(project,
+                                                    self._backups.get(project),
+                                                    image_fingerprint(self.path(index)))
+
+        return self._autosaves[index]
+
+    def close(self):
+        """
+        stop background decoding and release the cache
+        """
+        self._frames.close()
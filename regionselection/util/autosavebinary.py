@@ -21,8 +21,171 @@ This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
 # pylint: disable = c-extension-no-member
 
 import os
+import json
 import tempfile
 import pickle
+import threading
+
+import PyQt5.QtCore as qc
+
+## the hidden directory holding the index of the backups in a directory, kept
+## apart so that updating the index does not change the directory's modification time
+_INDEX_DIR = ".idback_index"
+
+## the name of the index in the index directory
+_INDEX_NAME = "index.json"
+
+## the name of the lock file serialising updates of an index between programs
+_LOCK_NAME = "index.lock"
+
+## the milliseconds to wait for another program to finish updating an index
+_LOCK_TIMEOUT = 2000
+
+## the indexes read, directory to ((index modification time, size), backup file
+## name to [project, fingerprint, modification time], fingerprint to backup file
+## names, the directory's modification time when the index last matched its backups)
+_INDEXES = {}
+
+## lock protecting the indexes
+_INDEX_LOCK = threading.Lock()
+
+def _index_version(index_path):
+    """
+    the modification time and size of an index file, None if there is none
+    """
+    try:
+        status = os.stat(index_path)
+    except OSError:
+        return None
+
+    return (status.st_mtime_ns, status.st_size)
+
+def _directory_version(dir_path):
+    """
+    the modification time of a directory, which changes when backups are made or
+    deleted, None if it cannot be read
+    """
+    try:
+        return os.stat(dir_path).st_mtime_ns
+    except OSError:
+        return None
+
+def _backup_time(file_path):
+    """
+    the modification time of a backup, the key ordering backups newest first, None
+    if it has gone
+    """
+    try:
+        return os.stat(file_path).st_mtime_ns
+    except OSError:
+        return None
+
+def _lock_index(dir_path):
+    """
+    lock the index of a directory against other programs, a lock left by a
+    program that has died is removed once stale
+
+        Args:
+            dir_path (string) the directory
+
+        Returns:
+            (QLockFile) the held lock, or None if it could not be taken in time
+    """
+    try:
+        os.makedirs(os.path.join(dir_path, _INDEX_DIR), exist_ok=True)
+    except OSError:
+        return None
+
+    lock = qc.QLockFile(os.path.join(dir_path, _INDEX_DIR, _LOCK_NAME))
+    if lock.tryLock(_LOCK_TIMEOUT):
+        return lock
+
+    return None
+
+def _by_fingerprint(entries):
+    """
+    the backups of each fingerprint in index entries
+    """
+    by_fingerprint = {}
+    for name, (_, fingerprint, _) in entries.items():
+        if fingerprint is not None:
+            by_fingerprint.setdefault(fingerprint, []).append(name)
+
+    return by_fingerprint
+
+def _cache_index(dir_path, version, entries, directory):
+    """
+    remember an index, with the backups of each fingerprint
+    """
+    by_fingerprint = _by_fingerprint(entries)
+
+    with _INDEX_LOCK:
+        _INDEXES[dir_path] = (version, entries, by_fingerprint, directory)
+
+    return entries, by_fingerprint, directory
+
+def _read_index(dir_path):
+    """
+    the index of the backups in a directory, read again only if the file has changed
+
+        Args:
+            dir_path (string) the directory
+
+        Returns:
+            (dict, dict, int) backup file name to [project, fingerprint, modification
+            time], fingerprint to list of backup file names, and the directory's
+            modification time when the index last matched its backups, or None
+    """
+    index_path = os.path.join(dir_path, _INDEX_DIR, _INDEX_NAME)
+    version = _index_version(index_path)
+
+    with _INDEX_LOCK:
+        cached = _INDEXES.get(dir_path)
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2], cached[3]
+
+    entries = {}
+    directory = None
+    if version is not None:
+        # a corrupt index, or corrupt entries, are rebuilt from the backups
+        try:
+            with open(index_path, 'r') as file:
+                data = json.load(file)
+            entries = {name:entry for name, entry in data.get("backups", {}).items()
+                       if isinstance(entry, list) and len(entry) == 3}
+            directory = data.get("directory")
+        except (OSError, ValueError, AttributeError):
+            entries = {}
+            directory = None
+
+    return _cache_index(dir_path, version, entries, directory)
+
+def _write_index(dir_path, entries, directory):
+    """
+    replace the index of the backups in a directory, through a temporary file
+    so other programs never read a partial index
+
+        Args:
+            dir_path (string) the directory
+            entries (dict) backup file name to [project, fingerprint, modification time]
+            directory (int) the directory's modification time when the entries
+                            last matched its backups, or None
+    """
+    index_dir = os.path.join(dir_path, _INDEX_DIR)
+    descriptor, tmp_path = tempfile.mkstemp(suffix='.tmp', prefix='index', dir=index_dir)
+    try:
+        with os.fdopen(descriptor, 'w') as file:
+            json.dump({"directory":directory, "backups":entries}, file)
+        os.replace(tmp_path, os.path.join(index_dir, _INDEX_NAME))
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+
+    _cache_index(dir_path,
+                 _index_version(os.path.join(index_dir, _INDEX_NAME)),
+                 entries,
+                 directory)
 
 class AutoSaveBinary():
     """
@@ -31,19 +194,22 @@ class AutoSaveBinary():
     ## file type identification code
     _MAGIC_CODE = "idw-01"
 
-    def __init__(self, project):
+    def __init__(self, project, file_path=None, fingerprint=None):
         """
         set-up the object
 
             Args:
                 project (string) the project name will be added to save
+                file_path (string) an existing backup to overwrite, None for a new file
+                fingerprint (string) the fingerprint of the image, or None
         """
-        # get file, close file, save file path
-        descriptor, file_path = tempfile.mkstemp(suffix='.idback',
-                                                 prefix='.',
-                                                 dir=os.getcwd(),
-                                                 text=False)
-        os.close(descriptor)
+        if file_path is None:
+            # get file, close file, save file path
+            descriptor, file_path = tempfile.mkstemp(suffix='.idback',
+                                                     prefix='.',
+                                                     dir=os.getcwd(),
+                                                     text=False)
+            os.close(descriptor)
 
         ## store the file path
         self._file_path = file_path
@@ -51,6 +217,9 @@ class AutoSaveBinary():
         ## store the project name
         self._project = project
 
+        ## the fingerprint of the image the regions belong to
+        self._fingerprint = fingerprint
+
     def get_file_path(self):
         """
         getter for the file path
@@ -68,45 +237,167 @@ class AutoSaveBinary():
             # delete existing contents
             file.truncate(0)
 
-            # make tuple of project name and output
-            data = (self._MAGIC_CODE, self._project, output)
+            # make tuple of project name, output and image fingerprint
+            data = (self._MAGIC_CODE, self._project, output, self._fingerprint)
 
             # save binary
             pickle.dump(data, file)
 
+        # the file is indexed once it has contents, and its time refreshed on each save,
+        # if another program holds the index the next save tries again
+        AutoSaveBinary.index_backup(self._file_path, self._project, self._fingerprint)
+
+    @staticmethod
+    def index_backup(file_path, project, fingerprint):
+        """
+        add a backup, with its modification time, to the index of its directory,
+        holding the directory's lock so that programs sharing the directory do
+        not overwrite each other's entries
+
+            Args:
+                file_path (string) the backup file
+                project (string) the project name
+                fingerprint (string) the fingerprint of the image, or None
+
+            Returns:
+                (bool) False if the lock could not be taken and the index was not updated
+        """
+        dir_path, name = os.path.split(os.path.abspath(file_path))
+        lock = _lock_index(dir_path)
+        if lock is None:
+            return False
+
+        try:
+            entries, _, directory = _read_index(dir_path)
+            entry = [project, fingerprint, _backup_time(file_path)]
+            if entries.get(name) != entry:
+                entries = dict(entries)
+                entries[name] = entry
+                _write_index(dir_path, entries, directory)
+        finally:
+            lock.unlock()
+
+        return True
+
+    @staticmethod
+    def find_backups(dir_path, fingerprint, rescan=False):
+        """
+        find the backups of an image by its fingerprint through the index, newest
+        first, the backups are only listed if the directory has changed since the
+        index last matched it, and only backups missing from the index are read
+
+            Args:
+                dir_path (string) full path to search directory
+                fingerprint (string) the fingerprint of the image
+                rescan (bool) if True list the backups even if the directory is unchanged
+
+            Returns:
+                list of tuples, each of which is (backup file, project name)
+        """
+        dir_path = os.path.abspath(dir_path)
+        entries, by_fingerprint = AutoSaveBinary._reconcile_index(dir_path, rescan)
+
+        names = sorted(by_fingerprint.get(fingerprint, []),
+                       key=lambda name: entries[name][2] or 0,
+                       reverse=True)
+
+        return [(os.path.join(dir_path, name), entries[name][0]) for name in names]
+
     @staticmethod
-    def list_backups(dir_path):
+    def list_backups(dir_path, rescan=False):
         """
-        make a list of all backup files, and project names
+        make a list of all backup files, and project names, from the directory's
+        index, the backups are only listed if the directory has changed since the
+        index last matched it, and only backups missing from the index are read
 
             Args:
                 dir_path (string) full path to search directory
+                rescan (bool) if True list the backups even if the directory is unchanged
 
             Returns:
                 list of tuples, each of which is (backup file, projcet name)
         """
-        files = []
-        output = []
+        dir_path = os.path.abspath(dir_path)
+        entries, _ = AutoSaveBinary._reconcile_index(dir_path, rescan)
+
+        return [(os.path.join(dir_path, name), entry[0]) for name, entry in entries.items()]
+
+    @staticmethod
+    def _reconcile_index(dir_path, rescan=False):
+        """
+        bring the index of a directory into line with its backup files, entries of
+        deleted files are dropped and files not in the index, such as those of a
+        program that could not take the lock, are read and added, nothing is
+        done if the directory's modification time is the one recorded in the index
+
+            Args:
+                dir_path (string) full path of the directory
+                rescan (bool) if True reconcile even if the directory is unchanged
+
+            Returns:
+                (dict, dict) backup file name to [project, fingerprint, modification
+                time], fingerprint to list of backup file names
+        """
+        directory = _directory_version(dir_path)
+        entries, by_fingerprint, recorded = _read_index(dir_path)
+        if not rescan and directory is not None and directory == recorded:
+            return entries, by_fingerprint
+
+        lock = _lock_index(dir_path)
+        try:
+            # the directory is read before listing, so a backup made during the
+            # listing changes it again and is found next time
+            directory = _directory_version(dir_path)
+            entries, by_fingerprint, recorded = _read_index(dir_path)
 
-        raw = os.listdir(dir_path)
+            names = [item for item in os.listdir(dir_path)
+                     if item.endswith(".idback") and os.path.isfile(os.path.join(dir_path, item))]
 
-        for item in raw:
-            if os.path.isfile(item) and item.endswith(".idback"):
-                files.append(os.path.join(dir_path, item))
+            updated = {name:entries[name] for name in names if name in entries}
+            for name in names:
+                if name not in updated:
+                    file_path = os.path.join(dir_path, name)
+                    entry = AutoSaveBinary._read_entry(file_path)
+                    if entry is not None:
+                        updated[name] = entry + [_backup_time(file_path)]
 
-        for file in files:
-            data = None
+            if updated == entries and directory == recorded:
+                return entries, by_fingerprint
 
-            # ignore empty or corrupt files
-            try:
-                data = pickle.load(open(file, 'rb'))
-            except EOFError:
-                pass
+            # without the lock the index is left for the program holding it
+            if lock is not None:
+                _write_index(dir_path, updated, directory)
+
+            return updated, _by_fingerprint(updated)
+        finally:
+            if lock is not None:
+                lock.unlock()
+
+    @staticmethod
+    def _read_entry(file_path):
+        """
+        read the index entry of a backup file
+
+            Args:
+                file_path (string) the backup file
+
+            Returns:
+                ([string, string]) the project and fingerprint, None if the file
+                is empty, corrupt or not a backup
+        """
+        data = None
+
+        # ignore empty or corrupt files
+        try:
+            with open(file_path, 'rb') as in_file:
+                data = pickle.load(in_file)
+        except (EOFError, pickle.UnpicklingError):
+            pass
 
-            if data is not None and len(data) > 1 and data[0] == AutoSaveBinary._MAGIC_CODE:
-                output.append((file, data[1]))
+        if data is not None and len(data) > 1 and data[0] == AutoSaveBinary._MAGIC_CODE:
+            return [data[1], data[3] if len(data) > 3 else None]
 
-        return output
+        return None
 
     @staticmethod
     def get_backup_project(file_path):
@@ -121,7 +412,8 @@ class AutoSaveBinary():
                 ([DrawRect]) the project data
         """
         try:
-            tmp = pickle.load(open(file_path, 'rb'))
+            with open(file_path, 'rb') as file:
+                tmp = pickle.load(file)
         except EOFError:
             return None, None
 
@@ -20,7 +20,12 @@ This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
 """
 
 from collections import namedtuple
-import numpy as np
+from itertools import chain
+
+from regionselection.util.lazyimport import lazy_import
+
+## numpy, loaded when first used so that importing DrawRect stays cheap
+np = lazy_import("numpy")
 
 ## data struct for a rectangle defined on a pixmap, this will serve
 ## as base for more sophisticated subclasses
@@ -58,26 +63,25 @@ class DrawRect(BaseRect):
         left = np.uint32(np.round(self.left*factor))
         right = np.uint32(np.round(self.right*factor))
 
-        return DrawRect(top, bottom, left, right)
+        return self._replace(top=top, bottom=bottom, left=left, right=right)
 
     def shift(self, x_shift, y_shift):
         """
-        shift the rectangle by the x and y (placeholder)
+        shift the rectangle by the x and y, edges moved past zero are
+        clamped at zero rather than wrapping round the unsigned range
 
             Args:
-                x_shift (np.uint32) the shift on X axis (horiziontal)
-                y_shift (np.uint32) the shift on Y axis
+                x_shift (int) the shift on X axis (horiziontal), may be negative
+                y_shift (int) the shift on Y axis, may be negative
 
             Retuns:
                 shifted copy of this rectangle shifted by x_shift, y_shift
         """
+        edges = np.array(self[:4], dtype=np.int64)
+        edges += (y_shift, y_shift, x_shift, x_shift)
+        top, bottom, left, right = np.maximum(edges, 0).astype(np.uint32)
 
-        top = self.top + y_shift
-        bottom = self.bottom + y_shift
-        left = self.left + x_shift
-        right = self.right + x_shift
-
-        return DrawRect(top, bottom, left, right)
+        return self._replace(top=top, bottom=bottom, left=left, right=right)
 
     def reshape(self, del_x, del_y):
         """
@@ -95,7 +99,33 @@ class DrawRect(BaseRect):
         left = np.uint32(np.round(self.left*del_x))
         right = np.uint32(np.round(self.right*del_x))
 
-        return DrawRect(top, bottom, left, right)
+        return self._replace(top=top, bottom=bottom, left=left, right=right)
+
+    def time_in_region(self, frame):
+        """
+        test if the region exists in a frame, a plain rectangle exists in all frames
+
+            Args:
+                frame (int) the frame number
+
+            Returns:
+                True
+        """
+        # pylint: disable = unused-argument, no-self-use
+        return True
+
+    def at_frame(self, frame):
+        """
+        the rectangle as it is in a frame, a plain rectangle never changes
+
+            Args:
+                frame (int) the frame number
+
+            Returns:
+                (DrawRect) self
+        """
+        # pylint: disable = unused-argument
+        return self
 
     @property
     def width(self):
@@ -136,3 +166,35 @@ class DrawRect(BaseRect):
         """
         return "(top: {}, bottom:{}, left:{}, right:{}, height:{}, width:{})".format(
             self.top, self.bottom, self.left, self.right, self.height, self.width)
+
+
+def regions_to_array(regions):
+    """
+    pack a list of regions into a single array, one row per region
+
+        Args:
+            regions ([DrawRect]) the regions
+
+        Returns:
+            (numpy.array) uint32 array of shape (N, 4), columns top, bottom, left, right
+    """
+    count = len(regions)
+    flat = np.fromiter(chain.from_iterable(region[:4] for region in regions),
+                       dtype=np.uint32,
+                       count=4*count)
+
+    return flat.reshape((count, 4))
+
+def array_to_regions(array):
+    """
+    unpack an array of regions, as made by regions_to_array, into a list
+
+        Args:
+            array (numpy.array) array of shape (N, 4), columns top, bottom, left, right
+
+        Returns:
+            [DrawRect]
+    """
+    array = np.asarray(array, dtype=np.uint32)
+
+    return [DrawRect(*row) for row in array]
@@ -0,0 +1,328 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Snapping of rectangle edges to strong image edges. The gradient magnitude
+maps are computed once per image, in a background thread, and cached; each
+snap then only examines a small window of the maps around the edge.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from regionselection.util.lazyimport import lazy_import
+from regionselection.util.memoryreport import register_cache
+
+## numpy, loaded when the first maps are computed, so the canvases can import the snapper cheaply
+np = lazy_import("numpy")
+
+## region proposals, the source of the grayscale bands, loaded with numpy
+regionproposals = lazy_import("regionselection.util.regionproposals")
+
+## the default distance, in pixels, searched for an edge
+SNAP_RADIUS = 8
+
+## the default minimum mean gradient, in gray levels, of an edge that is snapped to
+MIN_STRENGTH = 12
+
+## the number of images whose maps are cached
+_CACHE_SIZE = 2
+
+class GradientMaps():
+    """
+    the absolute horizontal and vertical gradients of an image as uint8 arrays
+    """
+
+    def __init__(self, image):
+        """
+        compute the maps, band by band
+
+            Args:
+                image (QImage) the image
+        """
+        height = image.height()
+        width = image.width()
+
+        ## |d/dx|, large on vertical edges
+        self.across = np.zeros((height, width), dtype=np.uint8)
+
+        ## |d/dy|, large on horizontal edges
+        self.down = np.zeros((height, width), dtype=np.uint8)
+
+        previous = None
+        for top, pixels in regionproposals.gray_bands(image):
+            pixels = pixels.astype(np.int16)
+            rows = len(pixels)
+
+            # backward differences, so an edge lies between pixel x-1 and x
+            self.across[top:top+rows, 1:] = np.abs(pixels[:, 1:] - pixels[:, :-1])
+
+            # include the last row of the previous band for the vertical difference
+            extended = pixels if previous is None else np.vstack([previous, pixels])
+            offset = top - (0 if previous is None else 1)
+            self.down[offset+1:offset+len(extended)] = np.abs(extended[1:] - extended[:-1])
+
+            previous = pixels[-1:]
+
+    @property
+    def size_in_bytes(self):
+        """
+        getter for the memory used by the maps
+        """
+        return self.across.nbytes + self.down.nbytes
+
+    def snap_x(self, x_pos, top, bottom, radius=SNAP_RADIUS, min_strength=MIN_STRENGTH):
+        """
+        find the strongest vertical edge near a vertical line segment
+
+            Args:
+                x_pos (int) the x coordinate of the segment
+                top (int) the first row of the segment
+                bottom (int) the row after the last row of the segment
+                radius (int) the distance searched either side
+                min_strength (float) the minimum mean gradient of an edge
+
+            Returns:
+                (int) the x coordinate of the edge, or x_pos if there is none
+        """
+        return _snap(self.across, x_pos, top, bottom, radius, min_strength)
+
+    def snap_y(self, y_pos, left, right, radius=SNAP_RADIUS, min_strength=MIN_STRENGTH):
+        """
+        find the strongest horizontal edge near a horizontal line segment
+
+            Args:
+                y_pos (int) the y coordinate of the segment
+                left (int) the first column of the segment
+                right (int) the column after the last column of the segment
+                radius (int) the distance searched either side
+                min_strength (float) the minimum mean gradient of an edge
+
+            Returns:
+                (int) the y coordinate of the edge, or y_pos if there is none
+        """
+        return _snap(self.down.T, y_pos, left, right, radius, min_strength)
+
+def _snap(gradient, position, low, high, radius, min_strength):
+    """
+    find the column of a gradient map, near position, with the largest mean
+    over the rows low to high
+
+        Returns:
+            (int) the column or position if no column is strong enough
+    """
+    rows, columns = gradient.shape
+    low = max(0, min(low, high))
+    high = min(rows, max(low + 1, high))
+    first = max(0, position - radius)
+    last = min(columns, position + radius + 1)
+
+    if first >= last or low >= high:
+        return position
+
+    strength = gradient[low:high, first:last].mean(axis=0)
+    best = int(np.argmax(strength))
+
+    if strength[best] < min_strength:
+        return position
+
+    return first + best
+
+class _MapCache():
+    """
+    the gradient maps of the most recently used images, computed in a background thread
+    """
+
+    def __init__(self):
+        ## image cache key to future of GradientMaps, least recently used first
+        self._futures = OrderedDict()
+
+        ## the computing thread
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+        ## lock protecting the futures
+        self._lock = threading.Lock()
+
+        register_cache("gradient maps", self.size_in_bytes)
+
+    def request(self, image):
+        """
+        get the maps of an image, starting their computation if needed
+
+            Args:
+                image (QImage) the image
+
+            Returns:
+                (Future) resolving to the GradientMaps
+        """
+        key = image.cacheKey()
+
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                future = self._executor.submit(GradientMaps, image)
+                self._futures[key] = future
+                while len(self._futures) > _CACHE_SIZE:
+                    self._futures.popitem(last=False)
+            else:
+                self._futures.move_to_end(key)
+
+            return future
+
+    def size_in_bytes(self):
+        """
+        the memory used by the completed maps
+        """
+        with self._lock:
+            futures = list(self._futures.values())
+
+        return sum(future.result().size_in_bytes for future in futures
+                   if future.done() and future.exception() is None)
+
+## the shared cache of maps
+_CACHE = _MapCache()
+
+def request_maps(image):
+    """
+    get the gradient maps of an image, computing them in the background if needed
+
+        Args:
+            image (QImage) the image
+
+        Returns:
+            (Future) resolving to the GradientMaps
+    """
+    return _CACHE.request(image)
+
+class EdgeSnapper():
+    """
+    snapping of the corners of a rectangle being drawn on an image, the maps
+    are requested when snapping is enabled and used once they are ready
+    """
+
+    def __init__(self):
+        ## the image being drawn on, or None
+        self._image = None
+
+        ## image pixels per coordinate of the points snapped, less than 1 if
+        ## the image is a downsampled view of the image being drawn on
+        self._scale = 1.0
+
+        ## if true snap
+        self._enabled = False
+
+        ## future of the gradient maps of the image, or None
+        self._maps = None
+
+    @property
+    def enabled(self):
+        """
+        getter for the snapping flag
+        """
+        return self._enabled
+
+    def set_image(self, image, scale=1.0):
+        """
+        set the image being drawn on
+
+            Args:
+                image (QImage) the image, or None for no snapping
+                scale (float) image pixels per coordinate of the points snapped,
+                              for example the scale of a downsampled view
+        """
+        self._image = image
+        self._scale = scale
+        self._maps = None
+        if self._enabled and image is not None:
+            self._maps = request_maps(image)
+
+    def set_enabled(self, flag):
+        """
+        turn snapping on or off
+
+            Args:
+                flag (bool) if true snap
+        """
+        self._enabled = flag
+        if flag and self._image is not None and self._maps is None:
+            self._maps = request_maps(self._image)
+
+    def snap(self, x_pos, y_pos, anchor_x=None, anchor_y=None):
+        """
+        move a corner of a rectangle to the nearest strong edges, on a downsampled
+        image the corner is moved in the image's coordinates and scaled back
+
+            Args:
+                x_pos (int) the x coordinate of the corner
+                y_pos (int) the y coordinate of the corner
+                anchor_x (int) the x coordinate of the opposite corner, None if not yet known
+                anchor_y (int) the y coordinate of the opposite corner, None if not yet known
+
+            Returns:
+                (int, int) the snapped corner, or the corner if snapping is not available
+        """
+        if not self._enabled or self._maps is None or not self._maps.done():
+            return x_pos, y_pos
+
+        if self._maps.exception() is not None:
+            return x_pos, y_pos
+
+        maps = self._maps.result()
+        if self._scale != 1.0:
+            return self._snap_scaled(maps, x_pos, y_pos, anchor_x, anchor_y)
+
+        return _snap_corner(maps, x_pos, y_pos, anchor_x, anchor_y)
+
+    def _snap_scaled(self, maps, x_pos, y_pos, anchor_x, anchor_y):
+        """
+        snap a corner given in the coordinates of the full image on maps of a
+        downsampled image, a coordinate not moved is returned unchanged
+
+            Returns:
+                (int, int) the snapped corner
+        """
+        def to_image(value):
+            return None if value is None else int(round(value*self._scale))
+
+        image_x, image_y = to_image(x_pos), to_image(y_pos)
+        snapped_x, snapped_y = _snap_corner(maps, image_x, image_y,
+                                            to_image(anchor_x), to_image(anchor_y))
+
+        if snapped_x != image_x:
+            x_pos = int(round(snapped_x/self._scale))
+        if snapped_y != image_y:
+            y_pos = int(round(snapped_y/self._scale))
+
+        return x_pos, y_pos
+
+def _snap_corner(maps, x_pos, y_pos, anchor_x, anchor_y):
+    """
+    move a corner of a rectangle to the nearest strong edges of gradient maps
+
+        Returns:
+            (int, int) the snapped corner
+    """
+    if anchor_x is None or anchor_y is None:
+        anchor_x = x_pos + SNAP_RADIUS
+        anchor_y = y_pos + SNAP_RADIUS
+
+    # the edges through the corner run along the rectangle's sides
+    top, bottom = sorted((y_pos, anchor_y))
+    left, right = sorted((x_pos, anchor_x))
+
+    return maps.snap_x(x_pos, top, bottom+1), maps.snap_y(y_pos, left, right+1)
@@ -0,0 +1,91 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import os
+import mmap
+import hashlib
+import threading
+from collections import OrderedDict
+
+## size of the blocks of the mapped file passed to the hash
+_CHUNK_SIZE = 1 << 24
+
+## the most fingerprints remembered
+_CACHE_SIZE = 256
+
+## fingerprints of files already hashed, (path, size, mtime) to hex digest, least recently used first
+_CACHE = OrderedDict()
+
+## lock protecting the cache
+_LOCK = threading.Lock()
+
+def _file_key(file_path):
+    """
+    the cache key of a file, a change of size or modification time is a new key
+    """
+    status = os.stat(file_path)
+    return (os.path.abspath(file_path), status.st_size, status.st_mtime_ns)
+
+def _hash_file(file_path, size):
+    """
+    hash a file through a read only memory map, in chunks so the hash can work
+    on the mapped pages without copying them
+    """
+    digest = hashlib.sha256()
+    if size == 0:
+        return digest.hexdigest()
+
+    with open(file_path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for start in range(0, size, _CHUNK_SIZE):
+                    digest.update(view[start:start + _CHUNK_SIZE])
+            finally:
+                view.release()
+
+    return digest.hexdigest()
+
+def image_fingerprint(file_path):
+    """
+    make a fingerprint of an image file's contents, the SHA-256 of the file,
+    remembered until the file's size or modification time changes
+
+        Args:
+            file_path (string) the image file path
+
+        Returns:
+            (string) hex digest of the file contents
+    """
+    key = _file_key(file_path)
+
+    with _LOCK:
+        fingerprint = _CACHE.get(key)
+        if fingerprint is not None:
+            _CACHE.move_to_end(key)
+            return fingerprint
+
+    fingerprint = _hash_file(file_path, key[1])
+
+    with _LOCK:
+        _CACHE[key] = fingerprint
+        while len(_CACHE) > _CACHE_SIZE:
+            _CACHE.popitem(last=False)
+
+    return fingerprint
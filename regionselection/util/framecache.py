@@ -0,0 +1,228 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+A least recently used cache of decoded images, limited by memory, and a loader
+that decodes images in background threads ahead of their use.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+# set up linting conditions
+# pylint: disable = c-extension-no-member
+# pylint: disable = import-error
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import PyQt5.QtGui as qg
+
+from regionselection.util.memoryreport import register_cache, unregister_cache
+
+## the default memory limit of a cache in bytes
+MEMORY_LIMIT = 512*1024*1024
+
+class FrameCache():
+    """
+    least recently used cache of QImages with a limit on their total size,
+    safe to use from several threads
+    """
+
+    def __init__(self, memory_limit=MEMORY_LIMIT):
+        """
+        set up an empty cache
+
+            Args:
+                memory_limit (int) the maximum total size of the images in bytes
+        """
+        ## the images, least recently used first
+        self._images = OrderedDict()
+
+        ## the total size of the images
+        self._bytes = 0
+
+        ## the size limit
+        self._memory_limit = memory_limit
+
+        ## lock protecting the images
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._images)
+
+    def __contains__(self, key):
+        return key in self._images
+
+    @property
+    def size_in_bytes(self):
+        """
+        getter for the total size of the cached images
+        """
+        return self._bytes
+
+    def get(self, key):
+        """
+        get an image, marking it as most recently used
+
+            Args:
+                key (hashable) the image's key
+
+            Returns:
+                (QImage) the image or None if it is not cached
+        """
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+            return image
+
+    def put(self, key, image):
+        """
+        add an image, evicting the least recently used images if over the limit,
+        the most recent image is always kept
+
+            Args:
+                key (hashable) the image's key
+                image (QImage) the image
+        """
+        with self._lock:
+            old = self._images.pop(key, None)
+            if old is not None:
+                self._bytes -= old.sizeInBytes()
+
+            self._images[key] = image
+            self._bytes += image.sizeInBytes()
+
+            while self._bytes > self._memory_limit and len(self._images) > 1:
+                _, evicted = self._images.popitem(last=False)
+                self._bytes -= evicted.sizeInBytes()
+
+    def clear(self):
+        """
+        remove all images
+        """
+        with self._lock:
+            self._images.clear()
+            self._bytes = 0
+
+class FrameLoader():
+    """
+    loads images by file path through a FrameCache, decoding requested
+    images in background threads
+    """
+
+    def __init__(self, memory_limit=MEMORY_LIMIT, workers=2, name="frame cache"):
+        """
+        set up the loader
+
+            Args:
+                memory_limit (int) the cache's memory limit in bytes
+                workers (int) the number of decoding threads
+                name (string) the name of the cache in memory reports
+        """
+        ## the decoded images
+        self._cache = FrameCache(memory_limit)
+
+        ## the decoding threads
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+        ## decodes in progress, path to future
+        self._pending = {}
+
+        ## lock protecting the pending decodes
+        self._lock = threading.Lock()
+
+        ## the name in memory reports
+        self._name = name
+        register_cache(name, lambda: self._cache.size_in_bytes)
+
+    @property
+    def cache(self):
+        """
+        getter for the cache
+        """
+        return self._cache
+
+    def _decode(self, path):
+        """
+        decode an image into the cache, run in a worker thread
+
+            Args:
+                path (string) the image file
+
+            Returns:
+                (QImage) the image, null if it could not be read
+        """
+        image = qg.QImage(path)
+
+        if not image.isNull():
+            self._cache.put(path, image)
+
+        with self._lock:
+            self._pending.pop(path, None)
+
+        return image
+
+    def prefetch(self, paths):
+        """
+        request background decoding of images, any earlier requests that have
+        not started are abandoned
+
+            Args:
+                paths ([string]) the image files, most urgent first
+        """
+        with self._lock:
+            for path, future in list(self._pending.items()):
+                if path not in paths and future.cancel():
+                    del self._pending[path]
+
+            for path in paths:
+                if path not in self._cache and path not in self._pending:
+                    self._pending[path] = self._executor.submit(self._decode, path)
+
+    def get(self, path):
+        """
+        get an image, from the cache, from a decode in progress or by decoding it now
+
+            Args:
+                path (string) the image file
+
+            Returns:
+                (QImage) the image, null if it could not be read
+        """
+        image = self._cache.get(path)
+        if image is not None:
+            return image
+
+        with self._lock:
+            future = self._pending.get(path)
+
+        if future is not None and not future.cancelled():
+            return future.result()
+
+        return self._decode(path)
+
+    def shutdown(self):
+        """
+        stop the worker threads, abandoning requests that have not started
+        """
+        with self._lock:
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+
+        self._executor.shutdown(wait=True)
+        self._cache.clear()
+        unregister_cache(self._name)
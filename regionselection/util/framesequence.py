@@ -0,0 +1,144 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+A directory of numbered image files treated as one sequence of frames.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import os
+import re
+
+from regionselection.util.framecache import FrameLoader, MEMORY_LIMIT
+
+## the image file extensions making up a sequence
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp")
+
+def natural_key(name):
+    """
+    sort key ordering embedded numbers by value, so frame_9 comes before frame_10
+
+        Args:
+            name (string) the file name
+
+        Returns:
+            (list) the sort key
+    """
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", name)]
+
+def list_images(directory):
+    """
+    list the image files of a directory in natural order
+
+        Args:
+            directory (string) the directory
+
+        Returns:
+            [string] the file paths
+    """
+    names = [name for name in os.listdir(directory)
+             if name.lower().endswith(IMAGE_EXTENSIONS)]
+
+    return [os.path.join(directory, name) for name in sorted(names, key=natural_key)]
+
+class FrameSequence():
+    """
+    the numbered images of a directory, decoded through a cache with frames
+    around the current one decoded in the background
+    """
+
+    def __init__(self, directory, ahead=8, behind=2, memory_limit=MEMORY_LIMIT,
+                 name="frame sequence cache"):
+        """
+        open a sequence
+
+            Args:
+                directory (string) the directory of frames
+                ahead (int) the number of frames after the current one to prefetch
+                behind (int) the number of frames before the current one to prefetch
+                memory_limit (int) the cache's memory limit in bytes
+                name (string) the name of the cache in memory reports
+
+            Throws:
+                ValueError if the directory has no images
+        """
+        ## the frame files in order
+        self._paths = list_images(directory)
+        if len(self._paths) == 0:
+            raise ValueError(f"{directory} has no images")
+
+        ## the directory
+        self._directory = directory
+
+        ## number of frames prefetched after the current one
+        self._ahead = ahead
+
+        ## number of frames prefetched before the current one
+        self._behind = behind
+
+        ## the cached loader
+        self._loader = FrameLoader(memory_limit, name=name)
+
+    def __len__(self):
+        return len(self._paths)
+
+    @property
+    def directory(self):
+        """
+        getter for the directory
+        """
+        return self._directory
+
+    def path(self, frame):
+        """
+        the file of a frame
+
+            Args:
+                frame (int) the frame number
+
+            Returns:
+                (string) the file path
+        """
+        return self._paths[frame]
+
+    def image(self, frame):
+        """
+        get a frame, and start decoding the frames around it
+
+            Args:
+                frame (int) the frame number
+
+            Returns:
+                (QImage) the frame
+        """
+        image = self._loader.get(self._paths[frame])
+
+        # nearest first, ahead before behind
+        order = []
+        for step in range(1, max(self._ahead, self._behind) + 1):
+            if step <= self._ahead and frame + step < len(self._paths):
+                order.append(self._paths[frame + step])
+            if step <= self._behind and frame - step >= 0:
+                order.append(self._paths[frame - step])
+        self._loader.prefetch(order)
+
+        return image
+
+    def close(self):
+        """
+        stop background decoding and release the cache
+        """
+        self._loader.shutdown()
@@ -0,0 +1,163 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+A uniform grid of cells, each listing the regions that overlap it, allowing
+the regions under a point, or overlapping a rectangle, to be found without
+searching every region.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import numpy as np
+
+## the side of a grid cell in pixels
+CELL_SIZE = 64
+
+class HitGrid():
+    """
+    a static grid index of rectangular regions
+    """
+
+    def __init__(self, regions, indices=None, cell_size=CELL_SIZE):
+        """
+        build the grid
+
+            Args:
+                regions (numpy.array) (N, 4) array of [top, bottom, left, right]
+                indices (numpy.array) the identifier of each region, default 0 to N-1
+                cell_size (int) the side of a grid cell in pixels
+        """
+        regions = np.array(regions, dtype=np.int64).reshape(-1, 4)
+
+        # inverted regions, which validation may only flag, are hit as if normalised
+        regions[:, :2].sort(axis=1)
+        regions[:, 2:].sort(axis=1)
+
+        ## the regions, as int64 [top, bottom, left, right], each axis in increasing order
+        self._regions = regions
+
+        ## the identifiers of the regions
+        self._indices = np.arange(len(regions)) if indices is None else np.asarray(indices)
+
+        ## the side of a cell
+        self._cell_size = cell_size
+
+        first_row = regions[:, 0] // cell_size
+        last_row = regions[:, 1] // cell_size
+        first_column = regions[:, 2] // cell_size
+        last_column = regions[:, 3] // cell_size
+
+        ## the number of cell columns
+        self._columns = int(last_column.max()) + 1 if len(regions) > 0 else 1
+
+        # enumerate every (region, cell) pair without a python loop
+        widths = last_column - first_column + 1
+        counts = widths * (last_row - first_row + 1)
+        members = np.repeat(np.arange(len(regions)), counts)
+        within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows = first_row[members] + within // widths[members]
+        columns = first_column[members] + within % widths[members]
+        cells = rows * self._columns + columns
+
+        order = np.argsort(cells, kind="stable")
+
+        ## the cell number of each (region, cell) pair, sorted
+        self._cells = cells[order]
+
+        ## the region of each (region, cell) pair
+        self._members = members[order]
+
+    def _candidates(self, cells):
+        """
+        the regions listed in some cells
+
+            Args:
+                cells (numpy.array) cell numbers
+
+            Returns:
+                (numpy.array) region positions, may contain duplicates
+        """
+        lows = np.searchsorted(self._cells, cells, side="left")
+        highs = np.searchsorted(self._cells, cells, side="right")
+        if len(cells) == 1:
+            return self._members[lows[0]:highs[0]]
+
+        return np.concatenate([self._members[low:high] for low, high in zip(lows, highs)])
+
+    def at_point(self, x_pos, y_pos):
+        """
+        find the smallest region containing a point
+
+            Args:
+                x_pos (int) the x coordinate
+                y_pos (int) the y coordinate
+
+            Returns:
+                (int) the identifier of the region or None
+        """
+        if x_pos < 0 or y_pos < 0:
+            return None
+
+        column = x_pos // self._cell_size
+        if column >= self._columns:
+            return None
+
+        cell = (y_pos // self._cell_size) * self._columns + column
+        candidates = self._candidates(np.array([cell]))
+        if len(candidates) == 0:
+            return None
+
+        boxes = self._regions[candidates]
+        inside = ((boxes[:, 0] <= y_pos) & (y_pos <= boxes[:, 1]) &
+                  (boxes[:, 2] <= x_pos) & (x_pos <= boxes[:, 3]))
+        if not np.any(inside):
+            return None
+
+        candidates = candidates[inside]
+        boxes = boxes[inside]
+        areas = (boxes[:, 1] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 2])
+
+        return int(self._indices[candidates[np.argmin(areas)]])
+
+    def in_rect(self, left, top, right, bottom):
+        """
+        find the regions overlapping a rectangle
+
+            Args:
+                left (int) the first column of the rectangle
+                top (int) the first row of the rectangle
+                right (int) the last column of the rectangle
+                bottom (int) the last row of the rectangle
+
+            Returns:
+                (numpy.array) the identifiers of the regions in increasing order of position
+        """
+        first_column = max(0, left) // self._cell_size
+        last_column = min(right // self._cell_size, self._columns - 1)
+        first_row = max(0, top) // self._cell_size
+        last_row = bottom // self._cell_size
+        if first_column > last_column or first_row > last_row or len(self._regions) == 0:
+            return self._indices[:0]
+
+        columns = np.arange(first_column, last_column + 1)
+        cells = np.arange(first_row, last_row + 1)[:, np.newaxis] * self._columns + columns
+
+        candidates = np.unique(self._candidates(cells.ravel()))
+        boxes = self._regions[candidates]
+        overlap = ((boxes[:, 0] <= bottom) & (top <= boxes[:, 1]) &
+                   (boxes[:, 2] <= right) & (left <= boxes[:, 3]))
+
+        return self._indices[candidates[overlap]]
@@ -0,0 +1,352 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+The single owner of the pixels of the image being annotated. The canvas paints
+from the store's view, and exporters and analysis code ask it for the full image
+or for tiles, so no full size copy, such as a QPixmap, is made. An image larger
+than the memory budget is held as a downsampled view, with full resolution tiles
+read from the file on demand and evicted when over the budget.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+# set up linting conditions
+# pylint: disable = c-extension-no-member
+# pylint: disable = import-error
+
+import os
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import PyQt5.QtGui as qg
+import PyQt5.QtCore as qc
+
+from regionselection.util.memoryreport import register_cache, unregister_cache
+
+## the default memory budget of an image in bytes, REGIONSELECTION_IMAGE_BUDGET in MiB overrides it
+IMAGE_BUDGET = int(os.environ.get("REGIONSELECTION_IMAGE_BUDGET", "1024"))*1024*1024
+
+## the side of a full resolution tile in pixels
+TILE_SIZE = 1024
+
+## the bytes per pixel of a decoded image, images are decoded to 32 bit formats
+_PIXEL_BYTES = 4
+
+class ImageStore():
+    """
+    owns one image, either decoded in full or, if that would exceed its memory
+    budget, as a downsampled view plus a cache of full resolution tiles
+    """
+
+    def __init__(self, image, file_path=None, scale=1.0, budget=IMAGE_BUDGET,
+                 tile_size=TILE_SIZE):
+        """
+        hold an image, use open to read a file within a budget
+
+            Args:
+                image (QImage) the full image, or if scale < 1 its downsampled view
+                file_path (string) the image file, needed for tiles of a downsampled image
+                scale (float) the size of the view relative to the full image
+                budget (int) the memory budget in bytes
+                tile_size (int) the side of a tile in pixels
+        """
+        ## the full image or downsampled view
+        self._view = image
+
+        ## the image file or None
+        self._file_path = file_path
+
+        ## view pixels per full resolution pixel
+        self._scale = scale
+
+        ## the size of the full image
+        self._size = image.size() if scale == 1.0 else \
+            qg.QImageReader(file_path).size()
+
+        ## True if the file's format can read part of an image without decoding it all
+        self._clip_support = scale == 1.0 or qg.QImageReader(file_path).supportsOption(
+            qg.QImageIOHandler.ClipRect)
+
+        ## the memory budget in bytes
+        self._budget = budget
+
+        ## the side of a tile
+        self._tile_size = tile_size
+
+        ## full resolution tiles read from the file, (column, row) to QImage,
+        ## least recently used first
+        self._tiles = OrderedDict()
+
+        ## the bytes held by the tiles
+        self._tile_bytes = 0
+
+        ## lock protecting the tiles
+        self._lock = threading.Lock()
+
+        if self.is_downsampled():
+            register_cache("image tiles", lambda: self._tile_bytes)
+
+    @staticmethod
+    def open(file_path, budget=IMAGE_BUDGET, tile_size=TILE_SIZE):
+        """
+        read an image file, in full if it fits the budget, otherwise as a view
+        downsampled to fit half the budget, leaving the rest for tiles
+
+            Args:
+                file_path (string) the image file
+                budget (int) the memory budget in bytes
+                tile_size (int) the side of a tile in pixels
+
+            Returns:
+                (ImageStore) the store
+
+            Throws:
+                ValueError if the file cannot be read
+        """
+        reader = qg.QImageReader(file_path)
+        reader.setAutoTransform(True)
+        size = reader.size()
+
+        full_bytes = size.width()*size.height()*_PIXEL_BYTES
+        if not size.isValid() or full_bytes <= budget:
+            image = reader.read()
+            if image.isNull():
+                raise ValueError(f"Cannot read the image {file_path}: {reader.errorString()}")
+            return ImageStore(image, file_path, 1.0, budget, tile_size)
+
+        scale = math.sqrt(budget/(2*full_bytes))
+        reader.setScaledSize(qc.QSize(max(1, int(size.width()*scale)),
+                                      max(1, int(size.height()*scale))))
+        image = reader.read()
+        if image.isNull():
+            raise ValueError(f"Cannot read the image {file_path}: {reader.errorString()}")
+
+        return ImageStore(image, file_path, image.width()/size.width(), budget, tile_size)
+
+    @property
+    def scale(self):
+        """
+        getter for the size of the view relative to the full image, 1 if not downsampled
+        """
+        return self._scale
+
+    @property
+    def file_path(self):
+        """
+        getter for the image file, None if the image was not read from a file
+        """
+        return self._file_path
+
+    def is_downsampled(self):
+        """
+        test if the full image is not held
+
+            Returns:
+                (bool) True if only a downsampled view is held
+        """
+        return self._scale < 1.0
+
+    def width(self):
+        """
+        the width of the full image
+        """
+        return self._size.width()
+
+    def height(self):
+        """
+        the height of the full image
+        """
+        return self._size.height()
+
+    def size(self):
+        """
+        the size of the full image
+
+            Returns:
+                (QSize)
+        """
+        return qc.QSize(self._size)
+
+    def view(self):
+        """
+        the image to display, the full image or its downsampled view, shared not copied
+
+            Returns:
+                (QImage)
+        """
+        return self._view
+
+    def full_image(self):
+        """
+        the full resolution image, shared not copied
+
+            Returns:
+                (QImage) the image, or None if it is downsampled
+        """
+        return None if self.is_downsampled() else self._view
+
+    def to_view(self, regions):
+        """
+        regions in image coordinates converted to view coordinates
+
+            Args:
+                regions (numpy.array) (N, 4) array, columns top, bottom, left, right
+
+            Returns:
+                (numpy.array) uint32 (N, 4) array, the input if not downsampled
+        """
+        if not self.is_downsampled():
+            return regions
+
+        return np.round(regions[:, :4]*self._scale).astype(np.uint32)
+
+    def from_view(self, regions):
+        """
+        regions in view coordinates converted to image coordinates, clipped to the image
+
+            Args:
+                regions (numpy.array) (N, 4) array, columns top, bottom, left, right
+
+            Returns:
+                (numpy.array) uint32 (N, 4) array, the input if not downsampled
+        """
+        if not self.is_downsampled():
+            return regions
+
+        output = np.round(regions[:, :4]/self._scale)
+        np.clip(output[:, :2], 0, self.height(), out=output[:, :2])
+        np.clip(output[:, 2:], 0, self.width(), out=output[:, 2:])
+        return output.astype(np.uint32)
+
+    def size_in_bytes(self):
+        """
+        the memory held by the view and the tiles
+        """
+        return self._view.sizeInBytes() + self._tile_bytes
+
+    def can_read_tiles(self):
+        """
+        test if full resolution tiles of a downsampled image can be read from its
+        file without decoding the whole file for each tile
+
+            Returns:
+                (bool)
+        """
+        return self._clip_support
+
+    def tile(self, column, row):
+        """
+        a full resolution tile, read from the file and cached if the image is
+        downsampled, the least recently used tiles are evicted to keep the view
+        and tiles within the budget
+
+            Args:
+                column (int) the tile column
+                row (int) the tile row
+
+            Returns:
+                (QImage) the tile, smaller at the right and bottom edges
+        """
+        rect = qc.QRect(column*self._tile_size, row*self._tile_size,
+                        self._tile_size, self._tile_size).intersected(
+                            qc.QRect(qc.QPoint(0, 0), self._size))
+
+        if not self.is_downsampled():
+            return self._view.copy(rect)
+
+        with self._lock:
+            image = self._tiles.get((column, row))
+            if image is not None:
+                self._tiles.move_to_end((column, row))
+                return image
+
+        reader = qg.QImageReader(self._file_path)
+        reader.setAutoTransform(True)
+        reader.setClipRect(rect)
+        image = reader.read()
+
+        with self._lock:
+            self._tiles[(column, row)] = image
+            self._tile_bytes += image.sizeInBytes()
+            while (self._tile_bytes + self._view.sizeInBytes() > self._budget
+                   and len(self._tiles) > 1):
+                _, evicted = self._tiles.popitem(last=False)
+                self._tile_bytes -= evicted.sizeInBytes()
+
+        return image
+
+    def tiles(self, rect):
+        """
+        the full resolution tiles covering a rectangle
+
+            Args:
+                rect (QRect) the rectangle in full image coordinates
+
+            Returns:
+                [(QRect, QImage)] the position of each tile and the tile
+        """
+        rect = rect.intersected(qc.QRect(qc.QPoint(0, 0), self._size))
+        if rect.isEmpty():
+            return []
+
+        columns = range(rect.left()//self._tile_size, rect.right()//self._tile_size + 1)
+        rows = range(rect.top()//self._tile_size, rect.bottom()//self._tile_size + 1)
+
+        output = []
+        for row in rows:
+            for column in columns:
+                image = self.tile(column, row)
+                position = qc.QRect(column*self._tile_size, row*self._tile_size,
+                                    image.width(), image.height())
+                output.append((position, image))
+
+        return output
+
+    def region(self, rect):
+        """
+        a full resolution copy of part of the image
+
+            Args:
+                rect (QRect) the part in full image coordinates
+
+            Returns:
+                (QImage) the part
+        """
+        if not self.is_downsampled():
+            return self._view.copy(rect)
+
+        output = qg.QImage(rect.size(), self._view.format())
+        output.fill(qc.Qt.black)
+        painter = qg.QPainter(output)
+        painter.translate(-rect.topLeft())
+        for position, image in self.tiles(rect):
+            painter.drawImage(position.topLeft(), image)
+        painter.end()
+
+        return output
+
+    def release(self):
+        """
+        drop the tiles and leave the memory report, call before another store
+        replaces this one
+        """
+        with self._lock:
+            self._tiles.clear()
+            self._tile_bytes = 0
+
+        if self.is_downsampled():
+            unregister_cache("image tiles")
@@ -0,0 +1,171 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Opt-in timing of functions with rolling percentiles. Instrumentation is
+enabled by setting the environment variable REGIONSELECTION_INSTRUMENT=1
+before the application starts; when it is not set the timed decorator
+returns the function unchanged, so there is no overhead.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import os
+import csv
+import json
+import time
+import functools
+from collections import deque
+
+## True if instrumentation was requested, read once when the module is imported
+ENABLED = os.environ.get("REGIONSELECTION_INSTRUMENT", "0") not in ("", "0")
+
+## the number of most recent samples kept for each name
+WINDOW = 1000
+
+## the percentiles reported
+PERCENTILES = (50, 90, 99)
+
+class RollingStats():
+    """
+    the most recent samples of one measurement
+    """
+
+    def __init__(self, window=WINDOW):
+        """
+        set up an empty store
+
+            Args:
+                window (int) the number of samples kept
+        """
+        ## the recent samples in seconds
+        self._samples = deque(maxlen=window)
+
+        ## total number of samples ever added
+        self._count = 0
+
+    def add(self, value):
+        """
+        add a sample
+
+            Args:
+                value (float) the sample in seconds
+        """
+        self._samples.append(value)
+        self._count += 1
+
+    @property
+    def count(self):
+        """
+        getter for the total number of samples ever added
+        """
+        return self._count
+
+    def percentiles(self, percentiles=PERCENTILES):
+        """
+        the percentiles of the recent samples, nearest rank
+
+            Args:
+                percentiles ([int]) the percentiles required
+
+            Returns:
+                (dict) percentile to value in seconds, empty if there are no samples
+        """
+        ordered = sorted(self._samples)
+        if len(ordered) == 0:
+            return {}
+
+        last = len(ordered) - 1
+        return {percentile: ordered[min(last, (percentile*len(ordered))//100)]
+                for percentile in percentiles}
+
+## the measurements, name to RollingStats
+_STATS = {}
+
+def record(name, value):
+    """
+    add a sample to a named measurement
+
+        Args:
+            name (string) the measurement name
+            value (float) the sample in seconds
+    """
+    stats = _STATS.get(name)
+    if stats is None:
+        stats = _STATS[name] = RollingStats()
+    stats.add(value)
+
+def timed(name):
+    """
+    decorator timing each call of a function, if instrumentation is not
+    enabled the function is returned unchanged
+
+        Args:
+            name (string) the measurement name
+
+        Returns:
+            the decorator
+    """
+    def decorator(function):
+        if not ENABLED:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+def summary():
+    """
+    the current percentiles of all measurements
+
+        Returns:
+            (dict) name to dict with count and percentiles, in milliseconds, as pNN
+    """
+    output = {}
+    for name, stats in sorted(_STATS.items()):
+        entry = {"count": stats.count}
+        for percentile, value in stats.percentiles().items():
+            entry[f"p{percentile}"] = value*1000.0
+        output[name] = entry
+
+    return output
+
+def dump(file_path):
+    """
+    write the summary to a file, csv if the name ends .csv else JSON
+
+        Args:
+            file_path (string) the output file
+    """
+    data = summary()
+
+    if file_path.lower().endswith(".csv"):
+        columns = ["count"] + [f"p{percentile}" for percentile in PERCENTILES]
+        with open(file_path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(["name"] + columns)
+            for name, entry in data.items():
+                writer.writerow([name] + [entry.get(column, '') for column in columns])
+    else:
+        with open(file_path, 'w') as file:
+            json.dump(data, file, indent=2)
@@ -0,0 +1,158 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+A static centred interval tree, answering which intervals contain a point in
+O(log N + k) time for k results.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import numpy as np
+
+class _Node():
+    """
+    a node of the tree, holding the intervals that contain its centre
+    """
+    __slots__ = ("centre", "starts", "by_start", "ends", "by_end", "left", "right")
+
+    def __init__(self, centre, indices, starts, ends):
+        """
+        make a node
+
+            Args:
+                centre (int) the node's centre
+                indices (numpy.array) the intervals containing the centre
+                starts (numpy.array) start of every interval
+                ends (numpy.array) end of every interval
+        """
+        ## the centre point
+        self.centre = centre
+
+        order = np.argsort(starts[indices], kind="stable")
+        ## the intervals sorted by increasing start
+        self.by_start = indices[order]
+        ## the sorted starts
+        self.starts = starts[self.by_start]
+
+        order = np.argsort(-ends[indices], kind="stable")
+        ## the intervals sorted by decreasing end
+        self.by_end = indices[order]
+        ## the sorted ends, negated so they increase
+        self.ends = -ends[self.by_end]
+
+        ## subtree of intervals wholly before the centre
+        self.left = None
+
+        ## subtree of intervals wholly after the centre
+        self.right = None
+
+class IntervalIndex():
+    """
+    index of closed intervals [start, end], built once and then queried
+    """
+
+    def __init__(self, starts, ends):
+        """
+        build the index
+
+            Args:
+                starts (numpy.array) interval starts
+                ends (numpy.array) interval ends, each >= its start
+        """
+        ## interval starts
+        self._starts = np.asarray(starts, dtype=np.int64)
+
+        ## interval ends
+        self._ends = np.asarray(ends, dtype=np.int64)
+
+        ## the root of the tree
+        self._root = None
+
+        indices = np.arange(len(self._starts))
+        if len(indices) > 0:
+            self._root = self._build(indices)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def _build(self, indices):
+        """
+        build the tree iteratively, to avoid deep recursion
+
+            Args:
+                indices (numpy.array) all the intervals
+
+            Returns:
+                (_Node) the root
+        """
+        root = None
+        stack = [(indices, None, None)]
+
+        while stack:
+            indices, parent, side = stack.pop()
+
+            # the median of the interval mid points balances the tree, it is
+            # itself a mid point so at least one interval contains it
+            mids = self._starts[indices] + (self._ends[indices] - self._starts[indices])//2
+            centre = int(np.partition(mids, len(mids)//2)[len(mids)//2])
+
+            before = self._ends[indices] < centre
+            after = self._starts[indices] > centre
+            here = ~(before | after)
+
+            node = _Node(centre, indices[here], self._starts, self._ends)
+            if parent is None:
+                root = node
+            else:
+                setattr(parent, side, node)
+
+            if np.any(before):
+                stack.append((indices[before], node, "left"))
+            if np.any(after):
+                stack.append((indices[after], node, "right"))
+
+        return root
+
+    def query(self, point):
+        """
+        find the intervals containing a point
+
+            Args:
+                point (int) the point
+
+            Returns:
+                (numpy.array) indices of the intervals, in no particular order
+        """
+        found = []
+        node = self._root
+
+        while node is not None:
+            if point < node.centre:
+                count = np.searchsorted(node.starts, point, side="right")
+                found.append(node.by_start[:count])
+                node = node.left
+            elif point > node.centre:
+                count = np.searchsorted(node.ends, -point, side="right")
+                found.append(node.by_end[:count])
+                node = node.right
+            else:
+                found.append(node.by_start)
+                node = None
+
+        if len(found) == 0:
+            return np.zeros(0, dtype=np.intp)
+
+        return np.concatenate(found)
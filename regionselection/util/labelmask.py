@@ -0,0 +1,282 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Conversion between regions and label masks, images in which each pixel holds
+the number of the region covering it, or zero. Masks are processed in bands of
+rows so a large mask never has to be held in memory at once.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+# set up linting conditions
+# pylint: disable = c-extension-no-member
+# pylint: disable = import-error
+
+import numpy as np
+import PyQt5.QtGui as qg
+
+from regionselection.util.drawrect import regions_to_array
+from regionselection.util.qimagearray import array_view, gray_view
+from regionselection.util.regionproposals import band_runs, connect_runs, BAND_ROWS
+
+## how overlaps are resolved, the later region, the earlier region or the smaller region wins
+OVERLAP_POLICIES = ("last", "first", "smallest")
+
+## image formats holding a label in each pixel
+_LABEL_FORMATS = (qg.QImage.Format_Grayscale8, qg.QImage.Format_Grayscale16)
+
+def _as_array(regions):
+    """
+    make sure regions are held as an (N, 4) array
+    """
+    if hasattr(regions, "shape"):
+        return regions
+    return regions_to_array(regions)
+
+def label_dtype(count):
+    """
+    the smallest unsigned type that can label a number of regions
+
+        Args:
+            count (int) the number of regions
+
+        Returns:
+            (numpy.dtype) uint16 or uint32
+    """
+    return np.dtype(np.uint16) if count <= np.iinfo(np.uint16).max else np.dtype(np.uint32)
+
+def overlap_ranks(regions, policy="last"):
+    """
+    the priority of each region where regions overlap, the highest rank wins
+
+        Args:
+            regions (numpy.array) (N, 4) array, columns top, bottom, left, right
+            policy (string) one of OVERLAP_POLICIES
+
+        Returns:
+            (numpy.array) int64 rank of each region, a permutation of 0 to N-1
+
+        Throws:
+            ValueError if the policy is unknown
+    """
+    count = len(regions)
+
+    if policy == "last":
+        return np.arange(count, dtype=np.int64)
+
+    if policy == "first":
+        return np.arange(count - 1, -1, -1, dtype=np.int64)
+
+    if policy == "smallest":
+        edges = regions[:, :4].astype(np.int64)
+        area = (edges[:, 1] - edges[:, 0])*(edges[:, 3] - edges[:, 2])
+        # sorted by decreasing area then by index, so the smallest and latest is last
+        order = np.lexsort((np.arange(count), -area))
+        ranks = np.empty(count, dtype=np.int64)
+        ranks[order] = np.arange(count)
+        return ranks
+
+    raise ValueError(f"unknown overlap policy {policy}, use one of {OVERLAP_POLICIES}")
+
+def rasterize_bands(regions, width, height, policy="last", dtype=None, band_rows=BAND_ROWS):
+    """
+    generator for the label mask of a set of regions, a band of rows at a
+    time, region i is labelled i + 1 and the background 0, the bottom and right
+    edges are exclusive and regions are clipped to the image
+
+        Args:
+            regions ([DrawRect] or numpy.array) the regions
+            width (int) the mask width
+            height (int) the mask height
+            policy (string) how overlaps are resolved, one of OVERLAP_POLICIES
+            dtype (numpy.dtype) the label type, None for the smallest that fits
+            band_rows (int) the number of rows in a band
+
+        Yields:
+            (int, numpy.array) the first row of the band, (rows, width) label array
+    """
+    regions = _as_array(regions)
+    dtype = label_dtype(len(regions)) if dtype is None else np.dtype(dtype)
+    if len(regions) > np.iinfo(dtype).max:
+        raise ValueError(f"{len(regions)} regions cannot be labelled with {dtype}")
+
+    edges = regions[:, :4].astype(np.int64)
+    np.clip(edges[:, :2], 0, height, out=edges[:, :2])
+    np.clip(edges[:, 2:], 0, width, out=edges[:, 2:])
+
+    # regions painted lowest rank first, so the highest ranked covering region wins
+    order = np.argsort(overlap_ranks(regions, policy), kind="stable")
+    edges = edges[order]
+    labels = (order + 1).astype(dtype)
+    has_area = edges[:, 3] > edges[:, 2]
+
+    for top in range(0, height, band_rows):
+        rows = min(band_rows, height - top)
+        band = np.zeros((rows, width), dtype=dtype)
+
+        # the rows of each region within the band
+        first = np.maximum(edges[:, 0], top) - top
+        last = np.minimum(edges[:, 1], top + rows) - top
+
+        for index in np.flatnonzero((last > first) & has_area).tolist():
+            band[first[index]:last[index], edges[index, 2]:edges[index, 3]] = labels[index]
+
+        yield top, band
+
+def export_mask(file_path, regions, width, height, policy="last", dtype=None,
+                band_rows=BAND_ROWS, progress=None):
+    """
+    write the label mask of a set of regions to a .npy file, band by band
+    through a memory map
+
+        Args:
+            file_path (string) the output .npy file
+            regions ([DrawRect] or numpy.array) the regions
+            width (int) the mask width
+            height (int) the mask height
+            policy (string) how overlaps are resolved, one of OVERLAP_POLICIES
+            dtype (numpy.dtype) the label type, None for the smallest that fits
+            band_rows (int) the number of rows in a band
+            progress (callable) called with (rows done, total rows) or None
+    """
+    regions = _as_array(regions)
+    dtype = label_dtype(len(regions)) if dtype is None else np.dtype(dtype)
+
+    output = np.lib.format.open_memmap(file_path, mode="w+", dtype=dtype, shape=(height, width))
+    try:
+        for top, band in rasterize_bands(regions, width, height, policy, dtype, band_rows):
+            output[top:top+len(band)] = band
+            if progress is not None:
+                progress(top + len(band), height)
+        output.flush()
+    finally:
+        del output
+
+def read_mask(file_path):
+    """
+    open a mask file, a .npy array is memory mapped, an image is read as
+    labels if it is 8 or 16 bit grayscale and otherwise as gray levels
+
+        Args:
+            file_path (string) a .npy file or an image file
+
+        Returns:
+            (numpy.array) (height, width) array
+
+        Throws:
+            ValueError if the file cannot be read
+    """
+    if file_path.lower().endswith(".npy"):
+        mask = np.load(file_path, mmap_mode="r")
+        if mask.ndim != 2:
+            raise ValueError(f"{file_path}: a mask must be two dimensional")
+        return mask
+
+    image = qg.QImage(file_path)
+    if image.isNull():
+        raise ValueError(f"{file_path}: cannot read the mask")
+
+    if image.format() in _LABEL_FORMATS:
+        return array_view(image)
+
+    return gray_view(image)
+
+def _mask_bands(mask, band_rows):
+    """
+    generator for a mask as bands of rows, copied from any memory map
+    """
+    for top in range(0, len(mask), band_rows):
+        yield top, np.asarray(mask[top:top+band_rows])
+
+def _foreground_runs(mask, band_rows):
+    """
+    the runs of non zero pixels of a mask, regardless of value
+
+        Returns:
+            (numpy.array, numpy.array, numpy.array) row, start and exclusive end of each run
+    """
+    runs = [band_runs(band != 0, top) for top, band in _mask_bands(mask, band_rows)]
+
+    return tuple(np.concatenate(parts) for parts in zip(*runs))
+
+def mask_to_regions(mask, binary=None, band_rows=BAND_ROWS):
+    """
+    the bounding boxes of the labels of a mask, for a binary mask the boxes of
+    its 8-connected components
+
+        Args:
+            mask (numpy.array) (height, width) array, zero is background
+            binary (bool) True to treat all non zero pixels as one class, None
+                          to decide by whether the mask has a single non zero value
+            band_rows (int) the number of rows processed at once
+
+        Returns:
+            (numpy.array) uint32 (N, 4) array, columns top, bottom, left, right,
+            in increasing label order, or in component order for a binary mask
+    """
+    all_rows = []
+    all_starts = []
+    all_ends = []
+    all_values = []
+    for top, band in _mask_bands(mask, band_rows):
+        # runs of equal non zero value, broken where the value changes
+        rows, width = band.shape
+        padded = np.zeros((rows, width + 2), dtype=band.dtype)
+        padded[:, 1:-1] = band
+        changes = padded[:, 1:] != padded[:, :-1]
+        change_rows, change_columns = np.nonzero(changes)
+        values = padded[change_rows, change_columns + 1]
+
+        # each change starts a run, which ends at the next change in its row
+        same_row = np.append(change_rows[1:] == change_rows[:-1], False)
+        starting = (values != 0) & same_row
+        ends = np.append(change_columns[1:], 0)
+
+        all_rows.append(change_rows[starting] + top)
+        all_starts.append(change_columns[starting])
+        all_ends.append(ends[starting])
+        all_values.append(values[starting])
+
+    if len(all_rows) == 0:
+        return np.zeros((0, 4), dtype=np.uint32)
+
+    rows = np.concatenate(all_rows)
+    starts = np.concatenate(all_starts)
+    ends = np.concatenate(all_ends)
+    values = np.concatenate(all_values)
+
+    if binary is None:
+        binary = len(values) == 0 or bool(np.all(values == values[0]))
+
+    if binary:
+        # a run of one value may still touch runs of another, join them by
+        # finding the runs of the foreground as a whole
+        if len(values) > 0 and not np.all(values == values[0]):
+            rows, starts, ends = _foreground_runs(mask, band_rows)
+        labels = connect_runs(rows, starts, ends, mask.shape[1])
+    else:
+        _, labels = np.unique(values, return_inverse=True)
+
+    components = int(labels.max()) + 1 if len(labels) > 0 else 0
+
+    boxes = np.empty((components, 4), dtype=np.int64)
+    boxes[:, [0, 2]] = np.iinfo(np.int64).max
+    boxes[:, [1, 3]] = -1
+    np.minimum.at(boxes[:, 0], labels, rows)
+    np.maximum.at(boxes[:, 1], labels, rows + 1)
+    np.minimum.at(boxes[:, 2], labels, starts)
+    np.maximum.at(boxes[:, 3], labels, ends)
+
+    return boxes.astype(np.uint32)
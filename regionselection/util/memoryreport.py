@@ -0,0 +1,183 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Accounting of the memory used by images, regions and caches, with
+checking against per subsystem budgets.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import sys
+import tracemalloc
+
+## registered caches, name to function returning the cache's size in bytes
+_CACHES = {}
+
+def register_cache(name, size_function):
+    """
+    register a cache so that it is included in memory reports
+
+        Args:
+            name (string) the name shown in reports
+            size_function (callable) no arguments, returns the cache size in bytes
+    """
+    _CACHES[name] = size_function
+
+def unregister_cache(name):
+    """
+    remove a cache from memory reports
+
+        Args:
+            name (string) the name given to register_cache
+    """
+    _CACHES.pop(name, None)
+
+def qimage_bytes(image):
+    """
+    the size of a QImage's pixel buffer
+
+        Args:
+            image (QImage) the image or None
+
+        Returns:
+            (int) bytes
+    """
+    if image is None or image.isNull():
+        return 0
+    return image.sizeInBytes()
+
+def qpixmap_bytes(pixmap):
+    """
+    the size of a QPixmap's pixel buffer, estimated from its size and depth
+
+        Args:
+            pixmap (QPixmap) the pixmap or None
+
+        Returns:
+            (int) bytes
+    """
+    if pixmap is None or pixmap.isNull():
+        return 0
+    return pixmap.width()*pixmap.height()*pixmap.depth()//8
+
+def regions_bytes(regions):
+    """
+    the size of a list of regions including the list, each region tuple and
+    each field object, objects shared between regions are counted once
+
+        Args:
+            regions ([DrawRect]) the regions
+
+        Returns:
+            (int) bytes
+    """
+    seen = set()
+    total = sys.getsizeof(regions)
+
+    for region in regions:
+        for item in (region, *region):
+            if id(item) not in seen:
+                seen.add(id(item))
+                total += sys.getsizeof(item)
+
+    return total
+
+def build_report(images=None, pixmaps=None, regions=None):
+    """
+    make a memory report
+
+        Args:
+            images (dict) name to QImage
+            pixmaps (dict) name to QPixmap
+            regions ([DrawRect]) the regions
+
+        Returns:
+            (dict) subsystem name to bytes, also "regions per region" the mean bytes
+            per region and, if tracemalloc is tracing, "python heap" and "python heap peak"
+    """
+    report = {}
+
+    for name, image in (images or {}).items():
+        report[name] = qimage_bytes(image)
+
+    for name, pixmap in (pixmaps or {}).items():
+        report[name] = qpixmap_bytes(pixmap)
+
+    if regions is not None:
+        report["regions"] = regions_bytes(regions)
+        report["regions per region"] = report["regions"]//max(1, len(regions))
+
+    for name, size_function in sorted(_CACHES.items()):
+        report[name] = size_function()
+
+    if tracemalloc.is_tracing():
+        report["python heap"], report["python heap peak"] = tracemalloc.get_traced_memory()
+
+    return report
+
+def over_budget(report, budgets):
+    """
+    find the subsystems using more than their budget
+
+        Args:
+            report (dict) as made by build_report
+            budgets (dict) subsystem name to budget in bytes, "total" is compared
+                           with the sum of images, pixmaps, regions and caches
+
+        Returns:
+            [(name, bytes, budget)]
+    """
+    excluded = ("regions per region", "python heap", "python heap peak")
+    used = dict(report)
+    used["total"] = sum(value for name, value in report.items() if name not in excluded)
+
+    return [(name, used[name], budget) for name, budget in sorted(budgets.items())
+            if name in used and used[name] > budget]
+
+def format_bytes(count):
+    """
+    a human readable size
+
+        Args:
+            count (int) bytes
+
+        Returns:
+            (string)
+    """
+    for unit in ("B", "KiB", "MiB"):
+        if count < 1024:
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1024.0
+
+    return f"{count:.1f} GiB"
+
+def format_report(report, budgets=None):
+    """
+    a human readable report
+
+        Args:
+            report (dict) as made by build_report
+            budgets (dict) subsystem name to budget in bytes, or None
+
+        Returns:
+            (string)
+    """
+    lines = [f"{name}: {format_bytes(value)}" for name, value in report.items()]
+
+    for name, value, budget in over_budget(report, budgets or {}):
+        lines.append(f"OVER BUDGET {name}: {format_bytes(value)} > {format_bytes(budget)}")
+
+    return "\n".join(lines)
@@ -0,0 +1,176 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+# set up linting conditions
+# pylint: disable = too-many-public-methods
+
+import os
+import numpy as np
+
+from regionselection.util.drawrect import regions_to_array, array_to_regions
+from regionselection.util.timerect import (frame_ranges, keyframes_to_array,
+                                           make_time_regions, is_time_dependent)
+from regionselection.util.fingerprint import image_fingerprint
+
+class ProjectBundle():
+    """
+    a project saved as a single numpy .npz archive holding the regions, the
+    project name and the path and fingerprint of the source image. The archive
+    members are only read when they are first accessed.
+    """
+    ## file type identification code
+    _MAGIC_CODE = "idp-01"
+
+    def __init__(self, file_path):
+        """
+        open a bundle for reading, only the archive directory is read
+
+            Args:
+                file_path (string) the bundle file path
+
+            Throws:
+                ValueError if the file is not a project bundle
+        """
+        ## the lazily loaded archive
+        self._archive = np.load(file_path, allow_pickle=False)
+
+        ## store the file path
+        self._file_path = file_path
+
+        if "magic" not in self._archive.files or self._string("magic") != self._MAGIC_CODE:
+            self._archive.close()
+            raise ValueError(f"{file_path} is not a project bundle")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        close the underlying archive
+        """
+        self._archive.close()
+
+    def _string(self, member):
+        """
+        read a string member of the archive
+
+            Args:
+                member (string) the member name
+
+            Returns:
+                (string) the member's value
+        """
+        return str(self._archive[member][()])
+
+    @property
+    def project(self):
+        """
+        getter for the project name
+        """
+        return self._string("project")
+
+    @property
+    def image_path(self):
+        """
+        getter for the stored path of the source image
+        """
+        return self._string("image_path")
+
+    @property
+    def fingerprint(self):
+        """
+        getter for the fingerprint of the source image
+        """
+        return self._string("fingerprint")
+
+    @property
+    def region_array(self):
+        """
+        getter for the regions as an (N, 4) uint32 array
+        """
+        return self._archive["regions"]
+
+    @property
+    def regions(self):
+        """
+        getter for the regions as a list, with their frame ranges and keyframes if stored
+
+            Returns:
+                [DrawRect]
+        """
+        regions = array_to_regions(self.region_array)
+
+        if "frames" not in self._archive.files:
+            return regions
+
+        frames = self._archive["frames"]
+        return make_time_regions(regions, frames[:, 0], frames[:, 1], self._archive["keyframes"])
+
+    def find_image(self):
+        """
+        find the source image, first at its stored path then alongside the
+        bundle, a candidate is only accepted if its fingerprint matches
+
+            Returns:
+                (string) path to the image or None if it cannot be found
+        """
+        stored = self.image_path
+        candidates = [stored,
+                      os.path.join(os.path.dirname(os.path.abspath(self._file_path)),
+                                   os.path.basename(stored))]
+
+        for candidate in candidates:
+            if os.path.isfile(candidate) and image_fingerprint(candidate) == self.fingerprint:
+                return candidate
+
+        return None
+
+    @staticmethod
+    def save(file_path, project, image_path, regions):
+        """
+        write a project bundle
+
+            Args:
+                file_path (string) the output file path, should end in .npz
+                project (string) the project name
+                image_path (string) path to the source image
+                regions ([DrawRect]) the regions
+        """
+        image_path = os.path.abspath(image_path)
+
+        members = {"magic": np.array(ProjectBundle._MAGIC_CODE),
+                   "project": np.array(project),
+                   "image_path": np.array(image_path),
+                   "fingerprint": np.array(image_fingerprint(image_path))}
+
+        if hasattr(regions, "shape"):
+            members["regions"] = regions
+        else:
+            members["regions"] = regions_to_array(regions)
+
+            # frame ranges are only stored if some region has a limited range or keyframes
+            if is_time_dependent(regions):
+                starts, ends = frame_ranges(regions)
+                members["frames"] = np.stack([starts, ends], axis=1)
+                members["keyframes"] = keyframes_to_array(regions)
+
+        with open(file_path, 'wb') as file:
+            np.savez(file, **members)
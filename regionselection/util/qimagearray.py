@@ -0,0 +1,250 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Read only numpy views of the pixels of QImages. A view is made through a
+QImageArray holder that keeps a reference to the QImage and is the base of
+the view, so the buffer lives at least as long as any array using it. Images
+in formats with no simple array layout are converted once, and the converted
+images are cached by cacheKey so repeated analyses of the same image share
+one conversion.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+# set up linting conditions
+# pylint: disable = c-extension-no-member
+# pylint: disable = import-error
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import PyQt5.QtGui as qg
+
+from regionselection.util.memoryreport import register_cache
+
+## the channel order of the 32 bit formats stored as native endian integers
+_NATIVE_ORDER = "BGRA" if sys.byteorder == "little" else "ARGB"
+
+## format name to (numpy type string, channels, channel order) of the directly viewable formats
+_LAYOUTS_BY_NAME = {
+    "Format_Grayscale8": ("|u1", 1, "L"),
+    "Format_Grayscale16": ("=u2", 1, "L"),
+    "Format_Alpha8": ("|u1", 1, "A"),
+    "Format_RGB888": ("|u1", 3, "RGB"),
+    "Format_BGR888": ("|u1", 3, "BGR"),
+    "Format_RGB32": ("|u1", 4, _NATIVE_ORDER),
+    "Format_ARGB32": ("|u1", 4, _NATIVE_ORDER),
+    "Format_ARGB32_Premultiplied": ("|u1", 4, _NATIVE_ORDER),
+    "Format_RGBX8888": ("|u1", 4, "RGBA"),
+    "Format_RGBA8888": ("|u1", 4, "RGBA"),
+    "Format_RGBA8888_Premultiplied": ("|u1", 4, "RGBA"),
+    "Format_RGBX64": ("=u2", 4, "RGBA"),
+    "Format_RGBA64": ("=u2", 4, "RGBA"),
+    "Format_RGBA64_Premultiplied": ("=u2", 4, "RGBA"),
+}
+
+## format to (numpy type string, channels, channel order), older Qt versions lack some formats
+LAYOUTS = {getattr(qg.QImage, name): layout
+           for name, layout in _LAYOUTS_BY_NAME.items() if hasattr(qg.QImage, name)}
+
+## the format other formats are converted to
+CANONICAL_FORMAT = qg.QImage.Format_RGBA8888
+
+## the bytes of converted images cached, REGIONSELECTION_CONVERSION_BUDGET in MiB overrides it
+CONVERSION_BUDGET = int(os.environ.get("REGIONSELECTION_CONVERSION_BUDGET", "256"))*1024*1024
+
+class QImageArray():
+    """
+    holder exposing a QImage's pixels through the numpy array interface,
+    numpy.asarray(holder) gives a read only view whose base is the holder
+    """
+
+    def __init__(self, image):
+        """
+        hold an image
+
+            Args:
+                image (QImage) the image, its format must be in LAYOUTS
+
+            Throws:
+                ValueError if the format has no array layout
+        """
+        if image.format() not in LAYOUTS:
+            raise ValueError(f"QImage format {image.format()} has no array layout")
+
+        ## the image, a shallow copy sharing the caller's buffer, so it cannot be
+        ## changed by the caller without Qt detaching the caller's copy
+        self._image = qg.QImage(image)
+
+    @property
+    def image(self):
+        """
+        getter for the held image
+        """
+        return self._image
+
+    @property
+    def channels(self):
+        """
+        getter for the channel order, for example "RGBA", of the last axis
+        """
+        return LAYOUTS[self._image.format()][2]
+
+    @property
+    def __array_interface__(self):
+        """
+        the numpy array interface, version 3
+        """
+        typestr, channels, _ = LAYOUTS[self._image.format()]
+        itemsize = np.dtype(typestr).itemsize
+        height = self._image.height()
+        width = self._image.width()
+
+        if channels == 1:
+            shape = (height, width)
+            strides = (self._image.bytesPerLine(), itemsize)
+        else:
+            shape = (height, width, channels)
+            strides = (self._image.bytesPerLine(), itemsize*channels, itemsize)
+
+        # constBits does not detach the shared buffer
+        return {"shape": shape,
+                "typestr": typestr,
+                "data": (int(self._image.constBits()), True),
+                "strides": strides,
+                "version": 3}
+
+class _ConversionCache():
+    """
+    converted images keyed by source cacheKey and target format, least recently
+    used first, evicted to keep their total size within a budget
+    """
+
+    def __init__(self, budget=CONVERSION_BUDGET):
+        """
+        make an empty cache
+
+            Args:
+                budget (int) the memory budget in bytes
+        """
+        ## (cacheKey, format) to converted QImage
+        self._images = OrderedDict()
+
+        ## the memory budget in bytes
+        self._budget = budget
+
+        ## the bytes held by the images
+        self._bytes = 0
+
+        ## lock protecting the images, analyses run in worker threads
+        self._lock = threading.Lock()
+
+        register_cache("image conversions", self.size_in_bytes)
+
+    def convert(self, image, image_format):
+        """
+        get an image in a format, converting at most once per source image while
+        it is cached, a conversion larger than the budget is not cached
+
+            Args:
+                image (QImage) the source
+                image_format (QImage.Format) the target format
+
+            Returns:
+                (QImage) the converted image
+        """
+        key = (image.cacheKey(), image_format)
+
+        with self._lock:
+            converted = self._images.get(key)
+            if converted is not None:
+                self._images.move_to_end(key)
+                return converted
+
+        converted = image.convertToFormat(image_format)
+        size = converted.sizeInBytes()
+        if size > self._budget:
+            return converted
+
+        with self._lock:
+            if key not in self._images:
+                self._images[key] = converted
+                self._bytes += size
+            while self._bytes > self._budget:
+                _, evicted = self._images.popitem(last=False)
+                self._bytes -= evicted.sizeInBytes()
+
+        return converted
+
+    def clear(self):
+        """
+        empty the cache
+        """
+        with self._lock:
+            self._images.clear()
+            self._bytes = 0
+
+    def size_in_bytes(self):
+        """
+        the memory used by the converted images
+        """
+        with self._lock:
+            return self._bytes
+
+## the shared conversion cache
+_CACHE = _ConversionCache()
+
+def array_view(image, image_format=None):
+    """
+    a read only view of an image's pixels, converted if necessary
+
+        Args:
+            image (QImage) the image
+            image_format (QImage.Format) the required format, None to accept the
+                         image's own format if it has an array layout, otherwise
+                         CANONICAL_FORMAT is used
+
+        Returns:
+            (numpy.array) (height, width) for single channel formats, else
+            (height, width, channels), see QImageArray.channels for the order
+    """
+    if image_format is None:
+        image_format = image.format() if image.format() in LAYOUTS else CANONICAL_FORMAT
+
+    if image.format() != image_format:
+        image = _CACHE.convert(image, image_format)
+
+    return np.asarray(QImageArray(image))
+
+def gray_view(image):
+    """
+    a read only uint8 (height, width) grayscale view of an image
+    """
+    return array_view(image, qg.QImage.Format_Grayscale8)
+
+def rgba_view(image):
+    """
+    a read only uint8 (height, width, 4) RGBA view of an image
+    """
+    return array_view(image, qg.QImage.Format_RGBA8888)
+
+def clear_conversions():
+    """
+    release the cached conversions
+    """
+    _CACHE.clear()
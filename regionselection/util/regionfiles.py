@@ -0,0 +1,183 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Reading and writing region files, csv and project bundles, without any
+dependence on the user interface.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import os
+import csv
+import numpy as np
+
+from regionselection.util.drawrect import regions_to_array, array_to_regions
+from regionselection.util.timerect import is_time_dependent
+from regionselection.util.projectbundle import ProjectBundle
+
+## the column headers of a regions csv file
+CSV_HEADER = ["top y", "bottom y", "left x", "right x"]
+
+## the image file extensions searched for when pairing images with region files
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+def parse_regions_csv(reader):
+    """
+    parse a csv file of regions, a project name row, a header row then one
+    row per region
+
+        Args:
+            reader (csv.reader) a ready to go csv file reader
+
+        Returns:
+            (string) the project name
+            (numpy.array) uint32 (N, 4) array, columns top, bottom, left, right
+
+        Throws:
+            ValueError if a coordinate is not a whole number or is negative
+    """
+    project = next(reader, ["No Name"])[0]
+
+    # pop the headers
+    next(reader, None)
+
+    rows = [row[:4] for row in reader if len(row) >= 4]
+    if len(rows) == 0:
+        return project, np.zeros((0, 4), dtype=np.uint32)
+
+    # parsed signed so negative values are reported rather than overflowing
+    regions = np.array(rows, dtype=np.int64)
+    negative = np.flatnonzero(regions.min(axis=1) < 0)
+    if len(negative) > 0:
+        raise ValueError(f"{len(negative)} regions have negative coordinates, "
+                         f"the first is region {negative[0] + 1}")
+
+    return project, regions.astype(np.uint32)
+
+def read_regions_csv(file_path):
+    """
+    read a csv file of regions
+
+        Args:
+            file_path (string) the file path
+
+        Returns:
+            (string) the project name
+            (numpy.array) uint32 (N, 4) array, columns top, bottom, left, right
+    """
+    with open(file_path, 'r', newline='') as file:
+        return parse_regions_csv(csv.reader(file))
+
+def write_regions_csv(file_path, project, regions):
+    """
+    write a csv file of regions
+
+        Args:
+            file_path (string) the file path
+            project (string) the project name
+            regions ([DrawRect] or numpy.array) the regions
+    """
+    if not hasattr(regions, "shape"):
+        regions = regions_to_array(regions)
+
+    with open(file_path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow([project])
+        writer.writerow(CSV_HEADER)
+        writer.writerows(regions.tolist())
+
+def read_regions(file_path):
+    """
+    read a region file of either type
+
+        Args:
+            file_path (string) a .csv file or an .npz project bundle
+
+        Returns:
+            (string) the project name
+            (numpy.array) uint32 (N, 4) array, columns top, bottom, left, right
+    """
+    if file_path.lower().endswith(".npz"):
+        with ProjectBundle(file_path) as bundle:
+            return bundle.project, bundle.region_array
+
+    return read_regions_csv(file_path)
+
+def read_region_list(file_path):
+    """
+    read a region file of either type as a list, keeping the frame ranges and
+    keyframes of a bundle's regions, use this if the regions are written back
+
+        Args:
+            file_path (string) a .csv file or an .npz project bundle
+
+        Returns:
+            (string) the project name
+            ([DrawRect]) the regions, TimeRect if they have frame ranges or keyframes
+    """
+    if file_path.lower().endswith(".npz"):
+        with ProjectBundle(file_path) as bundle:
+            return bundle.project, bundle.regions
+
+    project, regions = read_regions_csv(file_path)
+    return project, array_to_regions(regions)
+
+def write_regions(file_path, project, regions, image_path=None):
+    """
+    write a region file of either type, only a bundle can hold frame ranges
+    and keyframes
+
+        Args:
+            file_path (string) a .csv file or an .npz project bundle
+            project (string) the project name
+            regions ([DrawRect] or numpy.array) the regions
+            image_path (string) the source image, required for a bundle
+
+        Throws:
+            ValueError if a bundle is requested without an image, or a csv
+            file for regions that change between frames
+    """
+    if file_path.lower().endswith(".npz"):
+        if image_path is None:
+            raise ValueError(f"{file_path}: a project bundle needs an image")
+        ProjectBundle.save(file_path, project, image_path, regions)
+    else:
+        if not hasattr(regions, "shape") and is_time_dependent(regions):
+            raise ValueError(f"{file_path}: a csv file cannot hold frame ranges or keyframes")
+        write_regions_csv(file_path, project, regions)
+
+def find_image(file_path):
+    """
+    find the image for a region file, a bundle's own image or an image with
+    the same name alongside the file
+
+        Args:
+            file_path (string) a .csv file or an .npz project bundle
+
+        Returns:
+            (string) the image path or None if none is found
+    """
+    if file_path.lower().endswith(".npz"):
+        with ProjectBundle(file_path) as bundle:
+            return bundle.find_image()
+
+    stem = os.path.splitext(file_path)[0]
+    for extension in IMAGE_EXTENSIONS:
+        for candidate in (stem + extension, stem + extension.upper()):
+            if os.path.isfile(candidate):
+                return candidate
+
+    return None
@@ -0,0 +1,358 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Automatic proposal of regions: the image is thresholded and its connected
+foreground components found, the bounding boxes of components within a size
+range are proposed. The image is read through a grayscale view, without a
+copy for grayscale images, and processed in bands of rows so the working
+memory is bounded by the band size and the number of foreground runs.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+# set up linting conditions
+# pylint: disable = c-extension-no-member
+# pylint: disable = import-error
+
+import numpy as np
+import PyQt5.QtGui as qg
+
+from regionselection.util.qimagearray import array_view
+
+## the default number of rows processed at once
+BAND_ROWS = 512
+
+def gray_bands(image, band_rows=BAND_ROWS):
+    """
+    generator for an image as bands of grayscale rows, an image in another
+    format is converted a band at a time so no full size copy is made
+
+        Args:
+            image (QImage) the image
+            band_rows (int) the number of rows in a band
+
+        Yields:
+            (int, numpy.array) the first row of the band, read only uint8 (rows, width) view
+    """
+    if image.format() == qg.QImage.Format_Grayscale8:
+        pixels = array_view(image)
+        for top in range(0, image.height(), band_rows):
+            yield top, pixels[top:top+band_rows]
+        return
+
+    for top in range(0, image.height(), band_rows):
+        band = image.copy(0, top, image.width(), min(band_rows, image.height() - top))
+        yield top, array_view(band.convertToFormat(qg.QImage.Format_Grayscale8))
+
+def otsu_threshold(histogram):
+    """
+    the threshold maximising the between class variance of a histogram
+
+        Args:
+            histogram (numpy.array) 256 bin histogram
+
+        Returns:
+            (int) the threshold, pixels > threshold are one class
+    """
+    histogram = histogram.astype(np.float64)
+    levels = np.arange(len(histogram))
+
+    weight_low = np.cumsum(histogram)
+    weight_high = weight_low[-1] - weight_low
+    sum_low = np.cumsum(histogram*levels)
+    sum_high = sum_low[-1] - sum_low
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = weight_low*weight_high*(sum_low/weight_low - sum_high/weight_high)**2
+
+    # an image of one gray level has no second class, everything is background
+    if np.all(np.isnan(variance)):
+        occupied = np.flatnonzero(histogram)
+        return int(occupied[-1]) if len(occupied) > 0 else 0
+
+    return int(np.nanargmax(variance))
+
+def band_runs(mask, top):
+    """
+    find the horizontal runs of foreground in a band
+
+        Args:
+            mask (numpy.array) boolean (rows, width) array
+            top (int) the image row of the band's first row
+
+        Returns:
+            (numpy.array, numpy.array, numpy.array) row, start and exclusive end of
+            each run, in row then column order
+    """
+    rows, width = mask.shape
+    padded = np.zeros((rows, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+
+    changes = np.diff(padded, axis=1)
+    start_rows, starts = np.nonzero(changes == 1)
+    _, ends = np.nonzero(changes == -1)
+
+    return start_rows + top, starts, ends
+
+def touching_runs(rows, starts, ends, width):
+    """
+    find the pairs of 8-connected runs in consecutive rows
+
+        Args:
+            rows (numpy.array) the row of each run, in row then column order
+            starts (numpy.array) the start of each run
+            ends (numpy.array) the exclusive end of each run
+            width (int) the image width
+
+        Returns:
+            (numpy.array, numpy.array) the indices of the runs in the upper and lower rows
+    """
+    # keys increase monotonically over all runs, rows are separated by the stride
+    stride = width + 2
+    start_keys = rows*stride + starts
+    end_keys = rows*stride + ends
+
+    # run b touches run a in the previous row if a.start <= b.end and a.end >= b.start
+    base = (rows - 1)*stride
+    low = np.searchsorted(end_keys, base + starts, side="left")
+    high = np.searchsorted(start_keys, base + ends, side="right")
+    counts = np.maximum(high - low, 0)
+
+    total = int(counts.sum())
+    second = np.repeat(np.arange(len(rows)), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    first = np.repeat(low, counts) + offsets
+
+    return first, second
+
+def join_labels(count, first, second):
+    """
+    union find over pairs of items, each item labelled by the smallest item it is joined to
+
+        Args:
+            count (int) the number of items
+            first (numpy.array) one item of each joining pair
+            second (numpy.array) the other item of each pair
+
+        Returns:
+            (numpy.array) the root of each item
+    """
+    # hook the larger root of each joining pair onto the smaller then compress
+    # the paths, repeated until all pairs share a root
+    labels = np.arange(count)
+    while len(first) > 0:
+        root_first = labels[first]
+        root_second = labels[second]
+        joining = root_first != root_second
+        first = first[joining]
+        second = second[joining]
+        root_first = root_first[joining]
+        root_second = root_second[joining]
+
+        np.minimum.at(labels,
+                      np.maximum(root_first, root_second),
+                      np.minimum(root_first, root_second))
+
+        while True:
+            compressed = labels[labels]
+            if np.array_equal(compressed, labels):
+                break
+            labels = compressed
+
+    return labels
+
+def connect_runs(rows, starts, ends, width):
+    """
+    label the runs by 8-connected component
+
+        Args:
+            rows (numpy.array) the row of each run
+            starts (numpy.array) the start of each run
+            ends (numpy.array) the exclusive end of each run
+            width (int) the image width
+
+        Returns:
+            (numpy.array) component label of each run, 0 to number of components - 1
+    """
+    count = len(rows)
+    if count == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    first, second = touching_runs(rows, starts, ends, width)
+    labels = join_labels(count, first, second)
+
+    return np.unique(labels, return_inverse=True)[1]
+
+class _ComponentBoxes():
+    """
+    the bounding boxes and areas of the components of a stream of bands of
+    runs, only the runs of the last row of the previous band are kept, with the
+    components they belong to, and a component is finished once no run of the
+    last row belongs to it
+    """
+
+    def __init__(self, width):
+        """
+        start with no components
+
+            Args:
+                width (int) the image width
+        """
+        ## the image width
+        self._width = width
+
+        ## the start, exclusive end and open component of each run in the last row
+        self._boundary = (np.zeros(0, dtype=np.int64),
+                          np.zeros(0, dtype=np.int64),
+                          np.zeros(0, dtype=np.int64))
+
+        ## int64 (M, 5) array, top, bottom, left, right and area of each open component
+        self._open = np.zeros((0, 5), dtype=np.int64)
+
+        ## the (K, 5) arrays of the finished components
+        self._finished = []
+
+    def add_band(self, rows, starts, ends, top, last_row):
+        """
+        add the runs of the next band
+
+            Args:
+                rows (numpy.array) the image row of each run, in row then column order
+                starts (numpy.array) the start of each run
+                ends (numpy.array) the exclusive end of each run
+                top (int) the image row of the band's first row
+                last_row (int) the image row of the band's last row
+        """
+        carried_starts, carried_ends, carried = self._boundary
+        count = len(carried)
+
+        # the boundary runs go first, a row above the band
+        all_rows = np.concatenate([np.full(count, top - 1), rows]).astype(np.int64)
+        all_starts = np.concatenate([carried_starts, starts]).astype(np.int64)
+        all_ends = np.concatenate([carried_ends, ends]).astype(np.int64)
+
+        first, second = touching_runs(all_rows, all_starts, all_ends, self._width)
+
+        # boundary runs of one open component are joined even if the band does not join them
+        order = np.argsort(carried, kind="stable")
+        same = np.flatnonzero(carried[order][1:] == carried[order][:-1])
+        first = np.concatenate([first, order[same]])
+        second = np.concatenate([second, order[same + 1]])
+
+        roots = join_labels(len(all_rows), first, second)
+        components, labels = np.unique(roots, return_inverse=True)
+        boxes = np.empty((len(components), 5), dtype=np.int64)
+        boxes[:, [0, 2]] = np.iinfo(np.int64).max
+        boxes[:, [1, 3]] = -1
+        boxes[:, 4] = 0
+
+        # the band's runs, then the open components the boundary runs belong to
+        band_labels = labels[count:]
+        np.minimum.at(boxes[:, 0], band_labels, all_rows[count:])
+        np.maximum.at(boxes[:, 1], band_labels, all_rows[count:] + 1)
+        np.minimum.at(boxes[:, 2], band_labels, all_starts[count:])
+        np.maximum.at(boxes[:, 3], band_labels, all_ends[count:])
+        np.add.at(boxes[:, 4], band_labels, all_ends[count:] - all_starts[count:])
+
+        carried_components, first_run = np.unique(carried, return_index=True)
+        carried_labels = labels[first_run]
+        previous = self._open[carried_components]
+        np.minimum.at(boxes[:, 0], carried_labels, previous[:, 0])
+        np.maximum.at(boxes[:, 1], carried_labels, previous[:, 1])
+        np.minimum.at(boxes[:, 2], carried_labels, previous[:, 2])
+        np.maximum.at(boxes[:, 3], carried_labels, previous[:, 3])
+        np.add.at(boxes[:, 4], carried_labels, previous[:, 4])
+
+        # components with runs in the band's last row stay open
+        on_boundary = np.flatnonzero(all_rows[count:] == last_row) + count
+        open_flags = np.zeros(len(components), dtype=bool)
+        open_flags[labels[on_boundary]] = True
+        open_labels = np.flatnonzero(open_flags)
+
+        renumber = np.full(len(components), -1, dtype=np.int64)
+        renumber[open_labels] = np.arange(len(open_labels))
+
+        self._finished.append(boxes[~open_flags])
+        self._open = boxes[open_labels]
+        self._boundary = (all_starts[on_boundary],
+                          all_ends[on_boundary],
+                          renumber[labels[on_boundary]])
+
+    def boxes(self):
+        """
+        finish the open components and get all the components
+
+            Returns:
+                (numpy.array) int64 (N, 5) array, top, bottom, left, right and
+                area, ordered by top then left
+        """
+        self._finished.append(self._open)
+        self._open = np.zeros((0, 5), dtype=np.int64)
+        self._boundary = (self._open[:, 0], self._open[:, 0], self._open[:, 0])
+
+        boxes = np.concatenate(self._finished)
+        return boxes[np.lexsort((boxes[:, 2], boxes[:, 0]))]
+
+def propose_regions(image, threshold=None, bright=True, min_area=25, max_area=None,
+                    band_rows=BAND_ROWS, progress=None):
+    """
+    propose regions bounding the connected foreground components of an image
+
+        Args:
+            image (QImage) the image
+            threshold (int) gray level threshold, if None it is found by Otsu's method
+            bright (bool) if True the foreground is above the threshold else below
+            min_area (int) the smallest component area, in pixels, proposed
+            max_area (int) the largest component area proposed, None for no limit
+            band_rows (int) the number of rows processed at once
+            progress (callable) called with (rows done, total rows) or None, if
+                               the threshold is found the rows are read twice so
+                               the total is twice the height
+
+        Returns:
+            (numpy.array) uint32 (N, 4) array, columns top, bottom, left, right
+    """
+    height = image.height()
+
+    # rows read before the labelling pass, and the rows read in all
+    done = 0
+    total = height if threshold is not None else 2*height
+
+    if threshold is None:
+        histogram = np.zeros(256, dtype=np.int64)
+        for top, pixels in gray_bands(image, band_rows):
+            histogram += np.bincount(pixels.ravel(), minlength=256)
+            if progress is not None:
+                progress(top + len(pixels), total)
+        threshold = otsu_threshold(histogram)
+        done = height
+
+    # each band is labelled as it is read, only the open components are carried over
+    components = _ComponentBoxes(image.width())
+    for top, pixels in gray_bands(image, band_rows):
+        mask = pixels > threshold if bright else pixels <= threshold
+        components.add_band(*band_runs(mask, top), top, top + len(pixels) - 1)
+
+        if progress is not None:
+            progress(done + top + len(pixels), total)
+
+    boxes = components.boxes()
+    area = boxes[:, 4]
+
+    keep = area >= min_area
+    if max_area is not None:
+        keep &= area <= max_area
+
+    return boxes[keep, :4].astype(np.uint32)
@@ -0,0 +1,209 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Offscreen rendering of an image annotated with its regions, at native or any
+other scale, independent of any widget. Large outputs can be rendered as tiles
+in parallel and streamed to a numpy .npy file.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+# set up linting conditions
+# pylint: disable = c-extension-no-member
+# pylint: disable = import-error
+
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+
+import PyQt5.QtGui as qg
+import PyQt5.QtCore as qc
+
+from regionselection.util.drawrect import regions_to_array
+from regionselection.util.regionstyle import region_pen, region_brush
+from regionselection.util.qimagearray import QImageArray
+
+## the default edge length of a tile in output pixels
+TILE_SIZE = 1024
+
+def output_size(image, scale):
+    """
+    the size of a rendering of an image at a given scale
+
+        Args:
+            image (QImage) the source image
+            scale (float) the scale factor
+
+        Returns:
+            (QSize)
+    """
+    return qc.QSize(max(1, int(round(image.width()*scale))),
+                    max(1, int(round(image.height()*scale))))
+
+def _as_array(regions):
+    """
+    make sure regions are held as an (N, 4) array
+    """
+    if hasattr(regions, "shape"):
+        return regions
+    return regions_to_array(regions)
+
+def render_tile(image, regions, tile, scale=1.0):
+    """
+    render one rectangle of the annotated output
+
+        Args:
+            image (QImage) the source image
+            regions ([DrawRect] or numpy.array) the regions in image coordinates
+            tile (QRect) the part of the output to be rendered, output coordinates
+            scale (float) the output to image scale factor
+
+        Returns:
+            (QImage) of size tile.size(), format ARGB32_Premultiplied
+    """
+    regions = _as_array(regions)
+
+    output = qg.QImage(tile.size(), qg.QImage.Format_ARGB32_Premultiplied)
+    output.fill(qc.Qt.transparent)
+
+    painter = qg.QPainter(output)
+    painter.setRenderHint(qg.QPainter.SmoothPixmapTransform, scale != 1.0)
+
+    source = qc.QRectF(tile.x()/scale, tile.y()/scale, tile.width()/scale, tile.height()/scale)
+    painter.drawImage(qc.QRectF(0, 0, tile.width(), tile.height()), image, source)
+
+    # only the regions that overlap the tile, arrays columns are top, bottom, left, right
+    if len(regions) > 0:
+        overlap = ((regions[:, 2] <= source.right()) & (regions[:, 3] >= source.left()) &
+                   (regions[:, 0] <= source.bottom()) & (regions[:, 1] >= source.top()))
+        painter.translate(-tile.x(), -tile.y())
+
+        # the outlines are dashed as paths, before clipping, as the painter would
+        # restart the dashes at the tile's edges and tiles would not join up
+        pen = region_pen()
+        stroker = qg.QPainterPathStroker()
+        stroker.setWidth(1)
+        stroker.setCapStyle(qc.Qt.FlatCap)
+        stroker.setDashPattern(pen.style())
+        brush = region_brush()
+
+        for top, bottom, left, right in regions[overlap].tolist():
+            rect = qc.QRectF(left*scale, top*scale, (right-left)*scale, (bottom-top)*scale)
+            painter.fillRect(rect, brush)
+
+            # half pixel offset so that the one pixel outline covers whole pixels
+            outline = qg.QPainterPath()
+            outline.addRect(rect.translated(0.5, 0.5))
+            painter.fillPath(stroker.createStroke(outline), pen.brush())
+
+    painter.end()
+
+    return output
+
+def render_regions(image, regions, scale=1.0):
+    """
+    render the whole annotated image in one piece
+
+        Args:
+            image (QImage) the source image
+            regions ([DrawRect] or numpy.array) the regions in image coordinates
+            scale (float) the output to image scale factor
+
+        Returns:
+            (QImage)
+    """
+    return render_tile(image, regions, qc.QRect(qc.QPoint(0, 0), output_size(image, scale)), scale)
+
+def qimage_to_array(image):
+    """
+    view a QImage as a numpy array, the image is converted, but not copied again
+
+        Args:
+            image (QImage) the image
+
+        Returns:
+            (numpy.array) read only uint8 array shape (height, width, 4) in RGBA order
+    """
+    # a rendered tile is used once, so its conversion is not cached
+    return np.asarray(QImageArray(image.convertToFormat(qg.QImage.Format_RGBA8888)))
+
+def make_tiles(size, tile_size=TILE_SIZE):
+    """
+    divide an output into tiles
+
+        Args:
+            size (QSize) the size of the output
+            tile_size (int) the maximum edge length of a tile
+
+        Returns:
+            [QRect] the tiles in row major order
+    """
+    return [qc.QRect(x, y, min(tile_size, size.width()-x), min(tile_size, size.height()-y))
+            for y in range(0, size.height(), tile_size)
+            for x in range(0, size.width(), tile_size)]
+
+def render_tiled(image, regions, file_path, scale=1.0, tile_size=TILE_SIZE, workers=None):
+    """
+    render the annotated image tile by tile, in a pool of threads, writing each
+    tile to a memory mapped .npy file as it completes, so the output never has
+    to be held in memory
+
+        Args:
+            image (QImage) the source image
+            regions ([DrawRect] or numpy.array) the regions in image coordinates
+            file_path (string) the output .npy file, uint8 (height, width, 4) RGBA
+            scale (float) the output to image scale factor
+            tile_size (int) the maximum edge length of a tile
+            workers (int) the number of threads, None for one per cpu
+
+        Returns:
+            (QSize) the size of the output
+    """
+    regions = _as_array(regions)
+    size = output_size(image, scale)
+
+    output = np.lib.format.open_memmap(file_path,
+                                       mode='w+',
+                                       dtype=np.uint8,
+                                       shape=(size.height(), size.width(), 4))
+
+    def work(tile):
+        return tile, qimage_to_array(render_tile(image, regions, tile, scale))
+
+    def store(future):
+        tile, pixels = future.result()
+        output[tile.y():tile.y()+tile.height(), tile.x():tile.x()+tile.width()] = pixels
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # bound the number of tiles in flight so finished tiles do not accumulate
+        limit = 2*workers
+        pending = set()
+        for tile in make_tiles(size, tile_size):
+            if len(pending) >= limit:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    store(future)
+            pending.add(executor.submit(work, tile))
+
+        for future in pending:
+            store(future)
+
+    output.flush()
+    del output
+
+    return size
@@ -0,0 +1,66 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+# set up linting conditions
+# pylint: disable = c-extension-no-member
+# pylint: disable = import-error
+
+import PyQt5.QtGui as qg
+import PyQt5.QtCore as qc
+
+def region_pen():
+    """
+    the pen used to outline regions
+
+        Returns:
+            QPen
+    """
+    pen = qg.QPen(qg.QColor(qc.Qt.black), 1, qc.Qt.DashLine)
+    pen.setCosmetic(True)
+    return pen
+
+def region_brush():
+    """
+    the brush used to fill regions
+
+        Returns:
+            QBrush
+    """
+    return qg.QBrush(qg.QColor(255, 255, 255, 120))
+
+def selected_pen():
+    """
+    the pen used to outline the selected region
+
+        Returns:
+            QPen
+    """
+    pen = qg.QPen(qg.QColor(qc.Qt.red), 2, qc.Qt.SolidLine)
+    pen.setCosmetic(True)
+    return pen
+
+def pending_pen():
+    """
+    the pen used to outline regions drawn in rapid mode but not yet accepted
+
+        Returns:
+            QPen
+    """
+    pen = qg.QPen(qg.QColor(qc.Qt.blue), 1, qc.Qt.DashLine)
+    pen.setCosmetic(True)
+    return pen
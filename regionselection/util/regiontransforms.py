@@ -0,0 +1,140 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Geometric transforms of many regions at once, the vectorised counterparts of
+DrawRect.shift, DrawRect.scale and DrawRect.reshape, applied to the rectangles
+and keyframes of a list of regions in one computation.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import numpy as np
+
+from regionselection.util.drawrect import regions_to_array, array_to_regions
+from regionselection.util.timerect import frame_ranges, keyframes_to_array, make_time_regions
+
+def _clip(edges, width, height):
+    """
+    clamp int64 edges, columns top, bottom, left, right, at zero and, if
+    given, the image size, and convert to uint32
+    """
+    np.maximum(edges, 0, out=edges)
+    if height is not None:
+        np.minimum(edges[:, :2], height, out=edges[:, :2])
+    if width is not None:
+        np.minimum(edges[:, 2:], width, out=edges[:, 2:])
+
+    return edges.astype(np.uint32)
+
+def move_regions(regions, x_shift, y_shift, width=None, height=None):
+    """
+    shift regions, edges moved past zero or the image are clamped, as DrawRect.shift
+
+        Args:
+            regions (numpy.array) (N, 4) array, columns top, bottom, left, right
+            x_shift (int) the horizontal shift, may be negative
+            y_shift (int) the vertical shift, may be negative
+            width (int) the image width or None
+            height (int) the image height or None
+
+        Returns:
+            (numpy.array) uint32 (N, 4) array
+    """
+    edges = regions[:, :4].astype(np.int64)
+    edges += (y_shift, y_shift, x_shift, x_shift)
+
+    return _clip(edges, width, height)
+
+def scale_regions(regions, x_factor, y_factor=None, about_centre=False,
+                  width=None, height=None):
+    """
+    scale regions, about the image origin as DrawRect.scale and DrawRect.reshape,
+    or about the centre of each region to resize them in place
+
+        Args:
+            regions (numpy.array) (N, 4) array, columns top, bottom, left, right
+            x_factor (float) the horizontal scale factor
+            y_factor (float) the vertical scale factor, None for x_factor
+            about_centre (bool) if True each region keeps its centre
+            width (int) the image width or None
+            height (int) the image height or None
+
+        Returns:
+            (numpy.array) uint32 (N, 4) array
+
+        Throws:
+            ValueError if a factor is negative
+    """
+    y_factor = x_factor if y_factor is None else y_factor
+    if x_factor < 0 or y_factor < 0:
+        raise ValueError("scale factors cannot be negative")
+
+    edges = regions[:, :4].astype(np.float64)
+    factors = np.array([y_factor, y_factor, x_factor, x_factor])
+
+    if about_centre:
+        centres = np.repeat((edges[:, 0::2] + edges[:, 1::2])/2.0, 2, axis=1)
+        edges = centres + (edges - centres)*factors
+    else:
+        edges *= factors
+
+    return _clip(np.round(edges).astype(np.int64), width, height)
+
+def resample_regions(regions, old_size, new_size):
+    """
+    re-project regions drawn on an image of one size onto the same image
+    resampled to another size
+
+        Args:
+            regions (numpy.array) (N, 4) array, columns top, bottom, left, right
+            old_size ((int, int)) the width and height the regions were drawn on
+            new_size ((int, int)) the width and height of the resampled image
+
+        Returns:
+            (numpy.array) uint32 (N, 4) array
+
+        Throws:
+            ValueError if a size is not positive
+    """
+    if min(*old_size, *new_size) <= 0:
+        raise ValueError("image sizes must be positive")
+
+    return scale_regions(regions,
+                         new_size[0]/old_size[0],
+                         new_size[1]/old_size[1],
+                         width=new_size[0],
+                         height=new_size[1])
+
+def transform_regions(regions, transform):
+    """
+    apply a transform to the rectangles and keyframes of a list of regions,
+    keeping their frame ranges
+
+        Args:
+            regions ([DrawRect]) the regions, a mixture of DrawRect and TimeRect
+            transform (callable) maps an (N, 4) array to a uint32 (N, 4) array
+
+        Returns:
+            ([DrawRect]) the transformed regions
+    """
+    rectangles = array_to_regions(transform(regions_to_array(regions)))
+
+    starts, ends = frame_ranges(regions)
+    keyframes = keyframes_to_array(regions)
+    if len(keyframes) > 0:
+        keyframes[:, 2:] = transform(keyframes[:, 2:])
+
+    return make_time_regions(rectangles, starts, ends, keyframes)
@@ -0,0 +1,285 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Checks of region coordinates against the size of their image, applied to a
+whole (N, 4) array of regions at once.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from regionselection.util.drawrect import regions_to_array
+from regionselection.util.timerect import keyframes_to_array
+
+## flag bit, the top edge is below the bottom edge
+INVERTED_ROWS = 1
+
+## flag bit, the left edge is right of the right edge
+INVERTED_COLUMNS = 2
+
+## flag bit, an edge is below the bottom of the image
+BEYOND_HEIGHT = 4
+
+## flag bit, an edge is right of the right side of the image
+BEYOND_WIDTH = 8
+
+## flag bit, an edge is negative, only possible in signed arrays
+NEGATIVE = 16
+
+## the repair policies, flag only, swap inverted edges, or swap and clip to the image
+POLICIES = ("flag", "swap", "clamp")
+
+## the result of a validation pass
+##
+## Args:
+##
+##     total (int) the number of regions checked
+##
+##     invalid (int) the number of regions with any flag set
+##
+##     inverted (int) the number of regions with swapped edges
+##
+##     outside (int) the number of regions extending beyond the image
+##
+##     negative (int) the number of regions with negative edges
+##
+##     repaired (int) the number of regions changed by the repair
+##
+##     policy (string) the repair policy applied
+##
+##     dropped (int) the number of regions removed because repair left them empty
+ValidationReport = namedtuple("ValidationReport",
+                              "total, invalid, inverted, outside, negative, repaired, "
+                              "policy, dropped",
+                              defaults=(0,))
+
+def validate_regions(regions, width, height):
+    """
+    flag the problems of each region, only the first four columns are checked
+    so arrays with extra columns, such as frame ranges, can be passed
+
+        Args:
+            regions (numpy.array) (N, 4+) array, columns top, bottom, left, right
+            width (int) the image width
+            height (int) the image height
+
+        Returns:
+            (numpy.array) uint8 array of flag bits, zero for each valid region
+    """
+    top, bottom, left, right = regions[:, :4].T
+
+    flags = np.zeros(len(regions), dtype=np.uint8)
+    flags[top > bottom] |= INVERTED_ROWS
+    flags[left > right] |= INVERTED_COLUMNS
+    flags[np.maximum(top, bottom) > height] |= BEYOND_HEIGHT
+    flags[np.maximum(left, right) > width] |= BEYOND_WIDTH
+
+    if np.issubdtype(regions.dtype, np.signedinteger):
+        flags[regions[:, :4].min(axis=1) < 0] |= NEGATIVE
+
+    return flags
+
+def make_report(flags, repaired, policy, dropped=0):
+    """
+    count the problems found by validate_regions
+
+        Args:
+            flags (numpy.array) the flags made by validate_regions
+            repaired (int) the number of regions changed
+            policy (string) the repair policy applied
+            dropped (int) the number of regions removed
+
+        Returns:
+            (ValidationReport)
+    """
+    def count(bits):
+        return int(np.count_nonzero(flags & bits))
+
+    return ValidationReport(total=len(flags),
+                            invalid=int(np.count_nonzero(flags)),
+                            inverted=count(INVERTED_ROWS | INVERTED_COLUMNS),
+                            outside=count(BEYOND_HEIGHT | BEYOND_WIDTH),
+                            negative=count(NEGATIVE),
+                            repaired=repaired,
+                            policy=policy,
+                            dropped=dropped)
+
+def report_summary(report):
+    """
+    describe a validation report for the user
+
+        Args:
+            report (ValidationReport) the report
+
+        Returns:
+            (string) a one line summary
+    """
+    if report.invalid == 0:
+        return f"all {report.total} regions valid"
+
+    text = (f"{report.invalid} of {report.total} regions invalid: "
+            f"{report.inverted} inverted, {report.outside} outside the image")
+    if report.negative > 0:
+        text += f", {report.negative} negative"
+
+    if report.policy != "flag":
+        text += f"; {report.repaired} repaired by {report.policy}"
+    if report.dropped > 0:
+        text += f", {report.dropped} left empty and removed"
+
+    return text
+
+def repair_regions(regions, width, height, policy="clamp"):
+    """
+    validate the regions and repair them according to the policy, only the
+    first four columns are checked or changed
+
+        Args:
+            regions (numpy.array) (N, 4+) array, columns top, bottom, left, right
+            width (int) the image width
+            height (int) the image height
+            policy (string) "flag" leaves the regions unchanged, "swap" swaps
+                            inverted edges and "clamp" also clips to the image
+
+        Returns:
+            (numpy.array) the regions, a repaired copy if anything was changed
+            (ValidationReport) the problems found
+
+        Throws:
+            ValueError if the policy is unknown
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"unknown repair policy {policy}, use one of {POLICIES}")
+
+    flags = validate_regions(regions, width, height)
+
+    if policy == "flag":
+        return regions, make_report(flags, 0, policy)
+
+    if policy == "swap":
+        bad = (flags & (INVERTED_ROWS | INVERTED_COLUMNS)) != 0
+    else:
+        bad = flags != 0
+
+    rows = np.flatnonzero(bad)
+    if len(rows) == 0:
+        return regions, make_report(flags, 0, policy)
+
+    repaired = regions.copy()
+    fixed = repaired[rows, :4]
+    fixed[:, :2].sort(axis=1)
+    fixed[:, 2:].sort(axis=1)
+
+    if policy == "clamp":
+        np.clip(fixed[:, :2], 0, height, out=fixed[:, :2])
+        np.clip(fixed[:, 2:], 0, width, out=fixed[:, 2:])
+
+    repaired[rows, :4] = fixed
+
+    return repaired, make_report(flags, len(rows), policy)
+
+def repair_region_list(regions, width, height, policy="clamp"):
+    """
+    validate and repair a list of regions, including the keyframes of TimeRects,
+    only the regions that are changed are replaced so subclasses such as TimeRect
+    keep their extra fields, regions left with no area by the repair, in their
+    box or any keyframe, are removed
+
+        Args:
+            regions ([DrawRect]) the regions
+            width (int) the image width
+            height (int) the image height
+            policy (string) the repair policy, see repair_regions
+
+        Returns:
+            ([DrawRect]) the regions, a repaired copy if anything was changed
+            (ValidationReport) the problems found, a region is counted once
+            however many of its keyframes are invalid
+    """
+    array = regions_to_array(regions)
+    keyframes = keyframes_to_array(regions)
+    owners = np.concatenate([np.arange(len(array)), keyframes[:, 0]])
+
+    # the keyframes are checked as extra rows, owned by their regions
+    boxes = np.concatenate([array, keyframes[:, 2:].astype(array.dtype)])
+    repaired, _ = repair_regions(boxes, width, height, policy)
+
+    flags = np.zeros(len(array), dtype=np.uint8)
+    np.bitwise_or.at(flags, owners, validate_regions(boxes, width, height))
+
+    changed_boxes = np.any(repaired != boxes, axis=1)
+    if not np.any(changed_boxes):
+        return regions, make_report(flags, 0, policy)
+
+    changed = np.zeros(len(array), dtype=bool)
+    changed[owners[changed_boxes]] = True
+
+    emptied = changed_boxes & ((repaired[:, 0] == repaired[:, 1]) |
+                               (repaired[:, 2] == repaired[:, 3]))
+    dropped = np.zeros(len(array), dtype=bool)
+    dropped[owners[emptied]] = True
+
+    rekeyed = set(keyframes[changed_boxes[len(array):], 0].tolist())
+
+    regions = list(regions)
+    for row in np.flatnonzero(changed & ~dropped).tolist():
+        top, bottom, left, right = repaired[row]
+        region = regions[row]._replace(top=top, bottom=bottom, left=left, right=right)
+
+        if row in rekeyed:
+            rows = np.flatnonzero(keyframes[:, 0] == row)
+            frames = keyframes[rows, 1].tolist()
+            coords = repaired[len(array) + rows].tolist()
+            region = region._replace(keyframes=tuple((frame, *box)
+                                                     for frame, box in zip(frames, coords)))
+
+        regions[row] = region
+
+    regions = [region for region, drop in zip(regions, dropped) if not drop]
+
+    return regions, make_report(flags, int(np.count_nonzero(changed)), policy,
+                                int(np.count_nonzero(dropped)))
+
+def find_invalid(regions, width, height):
+    """
+    find the regions that are inverted or extend beyond the image
+
+        Args:
+            regions (numpy.array) (N, 4) array, columns top, bottom, left, right
+            width (int) the image width
+            height (int) the image height
+
+        Returns:
+            (numpy.array) boolean array, True for each invalid region
+    """
+    return validate_regions(regions, width, height) != 0
+
+def clamp_regions(regions, width, height):
+    """
+    make a copy of the regions clipped to the image and with inverted edges swapped
+
+        Args:
+            regions (numpy.array) (N, 4) array, columns top, bottom, left, right
+            width (int) the image width
+            height (int) the image height
+
+        Returns:
+            (numpy.array) the repaired copy
+    """
+    return repair_regions(regions, width, height, "clamp")[0]
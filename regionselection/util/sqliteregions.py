@@ -0,0 +1,471 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+A list of regions kept in a SQLite database rather than in memory. Each window
+writes to its own session, named by project and image, and every change is
+committed as it is made, so the database replaces the binary autosave.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from regionselection.util.drawrect import DrawRect
+from regionselection.util.timerect import TimeRect, FOREVER
+from regionselection.util.memoryreport import register_cache, unregister_cache, regions_bytes
+
+## the number of regions read by one query
+PAGE_SIZE = 512
+
+## the number of pages kept in memory
+PAGE_CACHE = 64
+
+## the schema, regions are ordered by their position in the session
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    project TEXT,
+    image TEXT,
+    created REAL);
+CREATE INDEX IF NOT EXISTS sessions_project ON sessions (project, image);
+CREATE TABLE IF NOT EXISTS regions (
+    id INTEGER PRIMARY KEY,
+    session INTEGER NOT NULL REFERENCES sessions (id),
+    position INTEGER NOT NULL,
+    top INTEGER NOT NULL,
+    bottom INTEGER NOT NULL,
+    left INTEGER NOT NULL,
+    right INTEGER NOT NULL,
+    start_frame INTEGER,
+    end_frame INTEGER,
+    keyframes TEXT);
+CREATE UNIQUE INDEX IF NOT EXISTS regions_position ON regions (session, position);
+"""
+
+## the coordinate index, an R*Tree if SQLite was built with it
+_RTREE_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS regions_rtree USING rtree (
+    id, min_x, max_x, min_y, max_y);
+"""
+
+## the coordinate index if the R*Tree module is missing
+_FALLBACK_SCHEMA = """
+CREATE INDEX IF NOT EXISTS regions_coordinates ON regions (session, left, top);
+"""
+
+## the columns read to make a region
+_COLUMNS = "top, bottom, left, right, start_frame, end_frame, keyframes"
+
+def _to_row(region):
+    """
+    the column values of a region
+
+        Args:
+            region (DrawRect) the region, TimeRects keep their frames and keyframes
+
+        Returns:
+            (tuple) top, bottom, left, right, start_frame, end_frame, keyframes
+    """
+    start = getattr(region, "start_frame", None)
+    end = getattr(region, "end_frame", None)
+    keyframes = getattr(region, "keyframes", None)
+    if keyframes:
+        keyframes = json.dumps([[int(value) for value in key] for key in keyframes])
+
+    return (int(region.top), int(region.bottom), int(region.left), int(region.right),
+            None if start is None else int(start),
+            None if end is None else int(end),
+            keyframes or None)
+
+def _from_row(row):
+    """
+    make a region from its column values
+
+        Args:
+            row (tuple) the values in the order of _COLUMNS
+
+        Returns:
+            (DrawRect) a TimeRect if the row has a frame range
+    """
+    top, bottom, left, right, start, end, keyframes = row
+    if start is None:
+        return DrawRect(top, bottom, left, right)
+
+    if keyframes is not None:
+        keyframes = tuple(tuple(key) for key in json.loads(keyframes))
+
+    return TimeRect(top, bottom, left, right, start, end, keyframes)
+
+class SQLiteRegions():
+    """
+    the regions of one session of a database, with the parts of the list
+    interface used by RegionsTableModel and the main window; reads are made a
+    page at a time and kept in a small cache, every write is one transaction
+    """
+
+    def __init__(self, file_path, project=None, image=None):
+        """
+        open the database, creating it if needed, and start a new empty session
+
+            Args:
+                file_path (string) the database file
+                project (string) the session's project name
+                image (string) the session's image path
+        """
+        ## the connection, shared with worker threads under the lock
+        self._connection = sqlite3.connect(file_path, check_same_thread=False)
+
+        ## lock serialising use of the connection
+        self._lock = threading.RLock()
+
+        ## the database file
+        self._file_path = file_path
+
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("PRAGMA cache_size=-16384")
+            self._connection.executescript(_SCHEMA)
+
+            ## True if the coordinates are indexed by an R*Tree
+            self._rtree = True
+            try:
+                self._connection.executescript(_RTREE_SCHEMA)
+            except sqlite3.OperationalError:
+                self._rtree = False
+                self._connection.executescript(_FALLBACK_SCHEMA)
+
+            with self._connection:
+                cursor = self._connection.execute(
+                    "INSERT INTO sessions (project, image, created) VALUES (?, ?, ?)",
+                    (project, image, time.time()))
+
+        ## the session written by this object
+        self._session = cursor.lastrowid
+
+        ## the number of regions in the session
+        self._count = 0
+
+        ## pages of regions read, page number to list, least recently used first
+        self._pages = OrderedDict()
+
+        ## the name in memory reports
+        self._name = f"sqlite regions {self._session}"
+        register_cache(self._name,
+                       lambda: sum(regions_bytes(page) for page in list(self._pages.values())))
+
+    @property
+    def session(self):
+        """
+        getter for the session number
+        """
+        return self._session
+
+    @property
+    def has_rtree(self):
+        """
+        getter for whether the coordinates are indexed by an R*Tree
+        """
+        return self._rtree
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for first in range(0, self._count, PAGE_SIZE):
+            yield from self._read(first, first + PAGE_SIZE)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(self._count))]
+
+        position = self._position(index)
+        page = self._pages.get(position // PAGE_SIZE)
+        if page is None:
+            first = position - position % PAGE_SIZE
+            page = self._read(first, first + PAGE_SIZE)
+            self._pages[position // PAGE_SIZE] = page
+            while len(self._pages) > PAGE_CACHE:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(position // PAGE_SIZE)
+
+        return page[position % PAGE_SIZE]
+
+    def __setitem__(self, index, region):
+        self.replace_rows([self._position(index)], [region])
+
+    def _position(self, index):
+        """
+        check an index and convert a negative index to a position
+
+            Args:
+                index (int) the index
+
+            Returns:
+                (int) the position
+
+            Throws:
+                IndexError if the index is out of range
+        """
+        index = int(index)
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("region index out of range")
+
+        return index
+
+    def _read(self, first, last):
+        """
+        read the regions in a range of positions
+
+            Args:
+                first (int) the first position
+                last (int) one past the last position
+
+            Returns:
+                ([DrawRect]) the regions
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {_COLUMNS} FROM regions WHERE session = ? AND position >= ? "
+                "AND position < ? ORDER BY position",
+                (self._session, first, last)).fetchall()
+
+        return [_from_row(row) for row in rows]
+
+    def _insert(self, first, regions):
+        """
+        insert regions at consecutive positions, called within a transaction
+
+            Args:
+                first (int) the position of the first region
+                regions ([DrawRect]) the regions
+        """
+        rows = [(self._session, position, *_to_row(region))
+                for position, region in enumerate(regions, first)]
+        self._connection.executemany(
+            f"INSERT INTO regions (session, position, {_COLUMNS}) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows)
+
+        if self._rtree:
+            self._connection.execute(
+                "INSERT INTO regions_rtree SELECT id, left, right, top, bottom FROM regions "
+                "WHERE session = ? AND position >= ?",
+                (self._session, first))
+
+    def append(self, region):
+        """
+        add a region to the end of the session
+
+            Args:
+                region (DrawRect) the region
+        """
+        self.extend([region])
+
+    def extend(self, regions):
+        """
+        add regions to the end of the session in one transaction
+
+            Args:
+                regions ([DrawRect]) the regions
+        """
+        regions = list(regions)
+        if len(regions) == 0:
+            return
+
+        with self._lock, self._connection:
+            self._insert(self._count, regions)
+
+        # only the last page can have been partly read
+        self._pages.pop(self._count // PAGE_SIZE, None)
+        self._count += len(regions)
+
+    def replace_rows(self, rows, regions):
+        """
+        overwrite several regions in one transaction
+
+            Args:
+                rows ([int]) the positions to overwrite
+                regions ([DrawRect]) the new regions, one per position
+        """
+        updates = [(*_to_row(region), self._session, int(row))
+                   for row, region in zip(rows, regions)]
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "UPDATE regions SET top = ?, bottom = ?, left = ?, right = ?, "
+                "start_frame = ?, end_frame = ?, keyframes = ? "
+                "WHERE session = ? AND position = ?",
+                updates)
+
+            if self._rtree:
+                self._connection.executemany(
+                    "UPDATE regions_rtree SET min_x = ?, max_x = ?, min_y = ?, max_y = ? "
+                    "WHERE id = (SELECT id FROM regions WHERE session = ? AND position = ?)",
+                    [(left, right, top, bottom, session, row)
+                     for top, bottom, left, right, *_, session, row in updates])
+
+        for row, region in zip(rows, regions):
+            page = self._pages.get(int(row) // PAGE_SIZE)
+            if page is not None:
+                page[int(row) % PAGE_SIZE] = region
+
+    def clear(self):
+        """
+        remove all the regions of the session in one transaction
+        """
+        with self._lock, self._connection:
+            if self._rtree:
+                self._connection.execute(
+                    "DELETE FROM regions_rtree WHERE id IN "
+                    "(SELECT id FROM regions WHERE session = ?)",
+                    (self._session,))
+            self._connection.execute("DELETE FROM regions WHERE session = ?", (self._session,))
+
+        self._pages.clear()
+        self._count = 0
+
+    def positions_in_rect(self, left, top, right, bottom):
+        """
+        find the regions overlapping a rectangle using the coordinate index,
+        frame ranges are ignored
+
+            Args:
+                left (int) the left edge
+                top (int) the top edge
+                right (int) the right edge
+                bottom (int) the bottom edge
+
+            Returns:
+                ([int]) the positions in increasing order
+        """
+        if self._rtree:
+            # the R*Tree stores rounded floats, so its matches are checked exactly
+            query = ("SELECT regions.position FROM regions_rtree "
+                     "JOIN regions ON regions.id = regions_rtree.id "
+                     "WHERE regions_rtree.min_x <= ? AND regions_rtree.max_x >= ? "
+                     "AND regions_rtree.min_y <= ? AND regions_rtree.max_y >= ? "
+                     "AND regions.session = ? AND regions.left <= ? AND regions.right >= ? "
+                     "AND regions.top <= ? AND regions.bottom >= ? ORDER BY regions.position")
+            values = (right, left, bottom, top, self._session, right, left, bottom, top)
+        else:
+            query = ("SELECT position FROM regions WHERE session = ? AND left <= ? "
+                     "AND right >= ? AND top <= ? AND bottom >= ? ORDER BY position")
+            values = (self._session, right, left, bottom, top)
+
+        with self._lock:
+            return [row[0] for row in self._connection.execute(query, values)]
+
+    def frame_ranges(self):
+        """
+        the frame ranges of the regions, read without making the regions,
+        plain rectangles exist in all frames
+
+            Returns:
+                (numpy.array, numpy.array) int64 start and end frames
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT IFNULL(start_frame, 0), IFNULL(end_frame, ?) FROM regions "
+                "WHERE session = ? ORDER BY position",
+                (FOREVER, self._session)).fetchall()
+
+        ranges = np.array(rows, dtype=np.int64).reshape((len(rows), 2))
+
+        return ranges[:, 0], ranges[:, 1]
+
+    def has_keyframes(self):
+        """
+        test if any region has keyframes, without making the regions
+
+            Returns:
+                (bool)
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM regions WHERE session = ? AND keyframes IS NOT NULL LIMIT 1",
+                (self._session,)).fetchone()
+
+        return row is not None
+
+    def set_project(self, project, image=None):
+        """
+        rename the session, the regions are unchanged
+
+            Args:
+                project (string) the project name
+                image (string) the image path
+        """
+        with self._lock, self._connection:
+            self._connection.execute("UPDATE sessions SET project = ?, image = ? WHERE id = ?",
+                                     (project, image, self._session))
+
+    def list_sessions(self):
+        """
+        list the other sessions of the database that have regions, newest first
+
+            Returns:
+                list of tuples, each of which is (session number, project name)
+        """
+        with self._lock:
+            return self._connection.execute(
+                "SELECT id, project FROM sessions WHERE id != ? AND "
+                "EXISTS (SELECT 1 FROM regions WHERE regions.session = sessions.id) "
+                "ORDER BY created DESC",
+                (self._session,)).fetchall()
+
+    def read_session(self, session):
+        """
+        read all the regions of another session
+
+            Args:
+                session (int) the session number
+
+            Returns:
+                (string) the project name
+                ([DrawRect]) the regions
+        """
+        with self._lock:
+            project = self._connection.execute("SELECT project FROM sessions WHERE id = ?",
+                                               (session,)).fetchone()
+            rows = self._connection.execute(
+                f"SELECT {_COLUMNS} FROM regions WHERE session = ? ORDER BY position",
+                (session,)).fetchall()
+
+        return (None if project is None else project[0]), [_from_row(row) for row in rows]
+
+    def close(self):
+        """
+        close the database, empty sessions are removed
+        """
+        with self._lock:
+            if self._count == 0:
+                with self._connection:
+                    self._connection.execute("DELETE FROM sessions WHERE id = ?",
+                                             (self._session,))
+            self._connection.close()
+
+        self._pages.clear()
+        unregister_cache(self._name)
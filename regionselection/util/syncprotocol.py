@@ -0,0 +1,217 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+The binary messages exchanged by the sync server and its clients. Every
+message is a frame of
+
+    uint32 length of the rest of the frame
+    uint8  message type
+    uint64 server sequence number, zero if sent by a client
+    uint32 number of records
+    records
+
+all little endian. A snapshot, or replace, carries one record of four uint32,
+top, bottom, left, right, per region. A diff carries one OP_DTYPE record
+per operation.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import struct
+import numpy as np
+
+## server to client, the complete set of regions
+MSG_SNAPSHOT = 1
+
+## either direction, a batch of insert and update operations
+MSG_DIFF = 2
+
+## client to server, replace the complete set of regions
+MSG_REPLACE = 3
+
+## append a region, the server assigns the row
+OP_INSERT = 1
+
+## overwrite the region in a row
+OP_UPDATE = 2
+
+## the frame header after the length: type, sequence, record count
+_HEADER = struct.Struct("<BQI")
+
+## the frame length prefix
+_LENGTH = struct.Struct("<I")
+
+## a region record
+REGION_DTYPE = np.dtype("<u4")
+
+## an operation record
+OP_DTYPE = np.dtype([("op", "u1"),
+                     ("row", "<u4"),
+                     ("top", "<u4"),
+                     ("bottom", "<u4"),
+                     ("left", "<u4"),
+                     ("right", "<u4")])
+
+## the largest frame accepted, guards against corrupt length prefixes
+MAX_FRAME = 1 << 30
+
+def make_ops(op_code, rows, regions):
+    """
+    make an array of operations of one kind
+
+        Args:
+            op_code (int) OP_INSERT or OP_UPDATE
+            rows (numpy.array) the rows, ignored by the server for inserts
+            regions (numpy.array) (N, 4) array of top, bottom, left, right
+
+        Returns:
+            (numpy.array) of OP_DTYPE
+    """
+    regions = np.asarray(regions).reshape(-1, 4)
+    ops = np.zeros(len(regions), dtype=OP_DTYPE)
+    ops["op"] = op_code
+    ops["row"] = rows
+    for column, name in enumerate(("top", "bottom", "left", "right")):
+        ops[name] = regions[:, column]
+
+    return ops
+
+def op_regions(ops):
+    """
+    extract the region coordinates from operations
+
+        Args:
+            ops (numpy.array) of OP_DTYPE
+
+        Returns:
+            (numpy.array) (N, 4) uint32 array of top, bottom, left, right
+    """
+    return np.stack([ops["top"], ops["bottom"], ops["left"], ops["right"]],
+                    axis=1).astype(np.uint32)
+
+def last_writes(rows, regions):
+    """
+    reduce a sequence of writes to rows to the last write to each row
+
+        Args:
+            rows (numpy.array) the rows written, in order
+            regions (numpy.array) (N, 4) the values written
+
+        Returns:
+            (numpy.array) the distinct rows
+            (numpy.array) the last value written to each
+    """
+    reverse_rows = np.asarray(rows)[::-1]
+    distinct, first = np.unique(reverse_rows, return_index=True)
+
+    return distinct, np.asarray(regions).reshape(-1, 4)[::-1][first]
+
+def encode(msg_type, sequence, records):
+    """
+    make a frame
+
+        Args:
+            msg_type (int) the message type
+            sequence (int) the server sequence number, zero from a client
+            records (numpy.array) (N, 4) regions or N operations
+
+        Returns:
+            (bytes) the frame
+    """
+    if msg_type == MSG_DIFF:
+        payload = np.ascontiguousarray(records, dtype=OP_DTYPE)
+    else:
+        payload = np.ascontiguousarray(records, dtype=REGION_DTYPE).reshape(-1, 4)
+
+    header = _HEADER.pack(msg_type, sequence, len(payload))
+
+    return b"".join((_LENGTH.pack(len(header) + payload.nbytes), header, payload.tobytes()))
+
+class MessageReader():
+    """
+    reassemble frames from a byte stream that may split or join them arbitrarily
+    """
+
+    def __init__(self):
+        """
+        make an empty reader
+        """
+        ## bytes received but not yet decoded
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """
+        add received bytes and decode the complete frames
+
+            Args:
+                data (bytes) the received bytes
+
+            Returns:
+                [(int, int, numpy.array)] the type, sequence and records of each frame
+
+            Throws:
+                ValueError if the stream is corrupt
+        """
+        self._buffer.extend(data)
+        messages = []
+        start = 0
+
+        while len(self._buffer) - start >= _LENGTH.size:
+            (length,) = _LENGTH.unpack_from(self._buffer, start)
+            if length < _HEADER.size or length > MAX_FRAME:
+                raise ValueError(f"Corrupt sync frame length {length}")
+
+            end = start + _LENGTH.size + length
+            if end > len(self._buffer):
+                break
+
+            messages.append(MessageReader._decode(bytes(self._buffer[start + _LENGTH.size:end])))
+            start = end
+
+        del self._buffer[:start]
+
+        return messages
+
+    @staticmethod
+    def _decode(frame):
+        """
+        decode the body of one frame
+
+            Args:
+                frame (bytes) the frame after the length prefix
+
+            Returns:
+                (int, int, numpy.array) the type, sequence and records, the records are a copy
+
+            Throws:
+                ValueError if the frame is inconsistent
+        """
+        msg_type, sequence, count = _HEADER.unpack_from(frame)
+        body = frame[_HEADER.size:]
+
+        if msg_type == MSG_DIFF:
+            dtype, shape = OP_DTYPE, (count,)
+        elif msg_type in (MSG_SNAPSHOT, MSG_REPLACE):
+            dtype, shape = REGION_DTYPE, (count, 4)
+        else:
+            raise ValueError(f"Unknown sync message type {msg_type}")
+
+        if len(body) != dtype.itemsize * int(np.prod(shape)):
+            raise ValueError("Sync frame length does not match its record count")
+
+        records = np.frombuffer(body, dtype=dtype).reshape(shape).copy()
+
+        return msg_type, sequence, records
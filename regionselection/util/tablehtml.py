@@ -0,0 +1,101 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import io
+
+from regionselection.util.drawrect import regions_to_array
+
+## the column headers of the regions table
+TABLE_HEADERS = ["Num", "Left x", "Top y", "Right x", "Bottom y"]
+
+## the default number of table rows on a page
+ROWS_PER_PAGE = 40
+
+def page_count(rows, rows_per_page=ROWS_PER_PAGE):
+    """
+    the number of pages needed for a table
+
+        Args:
+            rows (int) the number of rows in the table
+            rows_per_page (int) the number of rows on a page
+
+        Returns:
+            (int) number of pages, at least one
+    """
+    return max(1, -(-rows // rows_per_page))
+
+def html_pages(regions, rows_per_page=ROWS_PER_PAGE):
+    """
+    generator for the regions table as html, one complete table per page
+
+        Args:
+            regions ([DrawRect] or numpy.array) the regions, or an (N, 4) array
+                                                 as made by regions_to_array
+            rows_per_page (int) the number of rows on a page
+
+        Yields:
+            (string) the html of one page
+    """
+    if not hasattr(regions, "shape"):
+        regions = regions_to_array(regions)
+
+    header = "".join(f"<th>{name}</th>" for name in TABLE_HEADERS)
+
+    for start in range(0, page_count(len(regions), rows_per_page)*rows_per_page, rows_per_page):
+        page = io.StringIO()
+        page.write("<table style=\"width:100%\">\n<tr>")
+        page.write(header)
+        page.write("</tr>\n")
+
+        # array columns are top, bottom, left, right, the table's left, top, right, bottom
+        for number, row in enumerate(regions[start:start+rows_per_page].tolist(), start+1):
+            page.write(f"<tr><td>{number}</td><td>{row[2]}</td><td>{row[0]}</td>"
+                       f"<td>{row[3]}</td><td>{row[1]}</td></tr>\n")
+
+        page.write("\n</table>")
+
+        yield page.getvalue()
+
+def write_html(regions, file, rows_per_page=ROWS_PER_PAGE, progress=None, cancelled=None):
+    """
+    stream the regions table to a text file a page at a time
+
+        Args:
+            regions ([DrawRect] or numpy.array) the regions
+            file (text file) an open, writable, file
+            rows_per_page (int) the number of rows written at once
+            progress (callable) called with (pages done, total pages) or None
+            cancelled (callable) returns True to stop before the next page, or None
+
+        Returns:
+            (bool) True if all pages were written
+    """
+    total = page_count(len(regions), rows_per_page)
+
+    file.write("<html>\n<body>\n")
+    for number, page in enumerate(html_pages(regions, rows_per_page), 1):
+        if cancelled is not None and cancelled():
+            return False
+        file.write(page)
+        file.write("\n")
+        if progress is not None:
+            progress(number, total)
+    file.write("</body>\n</html>\n")
+
+    return True
@@ -0,0 +1,196 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+This class represents a rectangular region of an image sequence that exists
+for a range of frames, optionally moving between keyframes
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+from collections import namedtuple
+import numpy as np
+
+from regionselection.util.drawrect import DrawRect
+
+## the frame number used as the end of a region that never ends
+FOREVER = np.iinfo(np.int64).max
+
+## data struct for a rectangle that exists over a range of frames
+##
+## Args:
+##
+##     top, bottom, left, right (int) the rectangle, as in BaseRect, in the start frame
+##
+##     start_frame (int) the first frame in which the region exists
+##
+##     end_frame (int) the last frame in which the region exists
+##
+##     keyframes (tuple) None or a tuple of (frame, top, bottom, left, right) tuples
+##                       in increasing frame order, coordinates are linearly
+##                       interpolated between keyframes
+BaseTimeRect = namedtuple("BaseTimeRect",
+                          "top, bottom, left, right, start_frame, end_frame, keyframes",
+                          defaults=(None,))
+
+class TimeRect(BaseTimeRect, DrawRect):
+    """
+    extends DrawRect with a frame range and keyframes, it can be used
+    anywhere a DrawRect is expected
+    """
+    __slots__ = ()
+
+    def time_in_region(self, frame):
+        """
+        test if the region exists in a frame
+
+            Args:
+                frame (int) the frame number
+
+            Returns:
+                True if start_frame <= frame <= end_frame
+        """
+        return self.start_frame <= frame <= self.end_frame
+
+    def at_frame(self, frame):
+        """
+        the rectangle as it is in a frame, interpolated between keyframes
+
+            Args:
+                frame (int) the frame number
+
+            Returns:
+                (DrawRect) the rectangle in the frame
+        """
+        if not self.keyframes:
+            return DrawRect(self.top, self.bottom, self.left, self.right)
+
+        frames = [key[0] for key in self.keyframes]
+        after = int(np.searchsorted(frames, frame))
+
+        if after == 0:
+            return DrawRect(*self.keyframes[0][1:])
+        if after == len(frames):
+            return DrawRect(*self.keyframes[-1][1:])
+
+        low = np.array(self.keyframes[after-1], dtype=np.float64)
+        high = np.array(self.keyframes[after], dtype=np.float64)
+        weight = (frame - low[0])/(high[0] - low[0])
+        coords = np.round(low[1:] + weight*(high[1:] - low[1:])).astype(np.uint32)
+
+        return DrawRect(*coords)
+
+    def __repr__(self):
+        return DrawRect.__repr__(self)
+
+    def __str__(self):
+        """
+        string representation for user
+
+            Returns:
+                string describing object
+        """
+        return "{} frames {} to {}".format(DrawRect.__str__(self), self.start_frame, self.end_frame)
+
+def frame_ranges(regions):
+    """
+    the frame ranges of a list of regions, plain rectangles exist in all frames
+
+        Args:
+            regions ([DrawRect]) the regions, a mixture of DrawRect and TimeRect
+
+        Returns:
+            (numpy.array, numpy.array) int64 start and end frames
+    """
+    starts = np.fromiter((getattr(region, "start_frame", 0) for region in regions),
+                         dtype=np.int64, count=len(regions))
+    ends = np.fromiter((getattr(region, "end_frame", FOREVER) for region in regions),
+                       dtype=np.int64, count=len(regions))
+
+    return starts, ends
+
+def has_limited_ranges(starts, ends):
+    """
+    test if any frame range does not cover every frame
+
+        Args:
+            starts (numpy.array) the start frames
+            ends (numpy.array) the end frames
+
+        Returns:
+            (bool) True if some region does not exist in every frame
+    """
+    return bool(np.any((starts != 0) | (ends != FOREVER)))
+
+def is_time_dependent(regions, ranges=None):
+    """
+    test if any region changes between frames, by a limited frame range or by keyframes
+
+        Args:
+            regions ([DrawRect]) the regions, a mixture of DrawRect and TimeRect
+            ranges ((numpy.array, numpy.array)) the regions' frame_ranges if already known
+
+        Returns:
+            (bool) True if some region is not the same box in every frame
+    """
+    starts, ends = frame_ranges(regions) if ranges is None else ranges
+    if has_limited_ranges(starts, ends):
+        return True
+
+    return any(getattr(region, "keyframes", None) for region in regions)
+
+def keyframes_to_array(regions):
+    """
+    pack the keyframes of a list of regions into an array
+
+        Args:
+            regions ([DrawRect]) the regions
+
+        Returns:
+            (numpy.array) int64 (K, 6) array, columns region index, frame, top, bottom, left, right
+    """
+    rows = [(index, *key) for index, region in enumerate(regions)
+            for key in (getattr(region, "keyframes", None) or ())]
+
+    return np.array(rows, dtype=np.int64).reshape((len(rows), 6))
+
+def make_time_regions(regions, starts, ends, keyframes=None):
+    """
+    combine rectangles, frame ranges and keyframes into regions, the inverse of
+    frame_ranges and keyframes_to_array, regions that exist in all frames and
+    have no keyframes are returned as plain DrawRects
+
+        Args:
+            regions ([DrawRect]) the rectangles
+            starts (numpy.array) the start frames
+            ends (numpy.array) the end frames
+            keyframes (numpy.array) as made by keyframes_to_array, or None
+
+        Returns:
+            [DrawRect]
+    """
+    keys = {}
+    for row in (keyframes.tolist() if keyframes is not None else []):
+        keys.setdefault(row[0], []).append(tuple(row[1:]))
+
+    output = []
+    for index, (region, start, end) in enumerate(zip(regions, starts.tolist(), ends.tolist())):
+        if start == 0 and end == FOREVER and index not in keys:
+            output.append(region)
+        else:
+            key = tuple(keys[index]) if index in keys else None
+            output.append(TimeRect(*region[:4], start, end, key))
+
+    return output
@@ -0,0 +1,75 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of the folder queue and the regions kept for each of its images, run
+with "python -m pytest" from the top level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+import os
+
+import pytest
+import PyQt5.QtGui as qg
+
+from regionselection.util.annotationqueue import AnnotationQueue
+from regionselection.util.drawrect import DrawRect
+
+def make_folder(path, count=3):
+    """
+    a folder of small numbered png images
+    """
+    path.mkdir()
+    for number in range(count):
+        image = qg.QImage(8, 6, qg.QImage.Format_RGB32)
+        image.fill(number)
+        assert image.save(str(path/f"image_{number}.png"))
+    return str(path)
+
+def test_regions_kept_and_restored(tmp_path, monkeypatch):
+    """
+    each image keeps its own regions, and a new queue restores them from the autosaves
+    """
+    monkeypatch.chdir(tmp_path)
+    folder = make_folder(tmp_path/"images")
+
+    queue = AnnotationQueue(folder)
+    assert len(queue) == 3
+    assert queue.image(1).size() == qg.QImage(8, 6, qg.QImage.Format_RGB32).size()
+
+    regions = [DrawRect(0, 2, 0, 2)]
+    queue.set_regions(1, regions)
+    regions.append(DrawRect(1, 2, 1, 2))
+    assert queue.regions(1) == [DrawRect(0, 2, 0, 2)]
+    assert queue.regions(0) == []
+
+    queue.autosave(1).save_data(queue.regions(1))
+    queue.close()
+
+    queue = AnnotationQueue(folder)
+    assert queue.regions(1) == [DrawRect(0, 2, 0, 2)]
+    assert queue.regions(2) == []
+    assert queue.project(1) == os.path.abspath(os.path.join(folder, "image_1.png"))
+    queue.close()
+
+def test_empty_folder_refused(tmp_path, monkeypatch):
+    """
+    a folder with no images cannot be queued
+    """
+    monkeypatch.chdir(tmp_path)
+    (tmp_path/"empty").mkdir()
+
+    with pytest.raises(ValueError):
+        AnnotationQueue(str(tmp_path/"empty"))
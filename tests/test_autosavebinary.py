@@ -0,0 +1,98 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of the autosave backups and the index that finds them, run with
+"python -m pytest" from the top level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+import os
+import pickle
+
+from regionselection.util import autosavebinary
+from regionselection.util.autosavebinary import AutoSaveBinary
+
+def make_backup(dir_path, name, project, fingerprint, time):
+    """
+    save a backup and index it with a given modification time
+    """
+    file_path = str(dir_path/name)
+    AutoSaveBinary(project, file_path, fingerprint).save_data([])
+    os.utime(file_path, ns=(time, time))
+    AutoSaveBinary.index_backup(file_path, project, fingerprint)
+    return file_path
+
+def touch_directory(dir_path, time):
+    """
+    give the directory a new modification time, as adding or deleting a file would
+    """
+    os.utime(str(dir_path), ns=(time, time))
+
+def test_newest_first(tmp_path):
+    """
+    the backups of a fingerprint are found newest first by their indexed times
+    """
+    older = make_backup(tmp_path, "a.idback", "a", "print", 10**18)
+    newer = make_backup(tmp_path, "b.idback", "b", "print", 2*10**18)
+    make_backup(tmp_path, "c.idback", "c", "other", 3*10**18)
+
+    assert AutoSaveBinary.find_backups(str(tmp_path), "print") == [(newer, "b"), (older, "a")]
+
+def test_unchanged_directory_not_listed(tmp_path, monkeypatch):
+    """
+    the backups are only listed when the directory changes, or on a rescan
+    """
+    make_backup(tmp_path, "a.idback", "a", "print", 10**18)
+    AutoSaveBinary.list_backups(str(tmp_path))
+
+    listed = []
+    listdir = os.listdir
+    monkeypatch.setattr(autosavebinary.os, "listdir",
+                        lambda path: listed.append(path) or listdir(path))
+
+    assert len(AutoSaveBinary.list_backups(str(tmp_path))) == 1
+    assert not listed
+
+    assert len(AutoSaveBinary.list_backups(str(tmp_path), rescan=True)) == 1
+    assert len(listed) == 1
+
+    touch_directory(tmp_path, 5*10**18)
+    AutoSaveBinary.find_backups(str(tmp_path), "print")
+    assert len(listed) == 2
+
+def test_unindexed_and_deleted_backups(tmp_path):
+    """
+    a backup missing from the index is read and added, a deleted one is dropped
+    """
+    first = make_backup(tmp_path, "a.idback", "a", "print", 10**18)
+    AutoSaveBinary.list_backups(str(tmp_path))
+
+    second = str(tmp_path/"b.idback")
+    with open(second, 'wb') as file:
+        pickle.dump(("idw-01", "b", [], "print"), file)
+    os.remove(first)
+    touch_directory(tmp_path, 5*10**18)
+
+    assert AutoSaveBinary.find_backups(str(tmp_path), "print") == [(second, "b")]
+
+def test_corrupt_index_rebuilt(tmp_path):
+    """
+    a corrupt index is rebuilt from the backups
+    """
+    first = make_backup(tmp_path, "a.idback", "a", "print", 10**18)
+    (tmp_path/".idback_index"/"index.json").write_text("{not json")
+
+    assert AutoSaveBinary.find_backups(str(tmp_path), "print") == [(first, "a")]
@@ -0,0 +1,89 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of the merging of model change signals into batches, run with
+"python -m pytest" from the top level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+import os
+
+# no display is needed, this must be set before Qt is loaded
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable = wrong-import-position
+import PyQt5.QtCore as qc
+import PyQt5.QtWidgets as qw
+
+from regionselection.gui.changebus import ChangeBatch, ChangeBus
+from regionselection.gui.regionstablemodel import RegionsTableModel
+from regionselection.util.drawrect import DrawRect
+
+## the application, the bus delivers batches through its event loop
+APPLICATION = qw.QApplication.instance() or qw.QApplication([])
+
+def test_ranges_merged():
+    """
+    touching and overlapping ranges are merged, separate ranges are kept
+    """
+    batch = ChangeBatch()
+    assert batch.is_empty()
+
+    batch.add_changed(3, 3)
+    batch.add_changed(4, 6)
+    batch.add_changed(2, 5)
+    batch.add_changed(10, 10)
+    batch.add_inserted(7, 7)
+
+    assert batch.changed == [(2, 6), (10, 10)]
+    assert batch.inserted == [(7, 7)]
+
+def test_reset_subsumes_changes():
+    """
+    a reset drops the ranges and later edits are only noted
+    """
+    batch = ChangeBatch()
+    batch.add_changed(1, 2)
+    batch.add_reset()
+    batch.add_inserted(5, 5)
+
+    assert batch.reset and batch.edited_after_reset
+    assert batch.changed == [] and batch.inserted == []
+
+def test_one_batch_per_event_loop_pass():
+    """
+    the signals of several edits arrive as one batch when the event loop runs
+    """
+    regions = [DrawRect(0, 10, 0, 10)]
+    model = RegionsTableModel(regions)
+    bus = ChangeBus()
+    bus.connect_model(model)
+    batches = []
+    bus.changed.connect(batches.append)
+
+    model.add_region(DrawRect(1, 2, 1, 2))
+    model.add_regions([DrawRect(3, 4, 3, 4), DrawRect(5, 6, 5, 6)])
+    model.setData(model.index(0, 1), "5", qc.Qt.EditRole)
+    assert not batches
+
+    APPLICATION.processEvents()
+
+    assert len(batches) == 1
+    assert batches[0].inserted == [(1, 3)]
+    assert batches[0].changed == [(0, 0)]
+
+    APPLICATION.processEvents()
+    assert len(batches) == 1
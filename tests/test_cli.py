@@ -0,0 +1,141 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of the command line interface and the region files it reads and
+writes, run with "python -m pytest" from the top level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+import numpy as np
+import pytest
+
+# the interface sets the offscreen platform, so it is imported before Qt
+from regionselection import cli
+import PyQt5.QtGui as qg # pylint: disable = wrong-import-order
+
+from regionselection.util import regionfiles
+from regionselection.util.drawrect import DrawRect
+from regionselection.util.timerect import TimeRect, FOREVER
+from regionselection.util.projectbundle import ProjectBundle
+
+def make_image(path, width=50, height=40):
+    """
+    write a black png image
+    """
+    image = qg.QImage(width, height, qg.QImage.Format_RGB32)
+    image.fill(0)
+    assert image.save(str(path))
+    return str(path)
+
+def make_csv(path, regions):
+    """
+    write a csv region file
+    """
+    regionfiles.write_regions_csv(str(path), path.stem, np.array(regions, dtype=np.uint32))
+    return str(path)
+
+def test_csv_round_trip(tmp_path):
+    """
+    a csv file keeps its project name and regions
+    """
+    path = make_csv(tmp_path/"a.csv", [[1, 2, 3, 4], [5, 6, 7, 8]])
+
+    project, regions = regionfiles.read_regions(path)
+
+    assert project == "a"
+    assert regions.tolist() == [[1, 2, 3, 4], [5, 6, 7, 8]]
+
+def test_negative_csv_refused(tmp_path):
+    """
+    negative coordinates are reported, not wrapped
+    """
+    path = tmp_path/"a.csv"
+    path.write_text("a\ntop y,bottom y,left x,right x\n1,2,3,4\n-1,2,3,4\n")
+
+    with pytest.raises(ValueError):
+        regionfiles.read_regions(str(path))
+
+def test_validate_never_replaces_the_input(tmp_path):
+    """
+    a repaired copy is written alongside the file under a new name
+    """
+    make_image(tmp_path/"a.png")
+    path = make_csv(tmp_path/"a.csv", [[0, 10, 0, 10], [30, 80, 20, 10]])
+    before = (tmp_path/"a.csv").read_bytes()
+
+    assert cli.main(["validate", path, "--repair", "clamp", "--workers", "1"]) == 0
+
+    assert (tmp_path/"a.csv").read_bytes() == before
+    _, repaired = regionfiles.read_regions(str(tmp_path/"a_repaired.csv"))
+    assert repaired.tolist() == [[0, 10, 0, 10], [30, 40, 10, 20]]
+
+def test_convert_to_same_file_fails(tmp_path):
+    """
+    converting a csv file to csv in place is refused and the exit status is 1
+    """
+    path = make_csv(tmp_path/"a.csv", [[0, 1, 0, 1]])
+    before = (tmp_path/"a.csv").read_bytes()
+
+    assert cli.main(["convert", path, "--to", "csv", "--workers", "1"]) == 1
+    assert (tmp_path/"a.csv").read_bytes() == before
+
+def test_convert_keeps_keyframes(tmp_path):
+    """
+    a time-dependent bundle keeps its frames and keyframes, and cannot become a csv file
+    """
+    image = make_image(tmp_path/"a.png")
+    keyframes = ((0, 0, 10, 0, 10), (10, 20, 30, 20, 30))
+    ProjectBundle.save(str(tmp_path/"a.npz"), "a", image,
+                       [TimeRect(0, 10, 0, 10, 0, FOREVER, keyframes), DrawRect(1, 2, 3, 4)])
+
+    output_dir = tmp_path/"out"
+    assert cli.main(["convert", str(tmp_path/"a.npz"), "--to", "npz",
+                     "--output-dir", str(output_dir), "--workers", "1"]) == 0
+
+    _, regions = regionfiles.read_region_list(str(output_dir/"a.npz"))
+    assert tuple(tuple(int(value) for value in key) for key in regions[0].keyframes) == keyframes
+
+    assert cli.main(["convert", str(tmp_path/"a.npz"), "--to", "csv",
+                     "--output-dir", str(output_dir), "--workers", "1"]) == 1
+    assert not (output_dir/"a.csv").exists()
+
+def test_merge_reports_bad_inputs(tmp_path, capsys):
+    """
+    an unreadable input is reported and the others are merged
+    """
+    first = make_csv(tmp_path/"a.csv", [[0, 1, 0, 1]])
+    second = make_csv(tmp_path/"b.csv", [[2, 3, 2, 3]])
+    bad = tmp_path/"c.npz"
+    bad.write_bytes(b"not a bundle")
+    output = str(tmp_path/"merged.csv")
+
+    assert cli.main(["merge", first, second, str(bad), "--output", output]) == 1
+
+    assert "c.npz: error" in capsys.readouterr().err
+    assert regionfiles.read_regions(output)[1].tolist() == [[0, 1, 0, 1], [2, 3, 2, 3]]
+
+def test_crops_count_only_written(tmp_path, capsys):
+    """
+    crops outside the image are not counted and fail the file
+    """
+    make_image(tmp_path/"a.png")
+    path = make_csv(tmp_path/"a.csv", [[0, 10, 0, 10], [45, 60, 0, 10]])
+    output_dir = tmp_path/"crops"
+
+    assert cli.main(["crops", path, "--output-dir", str(output_dir), "--workers", "1"]) == 1
+
+    assert sorted(item.name for item in output_dir.iterdir()) == ["a_00001.png"]
+    assert "1 crops written" in capsys.readouterr().err
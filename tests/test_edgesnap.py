@@ -0,0 +1,85 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of edge snapping, on full size and downsampled images, run with
+"python -m pytest" from the top level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import PyQt5.QtGui as qg
+import PyQt5.QtCore as qc
+
+from regionselection.util.edgesnap import EdgeSnapper, GradientMaps
+
+def square_image(size, first, last):
+    """
+    a black image with a white square covering first to last-1 in both directions
+    """
+    image = qg.QImage(size, size, qg.QImage.Format_RGB32)
+    image.fill(qc.Qt.black)
+    painter = qg.QPainter(image)
+    painter.fillRect(first, first, last-first, last-first, qc.Qt.white)
+    painter.end()
+    return image
+
+def ready_snapper(image, scale=1.0):
+    """
+    a snapper with snapping on and its maps computed
+    """
+    snapper = EdgeSnapper()
+    snapper.set_enabled(True)
+    snapper.set_image(image, scale)
+    snapper._maps.result() # pylint: disable = protected-access
+    return snapper
+
+def test_gradient_maps():
+    """
+    the gradients are placed between the pixels either side of an edge
+    """
+    maps = GradientMaps(square_image(40, 10, 30))
+
+    assert maps.snap_x(13, 10, 30) == 10
+    assert maps.snap_y(28, 10, 30) == 30
+    assert maps.snap_x(20, 10, 30) == 20
+
+def test_snap_corner():
+    """
+    a corner near the square moves onto it, one far away does not move
+    """
+    snapper = ready_snapper(square_image(64, 20, 40))
+
+    assert snapper.snap(17, 18, 42, 41) == (20, 20)
+    assert snapper.snap(2, 2) == (2, 2)
+
+def test_no_image():
+    """
+    without an image nothing is snapped and nothing fails
+    """
+    snapper = EdgeSnapper()
+    snapper.set_enabled(True)
+    snapper.set_image(None)
+
+    assert snapper.snap(5, 6, 7, 8) == (5, 6)
+
+def test_downsampled_image():
+    """
+    on a view at half size the corner is snapped in full image coordinates
+    """
+    snapper = ready_snapper(square_image(64, 20, 40), 0.5)
+
+    assert snapper.snap(37, 38, 84, 82) == (40, 40)
+    assert snapper.snap(5, 3) == (5, 3)
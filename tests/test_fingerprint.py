@@ -0,0 +1,59 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of the image fingerprints, run with "python -m pytest" from the top
+level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+import hashlib
+import os
+
+from regionselection.util import fingerprint
+
+def test_fingerprint_is_sha256(tmp_path, monkeypatch):
+    """
+    the fingerprint is the SHA-256 of the file, whatever the chunk size
+    """
+    path = tmp_path/"a.png"
+    contents = bytes(range(256))*41
+    path.write_bytes(contents)
+    monkeypatch.setattr(fingerprint, "_CHUNK_SIZE", 1000)
+
+    assert fingerprint.image_fingerprint(str(path)) == hashlib.sha256(contents).hexdigest()
+
+def test_empty_file(tmp_path):
+    """
+    an empty file, which cannot be mapped, has the digest of no bytes
+    """
+    path = tmp_path/"a.png"
+    path.write_bytes(b"")
+
+    assert fingerprint.image_fingerprint(str(path)) == hashlib.sha256().hexdigest()
+
+def test_changed_file_hashed_again(tmp_path):
+    """
+    the remembered fingerprint is replaced when the file changes
+    """
+    path = tmp_path/"a.png"
+    path.write_bytes(b"first")
+    first = fingerprint.image_fingerprint(str(path))
+    assert fingerprint.image_fingerprint(str(path)) == first
+
+    path.write_bytes(b"other")
+    os.utime(str(path), ns=(10**18, 10**18))
+
+    assert fingerprint.image_fingerprint(str(path)) == hashlib.sha256(b"other").hexdigest()
@@ -0,0 +1,74 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of the cache of decoded frames and the ordering of image sequences,
+run with "python -m pytest" from the top level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+import os
+
+import PyQt5.QtGui as qg
+
+from regionselection.util.framecache import FrameCache
+from regionselection.util.framesequence import list_images
+
+def make_image(width):
+    """
+    a 32 bit image of one row, 4*width bytes
+    """
+    return qg.QImage(width, 1, qg.QImage.Format_RGB32)
+
+def test_least_recently_used_evicted():
+    """
+    images are evicted least recently used first once over the limit
+    """
+    cache = FrameCache(memory_limit=4*30)
+    cache.put("a", make_image(10))
+    cache.put("b", make_image(10))
+    cache.get("a")
+    cache.put("c", make_image(10))
+    cache.put("d", make_image(10))
+
+    assert "b" not in cache
+    assert sorted(["a", "c", "d"]) == sorted(key for key in "abcd" if key in cache)
+    assert cache.size_in_bytes == 4*30
+
+def test_replacing_and_oversized():
+    """
+    a replaced image is not counted twice and the newest image is always kept
+    """
+    cache = FrameCache(memory_limit=4*10)
+    cache.put("a", make_image(5))
+    cache.put("a", make_image(8))
+    assert cache.size_in_bytes == 4*8
+
+    cache.put("b", make_image(100))
+    assert len(cache) == 1 and "b" in cache
+
+    cache.clear()
+    assert len(cache) == 0 and cache.size_in_bytes == 0
+
+def test_natural_order(tmp_path):
+    """
+    images are listed with their numbers in numeric order and other files ignored
+    """
+    for name in ["frame_10.png", "frame_9.PNG", "frame_1.jpg", "notes.txt"]:
+        (tmp_path/name).write_bytes(b"")
+
+    names = [os.path.basename(path) for path in list_images(str(tmp_path))]
+
+    assert names == ["frame_1.jpg", "frame_9.PNG", "frame_10.png"]
@@ -0,0 +1,85 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of the grid index used to hit test regions, run with "python -m pytest"
+from the top level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+import numpy as np
+
+from regionselection.util.hitgrid import HitGrid
+
+def random_regions(count, seed=1):
+    """
+    random regions, some inverted, within 500 by 500 pixels
+    """
+    generator = np.random.default_rng(seed)
+    return generator.integers(0, 500, size=(count, 4))
+
+def test_at_point_smallest():
+    """
+    a point hits the smallest region containing it, by identifier
+    """
+    regions = [[0, 100, 0, 100], [40, 60, 40, 60], [200, 300, 200, 300]]
+    grid = HitGrid(regions, indices=np.array([7, 8, 9]), cell_size=16)
+
+    assert grid.at_point(50, 50) == 8
+    assert grid.at_point(10, 90) == 7
+    assert grid.at_point(150, 150) is None
+    assert grid.at_point(-1, 50) is None
+    assert grid.at_point(1000, 50) is None
+
+def test_at_point_matches_scan():
+    """
+    hits agree with a scan of all the regions, inverted regions are normalised
+    """
+    regions = random_regions(200)
+    grid = HitGrid(regions, cell_size=32)
+
+    boxes = regions.copy()
+    boxes[:, :2].sort(axis=1)
+    boxes[:, 2:].sort(axis=1)
+    areas = (boxes[:, 1] - boxes[:, 0])*(boxes[:, 3] - boxes[:, 2])
+
+    for x_pos, y_pos in np.random.default_rng(2).integers(0, 520, size=(300, 2)).tolist():
+        inside = np.flatnonzero((boxes[:, 0] <= y_pos) & (y_pos <= boxes[:, 1]) &
+                                (boxes[:, 2] <= x_pos) & (x_pos <= boxes[:, 3]))
+        hit = grid.at_point(x_pos, y_pos)
+        if len(inside) == 0:
+            assert hit is None
+        else:
+            assert areas[hit] == areas[inside].min()
+
+def test_in_rect_matches_scan():
+    """
+    the regions overlapping a rectangle agree with a scan, in increasing order
+    """
+    regions = random_regions(200, seed=3)
+    grid = HitGrid(regions, cell_size=32)
+
+    boxes = regions.copy()
+    boxes[:, :2].sort(axis=1)
+    boxes[:, 2:].sort(axis=1)
+
+    for left, top in np.random.default_rng(4).integers(-20, 500, size=(50, 2)).tolist():
+        right, bottom = left + 60, top + 30
+        expected = np.flatnonzero((boxes[:, 0] <= bottom) & (top <= boxes[:, 1]) &
+                                  (boxes[:, 2] <= right) & (left <= boxes[:, 3]))
+        assert grid.in_rect(left, top, right, bottom).tolist() == expected.tolist()
+
+    assert len(HitGrid([]).in_rect(0, 0, 10, 10)) == 0
+    assert HitGrid([]).at_point(0, 0) is None
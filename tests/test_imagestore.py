@@ -0,0 +1,93 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of the image store and its downsampled view and tiles, run with
+"python -m pytest" from the top level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+import os
+
+# no display is needed, this must be set before Qt is loaded
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable = wrong-import-position
+import numpy as np
+import PyQt5.QtCore as qc
+import PyQt5.QtGui as qg
+import PyQt5.QtWidgets as qw
+
+from regionselection.util.imagestore import ImageStore
+
+## the application, tiles are painted into region copies
+APPLICATION = qw.QApplication.instance() or qw.QApplication([])
+
+def make_image(path, width=400, height=300):
+    """
+    write a png image whose pixels encode their position
+    """
+    image = qg.QImage(width, height, qg.QImage.Format_RGB32)
+    for row in range(height):
+        for column in range(0, width, 10):
+            image.setPixel(column, row, qg.qRgb(column % 256, row % 256, 0))
+    assert image.save(str(path))
+    return str(path)
+
+def test_within_budget_held_in_full(tmp_path):
+    """
+    an image within its budget is held at full resolution
+    """
+    store = ImageStore.open(make_image(tmp_path/"a.png"))
+
+    assert not store.is_downsampled() and store.scale == 1.0
+    assert store.full_image() is store.view()
+    assert (store.width(), store.height()) == (400, 300)
+
+def test_over_budget_downsampled(tmp_path):
+    """
+    an image over its budget is read downsampled to half the budget, with full size coordinates
+    """
+    budget = 400*300*4//4
+    store = ImageStore.open(make_image(tmp_path/"a.png"), budget=budget, tile_size=128)
+
+    assert store.is_downsampled() and store.full_image() is None
+    assert (store.width(), store.height()) == (400, 300)
+    assert store.view().sizeInBytes() <= budget//2
+
+    regions = np.array([[30, 150, 40, 200], [0, 300, 0, 400]], dtype=np.uint32)
+    back = store.from_view(store.to_view(regions))
+    assert np.all(np.abs(back.astype(np.int64) - regions) <= 2/store.scale)
+    assert back[:, [1, 3]].max(axis=0).tolist() == [300, 400]
+    store.release()
+
+def test_tiles_full_resolution(tmp_path):
+    """
+    tiles of a downsampled image are full resolution parts of the file, kept within the budget
+    """
+    budget = 400*300*4//4
+    store = ImageStore.open(make_image(tmp_path/"a.png"), budget=budget, tile_size=64)
+
+    tiles = store.tiles(qc.QRect(100, 100, 200, 50))
+    assert len(tiles) == 8
+    assert tiles[0][0].topLeft() == qc.QPoint(64, 64)
+    assert tiles[-1][0].topLeft() == qc.QPoint(256, 128)
+    assert tiles[-1][1].size() == qc.QSize(64, 64)
+    assert store.size_in_bytes() <= budget
+
+    part = store.region(qc.QRect(130, 20, 10, 5))
+    assert part.size() == qc.QSize(10, 5)
+    assert qg.qRed(part.pixel(0, 0)) == 130 and qg.qGreen(part.pixel(0, 0)) == 20
+    store.release()
@@ -0,0 +1,74 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of the timing statistics, run with "python -m pytest" from the top level
+directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+import csv
+import json
+
+from regionselection.util import instrumentation
+from regionselection.util.instrumentation import RollingStats
+
+def test_percentiles_of_window():
+    """
+    percentiles are by nearest rank over the most recent samples only
+    """
+    stats = RollingStats(window=100)
+    assert stats.percentiles() == {}
+
+    for value in range(1000):
+        stats.add(float(value))
+
+    assert stats.count == 1000
+    assert stats.percentiles((0, 50, 99, 100)) == {0: 900.0, 50: 950.0, 99: 999.0, 100: 999.0}
+
+def test_disabled_leaves_function(monkeypatch):
+    """
+    without instrumentation the function is not wrapped, with it every call is recorded
+    """
+    def work(value):
+        return 2*value
+
+    monkeypatch.setattr(instrumentation, "ENABLED", False)
+    assert instrumentation.timed("work")(work) is work
+
+    monkeypatch.setattr(instrumentation, "ENABLED", True)
+    monkeypatch.setattr(instrumentation, "_STATS", {})
+    wrapped = instrumentation.timed("work")(work)
+    assert wrapped(3) == 6 and wrapped(4) == 8
+    assert instrumentation.summary()["work"]["count"] == 2
+
+def test_dump(tmp_path, monkeypatch):
+    """
+    the summary is written in milliseconds as JSON or csv
+    """
+    monkeypatch.setattr(instrumentation, "_STATS", {})
+    instrumentation.record("paint_event", 0.002)
+
+    instrumentation.dump(str(tmp_path/"stats.json"))
+    instrumentation.dump(str(tmp_path/"stats.csv"))
+
+    data = json.loads((tmp_path/"stats.json").read_text())
+    assert data["paint_event"]["count"] == 1
+    assert abs(data["paint_event"]["p50"] - 2.0) < 1e-9
+
+    with open(tmp_path/"stats.csv", newline='') as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == ["name", "count", "p50", "p90", "p99"]
+    assert rows[1][:2] == ["paint_event", "1"]
@@ -0,0 +1,96 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of label mask rasterization and of reading regions back from masks,
+run with "python -m pytest" from the top level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import numpy as np
+import pytest
+
+from regionselection.util import labelmask
+
+## two overlapping regions and one reaching beyond a 10 by 8 image, top, bottom, left, right
+REGIONS = np.array([[0, 6, 0, 6], [2, 4, 2, 4], [5, 20, 7, 30]], dtype=np.uint32)
+
+def full_mask(regions, policy="last", band_rows=3):
+    """
+    the bands of a 10 wide 8 high mask stacked together
+    """
+    return np.vstack([band for _, band in labelmask.rasterize_bands(
+        regions, 10, 8, policy, band_rows=band_rows)])
+
+def test_overlap_policies():
+    """
+    the later, earlier or smaller region labels the overlap
+    """
+    assert full_mask(REGIONS, "last")[3, 3] == 2
+    assert full_mask(REGIONS, "first")[3, 3] == 1
+    assert full_mask(REGIONS[::-1], "smallest")[3, 3] == 2
+
+def test_clipped_and_banded():
+    """
+    regions are clipped, edges are exclusive and bands do not change the result
+    """
+    mask = full_mask(REGIONS)
+
+    assert mask.shape == (8, 10)
+    assert mask.dtype == np.uint16
+    assert np.count_nonzero(mask == 3) == 3*3
+    assert mask[6, 0] == 0 and mask[0, 6] == 0
+    assert np.array_equal(mask, full_mask(REGIONS, band_rows=8))
+
+def test_empty_and_inverted_regions():
+    """
+    regions without area label nothing
+    """
+    regions = np.array([[3, 3, 0, 5], [5, 2, 1, 4]], dtype=np.uint32)
+
+    assert not np.any(full_mask(regions))
+
+def test_unknown_policy():
+    """
+    an unknown policy is refused
+    """
+    with pytest.raises(ValueError):
+        full_mask(REGIONS, "largest")
+
+def test_export_and_read_back(tmp_path):
+    """
+    a mask written to disk gives back the boxes of its labels
+    """
+    path = str(tmp_path/"labels.npy")
+    regions = np.array([[0, 2, 0, 3], [4, 8, 5, 9]], dtype=np.uint32)
+    labelmask.export_mask(path, regions, 10, 8)
+
+    mask = labelmask.read_mask(path)
+
+    assert mask.shape == (8, 10)
+    assert labelmask.mask_to_regions(mask).tolist() == regions.tolist()
+
+def test_binary_components():
+    """
+    the 8-connected components of a binary mask are boxed separately
+    """
+    mask = np.zeros((6, 6), dtype=np.uint8)
+    mask[0, 0] = mask[1, 1] = 1
+    mask[4:6, 3:6] = 1
+
+    boxes = labelmask.mask_to_regions(mask, binary=True, band_rows=2)
+
+    assert sorted(boxes.tolist()) == [[0, 2, 0, 2], [4, 6, 3, 6]]
@@ -0,0 +1,67 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of the memory report, run with "python -m pytest" from the top level
+directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+import PyQt5.QtGui as qg
+
+from regionselection.util import memoryreport
+from regionselection.util.drawrect import DrawRect
+
+def test_report_and_budgets():
+    """
+    images, regions and registered caches are listed and compared with budgets
+    """
+    image = qg.QImage(100, 10, qg.QImage.Format_RGB32)
+    regions = [DrawRect(0, 1, 0, 1), DrawRect(0, 1, 0, 1)]
+    memoryreport.register_cache("test cache", lambda: 5000)
+    try:
+        report = memoryreport.build_report(images={"image": image}, regions=regions)
+    finally:
+        memoryreport.unregister_cache("test cache")
+
+    assert report["image"] == 4000
+    assert report["test cache"] == 5000
+    assert report["regions per region"] == report["regions"]//2
+
+    over = memoryreport.over_budget(report, {"image": 3000, "test cache": 6000, "total": 100})
+    assert [name for name, _, _ in over] == ["image", "total"]
+
+    text = memoryreport.format_report(report, {"image": 3000})
+    assert "OVER BUDGET image: 3.9 KiB > 2.9 KiB" in text
+
+def test_shared_objects_counted_once():
+    """
+    regions sharing their coordinate objects are smaller than distinct ones
+    """
+    value = 10**30
+    shared = [DrawRect(value, value, value, value)]*3
+    distinct = [DrawRect(10**30 + row, 2*10**30, 3*10**30, 4*10**30) for row in range(3)]
+
+    assert memoryreport.regions_bytes(shared) < memoryreport.regions_bytes(distinct)
+    assert memoryreport.regions_bytes([]) > 0
+
+def test_format_bytes():
+    """
+    sizes are shown in the largest unit below 1024
+    """
+    assert memoryreport.format_bytes(512) == "512 B"
+    assert memoryreport.format_bytes(1536) == "1.5 KiB"
+    assert memoryreport.format_bytes(3*1024**3) == "3.0 GiB"
+    assert memoryreport.qimage_bytes(None) == 0
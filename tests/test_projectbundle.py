@@ -0,0 +1,101 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Round trip tests of project bundles, run with "python -m pytest" from the
+top level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import numpy as np
+import pytest
+
+from regionselection.util.drawrect import DrawRect
+from regionselection.util.timerect import TimeRect, FOREVER
+from regionselection.util.projectbundle import ProjectBundle
+
+def save_and_load(tmp_path, regions):
+    """
+    save regions in a bundle and read them back
+    """
+    image_path = tmp_path/"image.png"
+    image_path.write_bytes(b"not really an image")
+    bundle_path = str(tmp_path/"project.npz")
+
+    ProjectBundle.save(bundle_path, "project", str(image_path), regions)
+
+    return ProjectBundle(bundle_path).regions
+
+def test_plain_regions(tmp_path):
+    """
+    plain rectangles come back as plain rectangles
+    """
+    regions = save_and_load(tmp_path, [DrawRect(0, 10, 0, 10), DrawRect(5, 6, 7, 8)])
+
+    assert [tuple(int(value) for value in region) for region in regions] == \
+        [(0, 10, 0, 10), (5, 6, 7, 8)]
+    assert not any(isinstance(region, TimeRect) for region in regions)
+
+def test_keyframes_spanning_every_frame(tmp_path):
+    """
+    a region existing in every frame keeps its keyframes
+    """
+    keyframes = ((0, 0, 10, 0, 10), (10, 20, 30, 20, 30))
+    regions = save_and_load(tmp_path, [TimeRect(0, 10, 0, 10, 0, FOREVER, keyframes),
+                                       DrawRect(1, 2, 3, 4)])
+
+    assert isinstance(regions[0], TimeRect)
+    assert tuple(tuple(int(value) for value in key) for key in regions[0].keyframes) == keyframes
+    assert tuple(int(value) for value in regions[0].at_frame(5)) == (10, 20, 10, 20)
+    assert not isinstance(regions[1], TimeRect)
+
+def test_frame_range_and_keyframes(tmp_path):
+    """
+    a region with a limited range keeps the range and its keyframes
+    """
+    keyframes = ((2, 0, 10, 0, 10), (4, 10, 20, 10, 20))
+    regions = save_and_load(tmp_path, [TimeRect(0, 10, 0, 10, 2, 4, keyframes)])
+
+    assert (regions[0].start_frame, regions[0].end_frame) == (2, 4)
+    assert tuple(int(value) for value in regions[0].at_frame(3)) == (5, 15, 5, 15)
+
+def test_metadata_and_find_image(tmp_path):
+    """
+    the project name and image are stored, and the image is found by fingerprint
+    """
+    image_path = tmp_path/"image.png"
+    image_path.write_bytes(b"not really an image")
+    bundle_path = str(tmp_path/"project.npz")
+    ProjectBundle.save(bundle_path, "project", str(image_path), [DrawRect(0, 1, 0, 1)])
+
+    with ProjectBundle(bundle_path) as bundle:
+        assert bundle.project == "project"
+        assert bundle.find_image() == str(image_path)
+
+    # a different image at the stored path is not accepted
+    image_path.write_bytes(b"another image")
+    with ProjectBundle(bundle_path) as bundle:
+        assert bundle.find_image() is None
+
+def test_not_a_bundle(tmp_path):
+    """
+    an archive without the magic code is refused
+    """
+    path = str(tmp_path/"other.npz")
+    np.savez(path, regions=np.zeros((0, 4), dtype=np.uint32))
+
+    with pytest.raises(ValueError):
+        ProjectBundle(path)
@@ -0,0 +1,79 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of the numpy views of QImage pixels, run with "python -m pytest" from
+the top level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+import numpy as np
+import pytest
+import PyQt5.QtGui as qg
+
+from regionselection.util import qimagearray
+from regionselection.util.qimagearray import array_view, gray_view, rgba_view, QImageArray
+
+def test_view_shares_pixels():
+    """
+    a view of a directly viewable format has the image's rows, padding skipped, and no copy
+    """
+    image = qg.QImage(5, 3, qg.QImage.Format_Grayscale8)
+    image.fill(0)
+    image.setPixel(4, 2, 0xff7f7f7f)
+
+    view = array_view(image)
+
+    assert view.shape == (3, 5)
+    assert view.strides[0] == image.bytesPerLine()
+    assert view[2, 4] == 0x7f and view.sum() == 0x7f
+    assert not view.flags.writeable
+    assert isinstance(view.base, QImageArray)
+
+def test_channel_order():
+    """
+    rgba views are in red, green, blue, alpha order whatever the source format
+    """
+    image = qg.QImage(2, 2, qg.QImage.Format_ARGB32)
+    image.fill(qg.QColor(10, 20, 30, 40))
+
+    assert rgba_view(image)[0, 0].tolist() == [10, 20, 30, 40]
+
+    native = array_view(image)
+    order = QImageArray(image).channels
+    assert [native[0, 0, order.index(name)] for name in "RGBA"] == [10, 20, 30, 40]
+
+def test_conversions_cached():
+    """
+    a conversion is made once per image while cached and listed by size
+    """
+    qimagearray.clear_conversions()
+    image = qg.QImage(4, 4, qg.QImage.Format_RGB32)
+    image.fill(qg.QColor(100, 100, 100))
+
+    first = gray_view(image)
+    second = gray_view(image)
+
+    assert np.shares_memory(first, second)
+    assert qimagearray._CACHE.size_in_bytes() > 0  # pylint: disable = protected-access
+    qimagearray.clear_conversions()
+    assert qimagearray._CACHE.size_in_bytes() == 0  # pylint: disable = protected-access
+
+def test_unviewable_format_refused():
+    """
+    an image with no array layout cannot be held directly
+    """
+    with pytest.raises(ValueError):
+        QImageArray(qg.QImage(2, 2, qg.QImage.Format_Mono))
@@ -0,0 +1,124 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of automatic region proposal, run with "python -m pytest" from the top
+level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import numpy as np
+import PyQt5.QtGui as qg
+
+from regionselection.util import regionproposals
+from regionselection.gui.proposalworker import ProposalWorker
+
+def gray_image(pixels):
+    """
+    an RGB32 image of a uint8 (height, width) array, so it must be converted to gray
+    """
+    height, width = pixels.shape
+    pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+    image = qg.QImage(pixels.tobytes(), width, height, width, qg.QImage.Format_Grayscale8)
+    return image.convertToFormat(qg.QImage.Format_RGB32)
+
+def sorted_boxes(boxes):
+    """
+    the boxes as a sorted list of lists
+    """
+    return sorted(boxes.tolist())
+
+def test_otsu_threshold():
+    """
+    the threshold falls between two populations, and a single level does not fail
+    """
+    histogram = np.zeros(256, dtype=np.int64)
+    histogram[[20, 200]] = 100
+    assert 20 <= regionproposals.otsu_threshold(histogram) < 200
+
+    histogram = np.zeros(256, dtype=np.int64)
+    histogram[7] = 100
+    assert regionproposals.otsu_threshold(histogram) == 7
+
+def test_connect_runs_diagonal():
+    """
+    runs touching at a corner are one component, separated runs are not
+    """
+    rows = np.array([0, 1, 1])
+    starts = np.array([0, 2, 6])
+    ends = np.array([2, 3, 7])
+
+    assert regionproposals.connect_runs(rows, starts, ends, 10).tolist() == [0, 0, 1]
+
+def test_bands_do_not_change_proposals():
+    """
+    a U shape joined only below its arms, and random noise, give the same
+    boxes however many rows are read at once
+    """
+    pixels = np.zeros((12, 12), dtype=np.uint8)
+    pixels[1:10, 1:3] = 255
+    pixels[1:10, 8:10] = 255
+    pixels[9:11, 1:10] = 255
+    assert sorted_boxes(regionproposals.propose_regions(
+        gray_image(pixels), threshold=100, min_area=1, band_rows=2)) == [[1, 11, 1, 10]]
+
+    noise = (np.random.default_rng(5).random((90, 70)) < 0.4).astype(np.uint8)*255
+    image = gray_image(noise)
+    whole = regionproposals.propose_regions(image, threshold=100, min_area=1, band_rows=1000)
+    for band_rows in (1, 3, 16):
+        banded = regionproposals.propose_regions(image, threshold=100, min_area=1,
+                                                 band_rows=band_rows)
+        assert sorted_boxes(banded) == sorted_boxes(whole)
+
+def test_area_limits_and_dark_foreground():
+    """
+    components are filtered by area, and dark foregrounds can be found
+    """
+    pixels = np.full((20, 20), 255, dtype=np.uint8)
+    pixels[2:4, 2:4] = 0
+    pixels[10:16, 10:16] = 0
+    image = gray_image(pixels)
+
+    boxes = regionproposals.propose_regions(image, threshold=100, bright=False,
+                                            min_area=5, max_area=100, band_rows=4)
+
+    assert boxes.tolist() == [[10, 16, 10, 16]]
+
+def test_progress_covers_both_passes():
+    """
+    the histogram and labelling passes are both reported against one total
+    """
+    image = gray_image(np.zeros((10, 4), dtype=np.uint8))
+    calls = []
+
+    regionproposals.propose_regions(image, band_rows=4, progress=lambda *call: calls.append(call))
+
+    assert calls == [(4, 20), (8, 20), (10, 20), (14, 20), (18, 20), (20, 20)]
+
+def test_worker_reports_failure():
+    """
+    an error in the worker is reported and finished is still sent
+    """
+    worker = ProposalWorker(gray_image(np.zeros((4, 4), dtype=np.uint8)), min_area="x")
+    failed = []
+    finished = []
+    worker.failed.connect(failed.append)
+    worker.finished.connect(finished.append)
+
+    worker.run()
+
+    assert len(failed) == 1
+    assert finished == [None]
@@ -0,0 +1,85 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of the tiled rendering of annotated images, run with "python -m pytest"
+from the top level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+import os
+
+# no display is needed, this must be set before Qt is loaded
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable = wrong-import-position
+import numpy as np
+import PyQt5.QtCore as qc
+import PyQt5.QtGui as qg
+import PyQt5.QtWidgets as qw
+
+from regionselection.util import regionrenderer
+from regionselection.util.drawrect import DrawRect
+
+## the application, the regions' pens and brushes are made from its palette
+APPLICATION = qw.QApplication.instance() or qw.QApplication([])
+
+REGIONS = [DrawRect(10, 40, 20, 90), DrawRect(100, 130, 150, 190)]
+
+def make_image(width=200, height=150):
+    """
+    an image with a gradient, so that misplaced tiles show
+    """
+    image = qg.QImage(width, height, qg.QImage.Format_RGB32)
+    for row in range(height):
+        for column in range(width):
+            image.setPixel(column, row, qg.qRgb(column, row, 50))
+    return image
+
+def test_tiles_cover_output():
+    """
+    the tiles cover the output once, smaller at the right and bottom edges
+    """
+    tiles = regionrenderer.make_tiles(qc.QSize(250, 130), 100)
+
+    assert len(tiles) == 6
+    assert tiles[2] == qc.QRect(200, 0, 50, 100)
+    assert sum(tile.width()*tile.height() for tile in tiles) == 250*130
+
+def test_tiled_matches_whole(tmp_path):
+    """
+    rendering tile by tile in threads gives the same pixels as rendering at once
+    """
+    image = make_image()
+    whole = regionrenderer.qimage_to_array(regionrenderer.render_regions(image, REGIONS, 0.5))
+
+    path = str(tmp_path/"out.npy")
+    size = regionrenderer.render_tiled(image, REGIONS, path, 0.5, tile_size=32, workers=2)
+    tiled = np.load(path)
+
+    assert size == qc.QSize(100, 75)
+    assert tiled.shape == whole.shape == (75, 100, 4)
+    assert np.array_equal(tiled, whole)
+
+def test_regions_drawn():
+    """
+    the regions' outlines change the pixels they cover and nothing else
+    """
+    image = make_image()
+    plain = regionrenderer.qimage_to_array(regionrenderer.render_regions(image, []))
+    drawn = regionrenderer.qimage_to_array(regionrenderer.render_regions(image, REGIONS))
+
+    assert not np.array_equal(plain[10, 20:91], drawn[10, 20:91])
+    assert np.array_equal(plain[60:90, :], drawn[60:90, :])
@@ -0,0 +1,78 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of the bulk moves, scales and resampling of regions, run with
+"python -m pytest" from the top level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+from functools import partial
+
+import numpy as np
+import pytest
+
+from regionselection.util import regiontransforms
+from regionselection.util.drawrect import DrawRect
+from regionselection.util.timerect import TimeRect
+
+REGIONS = np.array([[10, 20, 30, 40], [0, 5, 90, 100]], dtype=np.uint32)
+
+def test_move_clamped():
+    """
+    moved edges are clamped at zero and the image
+    """
+    moved = regiontransforms.move_regions(REGIONS, 5, -8, width=100, height=50)
+
+    assert moved.dtype == np.uint32
+    assert moved.tolist() == [[2, 12, 35, 45], [0, 0, 95, 100]]
+
+def test_scale():
+    """
+    scaling is about the origin, or about each region's centre
+    """
+    origin = regiontransforms.scale_regions(REGIONS[:1], 2.0, 0.5)
+    centre = regiontransforms.scale_regions(REGIONS[:1], 2.0, about_centre=True)
+
+    assert origin.tolist() == [[5, 10, 60, 80]]
+    assert centre.tolist() == [[5, 25, 25, 45]]
+
+    with pytest.raises(ValueError):
+        regiontransforms.scale_regions(REGIONS, -1.0)
+
+def test_resample():
+    """
+    regions drawn on an image follow it to another size, within the new image
+    """
+    resampled = regiontransforms.resample_regions(REGIONS, (100, 50), (50, 100))
+
+    assert resampled.tolist() == [[20, 40, 15, 20], [0, 10, 45, 50]]
+
+    with pytest.raises(ValueError):
+        regiontransforms.resample_regions(REGIONS, (0, 50), (50, 100))
+
+def test_keyframes_follow():
+    """
+    keyframes are transformed with their regions and frame ranges kept
+    """
+    regions = [DrawRect(0, 10, 0, 10),
+               TimeRect(0, 10, 0, 10, 2, 8, ((2, 0, 10, 0, 10), (8, 10, 20, 10, 20)))]
+
+    moved = regiontransforms.transform_regions(
+        regions, partial(regiontransforms.move_regions, x_shift=5, y_shift=1))
+
+    assert moved[0] == DrawRect(1, 11, 5, 15)
+    assert (moved[1].start_frame, moved[1].end_frame) == (2, 8)
+    assert [tuple(key) for key in moved[1].keyframes] == [(2, 1, 11, 5, 15), (8, 11, 21, 15, 25)]
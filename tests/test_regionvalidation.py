@@ -0,0 +1,95 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of the validation and repair of regions, and of the table's checks of
+edits, run with "python -m pytest" from the top level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+import numpy as np
+import PyQt5.QtCore as qc
+
+from regionselection.gui.regionstablemodel import RegionsTableModel
+from regionselection.util import regionvalidation
+from regionselection.util.drawrect import DrawRect
+from regionselection.util.timerect import TimeRect, FOREVER
+
+def test_policies():
+    """
+    flag leaves the regions, swap swaps inverted edges and clamp also clips
+    """
+    regions = np.array([[0, 10, 0, 10], [10, 0, 5, 2], [0, 10, 90, 120]], dtype=np.uint32)
+
+    flagged, report = regionvalidation.repair_regions(regions, 100, 100, "flag")
+    assert flagged is regions
+    assert (report.invalid, report.inverted, report.outside, report.repaired) == (2, 1, 1, 0)
+
+    swapped, report = regionvalidation.repair_regions(regions, 100, 100, "swap")
+    assert swapped.tolist() == [[0, 10, 0, 10], [0, 10, 2, 5], [0, 10, 90, 120]]
+    assert report.repaired == 1
+
+    clamped, report = regionvalidation.repair_regions(regions, 100, 100, "clamp")
+    assert clamped[2].tolist() == [0, 10, 90, 100]
+    assert report.repaired == 2
+
+def test_keyframes_repaired():
+    """
+    keyframes outside the image are clipped and the region keeps its frames
+    """
+    region = TimeRect(0, 10, 0, 10, 3, 9, ((3, 0, 10, 0, 10), (9, 20, 10, 90, 150)))
+
+    regions, report = regionvalidation.repair_region_list([region], 100, 100)
+
+    assert report.invalid == 1 and report.repaired == 1 and report.dropped == 0
+    assert (regions[0].start_frame, regions[0].end_frame) == (3, 9)
+    assert regions[0].keyframes == ((3, 0, 10, 0, 10), (9, 10, 20, 90, 100))
+
+def test_empty_after_repair_dropped():
+    """
+    regions clipped to nothing, in their box or a keyframe, are removed
+    """
+    regions = [DrawRect(0, 10, 0, 10),
+               DrawRect(200, 300, 0, 10),
+               TimeRect(0, 10, 0, 10, 0, FOREVER, ((0, 0, 10, 0, 10), (5, 0, 10, 200, 300)))]
+
+    repaired, report = regionvalidation.repair_region_list(regions, 100, 100)
+
+    assert repaired == [regions[0]]
+    assert report.dropped == 2
+    assert "2 left empty and removed" in regionvalidation.report_summary(report)
+
+    flagged, report = regionvalidation.repair_region_list(regions, 100, 100, "flag")
+    assert flagged is regions
+    assert report.invalid == 2 and report.dropped == 0
+
+def test_keyframed_cells_read_only():
+    """
+    the table refuses edits of regions with keyframes, whose shown box is not drawn
+    """
+    regions = [DrawRect(0, 10, 0, 10),
+               TimeRect(0, 10, 0, 10, 0, FOREVER, ((0, 0, 10, 0, 10), (5, 5, 15, 5, 15)))]
+    model = RegionsTableModel(regions)
+    model.set_bounds(100, 100)
+
+    plain = model.index(0, 1)
+    keyed = model.index(1, 1)
+    assert model.flags(plain) & qc.Qt.ItemIsEditable
+    assert not model.flags(keyed) & qc.Qt.ItemIsEditable
+
+    assert model.setData(plain, "5", qc.Qt.EditRole)
+    assert regions[0].left == 5
+    assert not model.setData(keyed, "5", qc.Qt.EditRole)
+    assert not model.setData(plain, "50", qc.Qt.EditRole)
@@ -0,0 +1,111 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of the SQLite region store, run with "python -m pytest" from the top
+level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+import pytest
+
+from regionselection.util import sqliteregions
+from regionselection.util.sqliteregions import SQLiteRegions
+from regionselection.util.drawrect import DrawRect
+from regionselection.util.timerect import TimeRect, FOREVER
+
+def make_regions(count):
+    """
+    distinct regions, the nth at n, n+1
+    """
+    return [DrawRect(row, row + 1, row, row + 1) for row in range(count)]
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """
+    a store with small pages so that paging is exercised
+    """
+    monkeypatch.setattr(sqliteregions, "PAGE_SIZE", 8)
+    monkeypatch.setattr(sqliteregions, "PAGE_CACHE", 2)
+    regions = SQLiteRegions(str(tmp_path/"regions.sqlite"), "a", "a.png")
+    yield regions
+    regions.close()
+
+def test_paged_reads(store):
+    """
+    regions are read a page at a time, with a bounded number of pages cached
+    """
+    regions = make_regions(30)
+    store.extend(regions[:20])
+    store.append(regions[20])
+    store.extend(regions[21:])
+
+    assert len(store) == 30
+    assert list(store) == regions
+    rows = (29, 0, 15, 9, -1)
+    assert [store[row] for row in rows] == [regions[row] for row in rows]
+    assert store[3:6] == regions[3:6]
+    assert len(store._pages) <= 2  # pylint: disable = protected-access
+
+    with pytest.raises(IndexError):
+        store[30]  # pylint: disable = pointless-statement
+
+def test_writes_reach_cached_pages(store):
+    """
+    overwritten regions are seen through the page cache and the database
+    """
+    store.extend(make_regions(20))
+    assert store[3] == DrawRect(3, 4, 3, 4)
+
+    store.replace_rows([3, 17], [DrawRect(50, 60, 50, 60), DrawRect(70, 80, 70, 80)])
+    store[4] = DrawRect(1, 2, 1, 2)
+
+    assert store[3] == DrawRect(50, 60, 50, 60)
+    assert store[4] == DrawRect(1, 2, 1, 2)
+    _, regions = store.read_session(store.session)
+    assert regions[17] == DrawRect(70, 80, 70, 80)
+    assert store.positions_in_rect(55, 55, 75, 75) == [3, 17]
+
+def test_frames_and_keyframes_kept(store):
+    """
+    TimeRects keep their frame ranges and keyframes
+    """
+    keyed = TimeRect(0, 10, 0, 10, 0, FOREVER, ((0, 0, 10, 0, 10), (9, 5, 15, 5, 15)))
+    store.extend([DrawRect(0, 1, 0, 1), TimeRect(2, 3, 2, 3, 4, 6), keyed])
+
+    starts, ends = store.frame_ranges()
+    assert starts.tolist() == [0, 4, 0] and ends.tolist() == [FOREVER, 6, FOREVER]
+    assert store.has_keyframes()
+    assert store[2].keyframes == keyed.keyframes
+
+    store.clear()
+    assert len(store) == 0 and not store.has_keyframes()
+
+def test_sessions(tmp_path):
+    """
+    other sessions with regions are listed and read, empty sessions are removed
+    """
+    path = str(tmp_path/"regions.sqlite")
+    first = SQLiteRegions(path, "first", "a.png")
+    first.extend(make_regions(3))
+    first.close()
+    SQLiteRegions(path, "empty").close()
+
+    second = SQLiteRegions(path, "second")
+    sessions = second.list_sessions()
+
+    assert [project for _, project in sessions] == ["first"]
+    assert second.read_session(sessions[0][0]) == ("first", make_regions(3))
+    second.close()
@@ -0,0 +1,75 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of the sync session wire protocol, run with "python -m pytest" from the
+top level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+import numpy as np
+import pytest
+
+from regionselection.util import syncprotocol
+from regionselection.util.syncprotocol import MessageReader
+
+REGIONS = np.array([[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12]], dtype=np.uint32)
+
+def test_frames_split_and_joined():
+    """
+    frames are decoded whatever the boundaries of the received bytes
+    """
+    ops = syncprotocol.make_ops(syncprotocol.OP_UPDATE, [2, 0], REGIONS[:2])
+    stream = (syncprotocol.encode(syncprotocol.MSG_SNAPSHOT, 7, REGIONS)
+              + syncprotocol.encode(syncprotocol.MSG_DIFF, 8, ops)
+              + syncprotocol.encode(syncprotocol.MSG_REPLACE, 0, REGIONS[:0]))
+
+    reader = MessageReader()
+    messages = []
+    for start in range(0, len(stream), 5):
+        messages.extend(reader.feed(stream[start:start + 5]))
+
+    assert [(msg_type, sequence) for msg_type, sequence, _ in messages] == \
+        [(syncprotocol.MSG_SNAPSHOT, 7), (syncprotocol.MSG_DIFF, 8), (syncprotocol.MSG_REPLACE, 0)]
+    assert np.array_equal(messages[0][2], REGIONS)
+    assert messages[1][2]["row"].tolist() == [2, 0]
+    assert np.array_equal(syncprotocol.op_regions(messages[1][2]), REGIONS[:2])
+    assert len(messages[2][2]) == 0
+
+def test_last_writes():
+    """
+    only the last write to each row is kept
+    """
+    rows, regions = syncprotocol.last_writes([1, 0, 1, 2, 0], np.arange(20).reshape(5, 4))
+
+    assert rows.tolist() == [0, 1, 2]
+    assert regions.tolist() == [[16, 17, 18, 19], [8, 9, 10, 11], [12, 13, 14, 15]]
+
+def test_corrupt_stream_refused():
+    """
+    impossible lengths and inconsistent record counts are errors
+    """
+    with pytest.raises(ValueError):
+        MessageReader().feed(b"\x01\x00\x00\x00" + bytes(20))
+
+    frame = bytearray(syncprotocol.encode(syncprotocol.MSG_SNAPSHOT, 1, REGIONS))
+    frame[13] += 1
+    with pytest.raises(ValueError):
+        MessageReader().feed(bytes(frame))
+
+    frame = bytearray(syncprotocol.encode(syncprotocol.MSG_SNAPSHOT, 1, REGIONS))
+    frame[4] = 99
+    with pytest.raises(ValueError):
+        MessageReader().feed(bytes(frame))
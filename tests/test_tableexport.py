@@ -0,0 +1,99 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of the paged html and pdf export of the regions table, run with
+"python -m pytest" from the top level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+
+import io
+import os
+
+# no display is needed, this must be set before Qt is loaded
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable = wrong-import-position
+import PyQt5.QtWidgets as qw
+
+from regionselection.util import tablehtml
+from regionselection.util.drawrect import DrawRect
+from regionselection.gui.tableexportworker import TableExportWorker
+
+## the application, pdf export lays out text so it needs one
+APPLICATION = qw.QApplication.instance() or qw.QApplication([])
+
+REGIONS = [DrawRect(row, row + 1, row + 2, row + 3) for row in range(25)]
+
+def run_worker(file_name, rows_per_page=10):
+    """
+    run an export in this thread, returning the progress, failures and finished signals
+    """
+    worker = TableExportWorker(REGIONS, file_name, rows_per_page)
+    signals = {"progress": [], "failed": [], "finished": []}
+    worker.progress.connect(lambda done, total: signals["progress"].append((done, total)))
+    worker.failed.connect(signals["failed"].append)
+    worker.finished.connect(signals["finished"].append)
+    worker.run()
+    return signals
+
+def test_pages():
+    """
+    every row is on one page, with the table's column order
+    """
+    pages = list(tablehtml.html_pages(REGIONS, 10))
+
+    assert tablehtml.page_count(25, 10) == 3 and tablehtml.page_count(0, 10) == 1
+    assert len(pages) == 3
+    assert sum(page.count("<tr><td>") for page in pages) == 25
+    assert "<tr><td>1</td><td>2</td><td>0</td><td>3</td><td>1</td></tr>" in pages[0]
+
+def test_write_html_cancelled():
+    """
+    a cancelled export stops before the next page
+    """
+    file = io.StringIO()
+    calls = []
+
+    completed = tablehtml.write_html(REGIONS, file, 10, lambda *call: calls.append(call),
+                                     lambda: len(calls) == 1)
+
+    assert not completed
+    assert calls == [(1, 3)]
+    assert "</html>" not in file.getvalue()
+
+def test_html_and_pdf(tmp_path):
+    """
+    both formats are written a page at a time
+    """
+    for name in ("table.html", "table.pdf"):
+        path = str(tmp_path/name)
+        signals = run_worker(path)
+
+        assert signals["progress"] == [(1, 3), (2, 3), (3, 3)]
+        assert signals["finished"] == [path]
+        assert signals["failed"] == []
+        assert os.path.getsize(path) > 0
+
+def test_unwritable_file(tmp_path):
+    """
+    a file that cannot be written is reported and finished is still sent
+    """
+    for name in ("table.html", "table.pdf"):
+        signals = run_worker(str(tmp_path/"missing"/name))
+
+        assert len(signals["failed"]) == 1
+        assert signals["finished"] == [""]
@@ -0,0 +1,83 @@
+## -*- coding: utf-8 -*-
+"""
+Created on Mon 19 Oct 2026
+
+Tests of time-dependent regions and the interval index that finds the regions
+of a frame, run with "python -m pytest" from the top level directory.
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+
+This work was funded by Joanna Leng's EPSRC funded RSE Fellowship (EP/R025819/1)
+
+@copyright 2020
+@author: j.h.pickering@leeds.ac.uk and j.leng@leeds.ac.uk
+"""
+import numpy as np
+
+from regionselection.util.drawrect import DrawRect
+from regionselection.util.intervalindex import IntervalIndex
+from regionselection.util import timerect
+from regionselection.util.timerect import TimeRect, FOREVER
+
+def test_at_frame_interpolates():
+    """
+    keyframe coordinates are interpolated between keyframes and held outside them
+    """
+    region = TimeRect(0, 10, 0, 10, 0, FOREVER, ((10, 0, 10, 0, 10), (20, 20, 30, 40, 50)))
+
+    assert region.at_frame(0) == DrawRect(0, 10, 0, 10)
+    assert region.at_frame(15) == DrawRect(10, 20, 20, 30)
+    assert region.at_frame(100) == DrawRect(20, 30, 40, 50)
+
+def test_time_dependence():
+    """
+    regions are time dependent if they have a limited range or keyframes
+    """
+    plain = [DrawRect(0, 1, 0, 1), TimeRect(0, 1, 0, 1, 0, FOREVER)]
+    keyed = plain + [TimeRect(0, 1, 0, 1, 0, FOREVER, ((0, 0, 1, 0, 1),))]
+    limited = plain + [TimeRect(0, 1, 0, 1, 2, 4)]
+
+    assert not timerect.is_time_dependent(plain)
+    assert timerect.is_time_dependent(keyed)
+    assert timerect.is_time_dependent(limited)
+    assert timerect.has_limited_ranges(*timerect.frame_ranges(limited))
+    assert not timerect.has_limited_ranges(*timerect.frame_ranges(keyed))
+
+def test_make_time_regions_round_trip():
+    """
+    frame ranges and keyframes are restored by make_time_regions
+    """
+    regions = [DrawRect(0, 1, 0, 1),
+               TimeRect(2, 3, 2, 3, 5, 9),
+               TimeRect(4, 5, 4, 5, 0, FOREVER, ((0, 4, 5, 4, 5), (8, 6, 7, 6, 7)))]
+    starts, ends = timerect.frame_ranges(regions)
+
+    restored = timerect.make_time_regions([region[:4] for region in regions], starts, ends,
+                                          timerect.keyframes_to_array(regions))
+
+    assert not isinstance(restored[0], TimeRect)
+    assert restored[1] == regions[1]
+    assert restored[2].at_frame(4) == regions[2].at_frame(4)
+
+def test_interval_index_query():
+    """
+    the index finds the same intervals as a scan
+    """
+    generator = np.random.default_rng(4)
+    starts = generator.integers(0, 100, 500)
+    ends = starts + generator.integers(0, 30, 500)
+    index = IntervalIndex(starts, ends)
+
+    for point in range(-5, 140):
+        expected = np.flatnonzero((starts <= point) & (point <= ends))
+        assert np.array_equal(np.sort(index.query(point)), expected)
+
+    assert len(IntervalIndex([], [])) == 0
+    assert len(IntervalIndex([], []).query(3)) == 0